@@ -0,0 +1,38 @@
+"""Add machine_translation suggestion columns to translation_pairs
+
+Revision ID: 3b8e1f0c2d41
+Revises: 2c1e5c77a5f4
+Create Date: 2025-08-24 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8e1f0c2d41'
+down_revision = '2c1e5c77a5f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('translation_pairs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('machine_translation', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('machine_translated_at', sa.DateTime(), nullable=True))
+
+    # Partial index backing the pre-translation keyset scan
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_translationpair_pending_untranslated
+        ON translation_pairs (id)
+        WHERE status = 'pending' AND target_text IS NULL AND machine_translation IS NULL
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_translationpair_pending_untranslated")
+    with op.batch_alter_table('translation_pairs', schema=None) as batch_op:
+        batch_op.drop_column('machine_translated_at')
+        batch_op.drop_column('machine_translation')
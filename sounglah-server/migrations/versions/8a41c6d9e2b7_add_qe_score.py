@@ -0,0 +1,40 @@
+"""Add qe_score quality-estimation columns to translation_pairs
+
+Revision ID: 8a41c6d9e2b7
+Revises: 3b8e1f0c2d41
+Create Date: 2025-08-24 00:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a41c6d9e2b7'
+down_revision = '3b8e1f0c2d41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('translation_pairs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('qe_score', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('qe_scored_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_translationpair_status_qe', ['status', 'qe_score', 'id'], unique=False)
+
+    # Partial index backing the scorer's keyset scan
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_translationpair_unscored
+        ON translation_pairs (id)
+        WHERE target_text IS NOT NULL AND qe_score IS NULL
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_translationpair_unscored")
+    with op.batch_alter_table('translation_pairs', schema=None) as batch_op:
+        batch_op.drop_index('ix_translationpair_status_qe')
+        batch_op.drop_column('qe_scored_at')
+        batch_op.drop_column('qe_score')
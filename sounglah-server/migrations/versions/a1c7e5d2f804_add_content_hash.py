@@ -0,0 +1,100 @@
+"""Add content_hash with a unique index to translation_pairs
+
+Revision ID: a1c7e5d2f804
+Revises: e4f0b8c61a93
+Create Date: 2025-08-25 02:00:00.000000
+
+"""
+import hashlib
+import unicodedata
+
+from alembic import op
+import regex as re
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c7e5d2f804'
+down_revision = 'e4f0b8c61a93'
+branch_labels = None
+depends_on = None
+
+BATCH = 5000
+
+
+# Frozen copy of pipeline.normalize.content_hash as of this revision, so the
+# migration does not import app code and keeps producing the same hashes
+def _dedup_form(s):
+    s = (s or "").replace("\u00A0", " ").replace("\u200B", "")
+    s = unicodedata.normalize("NFC", re.sub(r"\s+", " ", s).strip())
+    for ch in ("'", "\u2019", "\u02BC", "\u02B9"):
+        s = s.replace(ch, "\u02BC")
+    return s.casefold()
+
+
+def content_hash(source_text, target_text, source_lang_id, target_lang_id):
+    key = "\x1f".join((str(source_lang_id), str(target_lang_id), _dedup_form(source_text), _dedup_form(target_text)))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def upgrade():
+    with op.batch_alter_table('translation_pairs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=32), nullable=True))
+
+    tp = sa.table(
+        'translation_pairs',
+        sa.column('id', sa.Integer),
+        sa.column('source_text', sa.Text),
+        sa.column('target_text', sa.Text),
+        sa.column('source_lang_id', sa.Integer),
+        sa.column('target_lang_id', sa.Integer),
+        sa.column('content_hash', sa.String),
+    )
+    conn = op.get_bind()
+
+    # Backfill in keyset batches, each committed on its own so row locks are
+    # short. Existing duplicates keep NULL on every copy but the oldest, so the
+    # unique index can be built; reviewers find them with the list filter
+    # legacy_duplicate=true, and the pipeline's exact dedup still drops them
+    # from training data.
+    seen = set()
+    last_id = 0
+    with op.get_context().autocommit_block():
+        while True:
+            rows = conn.execute(
+                sa.select(tp.c.id, tp.c.source_text, tp.c.target_text, tp.c.source_lang_id, tp.c.target_lang_id)
+                .where(tp.c.id > last_id)
+                .order_by(tp.c.id)
+                .limit(BATCH)
+            ).all()
+            if not rows:
+                break
+            params = []
+            for r in rows:
+                h = content_hash(r.source_text, r.target_text, r.source_lang_id, r.target_lang_id)
+                if h in seen:
+                    continue
+                seen.add(h)
+                params.append({'_id': r.id, '_hash': h})
+            if params:
+                conn.execute(
+                    tp.update().where(tp.c.id == sa.bindparam('_id')).values(content_hash=sa.bindparam('_hash')),
+                    params,
+                )
+            last_id = rows[-1].id
+
+    # Build without blocking writes; CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_translationpair_content_hash
+            ON translation_pairs (content_hash)
+            """
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ux_translationpair_content_hash")
+    with op.batch_alter_table('translation_pairs', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,31 @@
+"""Add data_versions table for HTTP validators
+
+Revision ID: b6e2d94f1c07
+Revises: a1c7e5d2f804
+Create Date: 2025-08-25 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2d94f1c07'
+down_revision = 'a1c7e5d2f804'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'data_versions',
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.execute("INSERT INTO data_versions (name, version, changed_at) VALUES ('translation_pairs', 1, now())")
+
+
+def downgrade():
+    op.drop_table('data_versions')
@@ -0,0 +1,42 @@
+"""Add pg_trgm GIN indexes for translation text search
+
+Revision ID: c2d9a7f13e55
+Revises: 8a41c6d9e2b7
+Create Date: 2025-08-25 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2d9a7f13e55'
+down_revision = '8a41c6d9e2b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Build without blocking writes; CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_translationpair_source_trgm
+            ON translation_pairs USING gin (source_text gin_trgm_ops)
+            """
+        )
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_translationpair_target_trgm
+            ON translation_pairs USING gin (target_text gin_trgm_ops)
+            """
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_translationpair_target_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_translationpair_source_trgm")
+    # Leave the pg_trgm extension installed; other objects may depend on it
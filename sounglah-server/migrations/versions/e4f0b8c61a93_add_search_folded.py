@@ -0,0 +1,102 @@
+"""Add accent-folded search column to translation_pairs
+
+Revision ID: e4f0b8c61a93
+Revises: c2d9a7f13e55
+Create Date: 2025-08-25 00:30:00.000000
+
+"""
+import unicodedata
+
+from alembic import op
+import regex as re
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4f0b8c61a93'
+down_revision = 'c2d9a7f13e55'
+branch_labels = None
+depends_on = None
+
+BATCH = 5000
+
+# Frozen copy of pipeline.normalize.fold_pair as of this revision, so the
+# migration does not import app code
+_ASCII_FOLD = str.maketrans({"ə": "e", "ɛ": "e", "ɔ": "o", "ʉ": "u", "ŋ": "ng", "Ə": "e", "Ɛ": "e", "Ɔ": "o", "Ʉ": "u", "Ŋ": "ng"})
+
+
+def _fold(s):
+    s = (s or "").replace("\u00A0", " ").replace("\u200B", "")
+    s = unicodedata.normalize("NFC", re.sub(r"\s+", " ", s).strip())
+    for ch in ("'", "\u2019", "\u02BC", "\u02B9"):
+        s = s.replace(ch, "\u02BC")
+    s = s.replace("\u02BC", "")
+    s = "".join(ch for ch in unicodedata.normalize("NFD", s) if not unicodedata.combining(ch))
+    return s.translate(_ASCII_FOLD).casefold()
+
+
+def fold_pair(source_text, target_text):
+    return _fold(source_text) + "\n" + _fold(target_text)
+
+
+def upgrade():
+    with op.batch_alter_table('translation_pairs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_folded', sa.Text(), nullable=True))
+
+    # Backfill in keyset batches with the same Python folding the app uses,
+    # each batch committed on its own so no long-held row locks block writes
+    tp = sa.table(
+        'translation_pairs',
+        sa.column('id', sa.Integer),
+        sa.column('source_text', sa.Text),
+        sa.column('target_text', sa.Text),
+        sa.column('search_folded', sa.Text),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    with op.get_context().autocommit_block():
+        while True:
+            rows = conn.execute(
+                sa.select(tp.c.id, tp.c.source_text, tp.c.target_text)
+                .where(tp.c.id > last_id)
+                .order_by(tp.c.id)
+                .limit(BATCH)
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                tp.update().where(tp.c.id == sa.bindparam('_id')).values(search_folded=sa.bindparam('_folded')),
+                [{'_id': r.id, '_folded': fold_pair(r.source_text, r.target_text)} for r in rows],
+            )
+            last_id = rows[-1].id
+
+        # Build without blocking writes, after the backfill so it indexes final
+        # values once. Search now goes through the folded column, so the raw-text
+        # trigram indexes from c2d9a7f13e55 are dropped only once it is ready.
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_translationpair_search_folded_trgm
+            ON translation_pairs USING gin (search_folded gin_trgm_ops)
+            """
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_translationpair_source_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_translationpair_target_trgm")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_translationpair_source_trgm
+            ON translation_pairs USING gin (source_text gin_trgm_ops)
+            """
+        )
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_translationpair_target_trgm
+            ON translation_pairs USING gin (target_text gin_trgm_ops)
+            """
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_translationpair_search_folded_trgm")
+    with op.batch_alter_table('translation_pairs', schema=None) as batch_op:
+        batch_op.drop_column('search_folded')
@@ -0,0 +1,43 @@
+"""Backfill translation_pairs.created_at and make it NOT NULL
+
+Revision ID: f3b9c2e7a510
+Revises: b6e2d94f1c07
+Create Date: 2025-08-26 01:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9c2e7a510'
+down_revision = 'b6e2d94f1c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows inserted outside the ORM may predate the model default; created_at
+    # pagination cursors need a value on every row
+    op.execute(
+        "UPDATE translation_pairs SET created_at = COALESCE(updated_at, approved_at, now()) "
+        "WHERE created_at IS NULL"
+    )
+    op.alter_column('translation_pairs', 'created_at', server_default=sa.text('now()'))
+
+    # SET NOT NULL skips its full-table scan when a validated CHECK already
+    # proves it. Each step commits on its own: ADD ... NOT VALID and SET NOT
+    # NULL hold the exclusive lock only briefly, and VALIDATE scans under a
+    # lock that lets writes through.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TABLE translation_pairs ADD CONSTRAINT ck_translationpair_created_at_not_null "
+            "CHECK (created_at IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE translation_pairs VALIDATE CONSTRAINT ck_translationpair_created_at_not_null")
+        op.alter_column('translation_pairs', 'created_at', nullable=False)
+        op.drop_constraint('ck_translationpair_created_at_not_null', 'translation_pairs', type_='check')
+
+
+def downgrade():
+    op.alter_column('translation_pairs', 'created_at', nullable=True, server_default=None)
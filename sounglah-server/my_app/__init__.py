@@ -1,4 +1,4 @@
-from flask import Flask, send_from_directory, request, abort
+from flask import Flask
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
@@ -6,6 +6,8 @@ from dotenv import load_dotenv
 import os
 import logging
 from . import model_loader
+from . import compression
+from . import spa
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,13 +18,13 @@ def create_app(config_object=None):
     # This path calculation is correct for your structure.
     app_root = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(app_root)
-    static_folder = os.path.join(project_root, 'frontend_build')
+    frontend_build = os.path.join(project_root, 'frontend_build')
 
+    # No built-in static route: the SPA handler below serves frontend_build from its manifest
     app = Flask(
         __name__,
         instance_relative_config=True,
-        static_folder=static_folder,
-        static_url_path=''
+        static_folder=None
     )
     
     load_dotenv()
@@ -33,6 +35,23 @@ def create_app(config_object=None):
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     db.init_app(app)
     migrate = Migrate(app, db)
+
+    from .refcache import RefCache
+    from .cache import TTLCache
+    from .counts import COUNT_TTL_SECONDS
+    from .jobs import JobRegistry
+    from .near_dup import MinHashIndex
+    from .response_cache import make_backend
+    from . import versions  # noqa: F401  (registers the data_versions session hooks)
+    app.extensions['refcache'] = RefCache()
+    app.extensions['count_cache'] = TTLCache(maxsize=1024, ttl=COUNT_TTL_SECONDS)
+    app.extensions['jobs'] = JobRegistry()
+    app.extensions['near_dup'] = MinHashIndex()
+    if os.environ.get('NEAR_DUP_PRELOAD', '1') == '1':
+        from .near_dup import warm
+        app.before_request(warm)
+    app.extensions['response_cache'] = make_backend()
+    app.extensions['spa'] = spa.AssetManifest(frontend_build)
     
     # ... Database connection test is fine ...
     with app.app_context():
@@ -45,6 +64,7 @@ def create_app(config_object=None):
             raise
 
     CORS(app)
+    app.after_request(compression.compress_response)
     
     # ... Model loading is fine ...
     global tokenizer_instance, model_instance, models_loaded_successfully
@@ -63,6 +83,9 @@ def create_app(config_object=None):
     def make_shell_context():
         return {'db': db, 'Language': Language, 'TranslationPair': TranslationPair, 'AudioRecording': AudioRecording, 'User': User}
 
+    from .commands import register_commands
+    register_commands(app)
+
     # --- Blueprint registration is correct ---
     from .resources.translations import translations_bp
     from .resources.users import users_bp, roles_bp
@@ -81,45 +104,10 @@ def create_app(config_object=None):
     app.register_blueprint(augment_bp, url_prefix='/api/augment')
 
     # --- Serve React App (SPA Routing) ---
-    @app.route('/')
-    def serve_home():
-        return send_from_directory(app.static_folder or "../frontend_build", 'index.html')
-    
-    @app.route('/translate')
-    def serve_translate():
-        return send_from_directory(app.static_folder or "../frontend_build", 'index.html')
-    
-    @app.route('/login')
-    def serve_login():
-        return send_from_directory(app.static_folder or "../frontend_build", 'index.html')
-    
-    @app.route('/dashboard')
-    def serve_dashboard():
-        return send_from_directory(app.static_folder or "../frontend_build", 'index.html')
-    
-    @app.route('/users')
-    def serve_users():
-        return send_from_directory(app.static_folder or "../frontend_build", 'index.html')
-    
-    @app.route('/translations')
-    def serve_translations():
-        return send_from_directory(app.static_folder or "../frontend_build", 'index.html')
-    
-    @app.route('/languages')
-    def serve_languages():
-        return send_from_directory(app.static_folder or "../frontend_build", 'index.html')
-    
-    # Catch-all for any other routes (but not API routes)
-
-
+    # Known build files, then index.html for client-side routes (not API routes)
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
     def serve(path):
-        # If the requested path is a real file (like manifest.json), serve it
-        if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-            return send_from_directory(app.static_folder, path)
-        # Otherwise, it's a client-side route (like /translate), so serve index.html
-        else:
-            return send_from_directory(app.static_folder, 'index.html')
-        
-    return app
\ No newline at end of file
+        return spa.serve(path)
+
+    return app
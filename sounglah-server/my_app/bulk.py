@@ -0,0 +1,254 @@
+# app/bulk.py
+"""Set-based writes to translation_pairs (no per-row ORM round-trips)."""
+from datetime import datetime
+from sqlalchemy import update, insert, select, case, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from . import db
+from .models import TranslationPair
+from . import refcache
+from .pipeline.normalize import fold_pair, content_hash
+
+STATUSES = ('pending', 'rejected', 'approved')
+# Ids per UPDATE statement; keeps parameter payloads and lock sets bounded
+UPDATE_CHUNK = 10000
+
+
+def in_values(column, values, type_=None):
+    """`column = ANY(:array)` on PostgreSQL (one bound param); IN (...) elsewhere."""
+    values = list(values)
+    if db.engine.dialect.name == 'postgresql':
+        return column == any_(bindparam(None, value=values, type_=ARRAY(type_ or column.type)))
+    return column.in_(values)
+
+
+def id_in(ids):
+    return in_values(TranslationPair.id, ids, db.Integer)
+
+
+def status_values(status, now=None):
+    """
+    SET clause for a status change with the usual approved_at semantics:
+    stamped when a row first becomes approved, kept if it already was,
+    cleared when it leaves approved.
+    """
+    now = now or datetime.utcnow()
+    if status == 'approved':
+        approved_at = case(
+            (TranslationPair.status == 'approved', TranslationPair.approved_at),
+            else_=now,
+        )
+    else:
+        approved_at = None
+    return {'status': status, 'approved_at': approved_at, 'updated_at': now}
+
+
+def update_status(db_session, ids, status, extra_values=None):
+    """
+    Apply `status` (and optional extra column values) to `ids` with a few
+    UPDATE ... RETURNING id statements. Returns (updated_ids, missing_ids).
+    Caller commits.
+    """
+    ids = list(dict.fromkeys(ids))
+    now = datetime.utcnow()
+    values = status_values(status, now) if status else {'updated_at': now}
+    values.update(extra_values or {})
+
+    updated = []
+    for start in range(0, len(ids), UPDATE_CHUNK):
+        chunk = ids[start:start + UPDATE_CHUNK]
+        stmt = (
+            update(TranslationPair)
+            .where(id_in(chunk))
+            .values(**values)
+            .returning(TranslationPair.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated.extend(db_session.execute(stmt).scalars().all())
+
+    done = set(updated)
+    return sorted(done), [i for i in ids if i not in done]
+
+
+# Rows per transaction for filter-driven updates; bounds lock time per commit
+FILTER_CHUNK = 5000
+
+
+def update_by_filter(db_session, ids_stmt, status=None, domain=None, chunk_size=FILTER_CHUNK, progress=None):
+    """
+    Apply a status and/or domain change to every row selected by `ids_stmt`
+    (a SELECT of TranslationPair.id carrying the list filters). Walks ids in
+    keyset order and commits one chunk at a time, so a change to millions of
+    rows never holds one long transaction.
+    """
+    extra = {'domain': domain} if domain is not None else None
+    total = db_session.execute(
+        select(db.func.count()).select_from(ids_stmt.order_by(None).subquery())
+    ).scalar()
+    if progress:
+        progress(0, total)
+
+    updated, last_id = 0, None
+    while True:
+        page = ids_stmt.order_by(TranslationPair.id).limit(chunk_size)
+        if last_id is not None:
+            page = page.where(TranslationPair.id > last_id)
+        chunk = db_session.execute(page).scalars().all()
+        if not chunk:
+            break
+        done, _ = update_status(db_session, chunk, status, extra_values=extra)
+        db_session.commit()
+        updated += len(done)
+        last_id = chunk[-1]
+        if progress:
+            progress(updated, total)
+    return {'matched': total, 'updated': updated}
+
+
+# Rows per INSERT ... RETURNING round-trip (SQLAlchemy packs them into
+# multi-row VALUES statements of insertmanyvalues_page_size each)
+INSERT_CHUNK = 5000
+
+
+def _row_error(row):
+    """Why `row` can't be inserted before languages are looked at, or None."""
+    if isinstance(row, Exception):
+        # Unparseable line passed through by a file reader
+        return str(row)
+    if not isinstance(row, dict):
+        return 'Row must be an object.'
+    # A missing source_text is inserted as '' (the upload endpoint always has); only wrong types fail
+    if not isinstance(row.get('source_text', ''), str):
+        return 'source_text must be a string.'
+    for key in ('target_text', 'source_language', 'target_language', 'domain'):
+        if not isinstance(row.get(key), (str, type(None))):
+            return f'{key} must be a string.'
+    return None
+
+
+def prepare_pairs(rows, first_row=1):
+    """
+    Validate uploaded rows in one pass. Language names are resolved once per
+    distinct value (reference cache), not per row. Returns (insert_values,
+    results): the column dicts to insert and the per-row report, where
+    results[i]['row'] is the 1-based row number starting at `first_row`.
+    Malformed rows (not an object, a non-string field, or an exception a
+    reader passed through for an unparseable line) become error entries.
+    """
+    row_errors = [_row_error(r) for r in rows]
+    names = {r.get(k) for r, err in zip(rows, row_errors) if err is None
+             for k in ('source_language', 'target_language')}
+    lang_ids = {}
+    for name in names:
+        lang = refcache.language_by_name(name)
+        lang_ids[name] = lang.id if lang else None
+
+    now = datetime.utcnow()
+    values, results = [], []
+    for idx, (row, row_error) in enumerate(zip(rows, row_errors)):
+        if row_error is not None:
+            results.append({'row': first_row + idx, 'status': 'error', 'error': row_error})
+            continue
+        src_name = row.get('source_language')
+        tgt_name = row.get('target_language')
+        src_id, tgt_id = lang_ids[src_name], lang_ids[tgt_name]
+        source_text = row.get('source_text', '')
+        target_text = row.get('target_text', '')
+        result = {
+            'row': first_row + idx,
+            'source_text': source_text,
+            'target_text': target_text,
+            'source_language': src_name,
+            'target_language': tgt_name,
+        }
+        if not src_id or not tgt_id:
+            result.update(status='error', error='Source or target language not found.')
+        else:
+            result['status'] = 'added'
+            values.append({
+                'source_text': source_text,
+                'target_text': target_text,
+                'source_lang_id': src_id,
+                'target_lang_id': tgt_id,
+                'status': 'pending',
+                'domain': row.get('domain'),
+                'created_at': now,
+                'updated_at': now,
+                # Core inserts bypass the ORM before_insert hook
+                'search_folded': fold_pair(source_text, target_text),
+                'content_hash': content_hash(source_text, target_text, src_id, tgt_id),
+            })
+        results.append(result)
+    return values, results
+
+
+def _insert_ignoring_duplicates():
+    """INSERT that skips rows whose content_hash is already taken (race guard)."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(TranslationPair)
+    return dialect_insert(TranslationPair).on_conflict_do_nothing(index_elements=['content_hash'])
+
+
+def _existing_hashes(db_session, hashes):
+    if not hashes:
+        return {}
+    rows = db_session.execute(
+        select(TranslationPair.content_hash, TranslationPair.id)
+        .where(in_values(TranslationPair.content_hash, hashes, db.String))
+    ).all()
+    return dict(rows)
+
+
+def insert_pairs(db_session, values, chunk_size=INSERT_CHUNK):
+    """
+    Insert prepared column dicts with batched multi-row INSERT ... RETURNING,
+    skipping rows whose content_hash already exists in the table or earlier in
+    `values`. Duplicates are found with one index probe per chunk, and
+    ON CONFLICT DO NOTHING covers rows inserted concurrently since the probe.
+    Returns one (id, duplicate_of) tuple per value; exactly one side is set.
+    Caller commits.
+    """
+    stmt = _insert_ignoring_duplicates().returning(TranslationPair.content_hash, TranslationPair.id)
+    outcome = []
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        known = _existing_hashes(db_session, {v['content_hash'] for v in chunk})
+        fresh, first = [], {}
+        for v in chunk:
+            h = v['content_hash']
+            if h not in known and h not in first:
+                first[h] = v
+                fresh.append(v)
+        inserted = dict(db_session.execute(stmt, fresh).all()) if fresh else {}
+        lost = {h for h in first if h not in inserted}
+        known.update(_existing_hashes(db_session, lost))
+        for v in chunk:
+            h = v['content_hash']
+            if h in inserted and first[h] is v:
+                outcome.append((inserted[h], None))
+            else:
+                outcome.append((None, known.get(h, inserted.get(h))))
+    return outcome
+
+
+def insert_and_report(db_session, values, results):
+    """
+    insert_pairs, then mark the 'added' entries of a prepare_pairs report that
+    turned out to be duplicates. Returns (added, duplicates). Caller commits.
+    """
+    outcome = iter(insert_pairs(db_session, values))
+    added = duplicates = 0
+    for result in results:
+        if result['status'] != 'added':
+            continue
+        new_id, duplicate_of = next(outcome)
+        if new_id is None:
+            result.update(status='duplicate', duplicate_of=duplicate_of)
+            duplicates += 1
+        else:
+            added += 1
+    return added, duplicates
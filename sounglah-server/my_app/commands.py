@@ -0,0 +1,71 @@
+# app/commands.py
+import json
+import click
+from flask import current_app
+
+
+def _require_model():
+    tokenizer = current_app.extensions.get("ml_tokenizer")
+    model = current_app.extensions.get("ml_model")
+    if not tokenizer or not model:
+        raise click.ClickException("Translation model is not available")
+    return tokenizer, model
+
+
+def register_commands(app):
+    @app.cli.command("evaluate")
+    @click.argument("run_id")
+    @click.option("--batch-size", default=32, show_default=True, help="Sentences per generate() call")
+    @click.option("--label", default=None, help="Tag for the report file, e.g. 'int8' -> _eval_int8.json")
+    def evaluate(run_id, batch_size, label):
+        """Translate RUN_ID's test split and write BLEU/chrF + throughput next to _card.json."""
+        from .pipeline.evaluate import run_eval
+        tokenizer, model = _require_model()
+        report = run_eval(run_id, tokenizer, model, batch_size=batch_size, label=label)
+        click.echo(json.dumps({k: report[k] for k in ("quality", "throughput", "report_path")}, indent=2))
+
+    @app.cli.command("langid-train")
+    @click.option("--out", default=None, help="Where to write the model (default: models/langid-ngram.npz)")
+    @click.option("--holdout", default=0.1, show_default=True, help="Fraction kept aside for the benchmark")
+    def langid_train(out, holdout):
+        """Retrain the character n-gram language identifier from approved pairs."""
+        from . import db
+        from .ngram_langid import NgramLangID, load_training_rows, benchmark, DEFAULT_PATH
+        from .lang_detect import reload_ngram_model
+
+        texts, labels = load_training_rows(db.session)
+        if not texts:
+            raise click.ClickException("No approved pairs to train on")
+        every = max(2, int(round(1 / holdout))) if holdout > 0 else 0
+        train = [(t, l) for i, (t, l) in enumerate(zip(texts, labels)) if not every or i % every]
+        test = [(t, l) for i, (t, l) in enumerate(zip(texts, labels)) if every and not i % every]
+
+        model = NgramLangID.train([t for t, _ in train], [l for _, l in train])
+        path = model.save(out or DEFAULT_PATH)
+        reload_ngram_model()
+        click.echo(f"Trained on {len(train)} texts, labels {model.labels} -> {path}")
+        if test:
+            click.echo(json.dumps(benchmark(model, [t for t, _ in test], [l for _, l in test]), indent=2))
+
+    @app.cli.command("langid-bench")
+    @click.option("--limit", default=5000, show_default=True, help="Max labelled texts to benchmark on")
+    def langid_bench(limit):
+        """Compare the n-gram identifier against langid.py for speed and accuracy."""
+        from . import db
+        from .ngram_langid import load_training_rows, benchmark
+        from .lang_detect import ngram_model
+
+        model = ngram_model()
+        if model is None:
+            raise click.ClickException("No n-gram model; run 'flask langid-train' first")
+        texts, labels = load_training_rows(db.session)
+        click.echo(json.dumps(benchmark(model, texts[:limit], labels[:limit]), indent=2))
+
+    @app.cli.command("backfill-search-folded")
+    @click.option("--batch-size", default=2000, show_default=True)
+    @click.option("--all", "refold_all", is_flag=True, help="Recompute every row, not just missing ones")
+    def backfill_search_folded_cmd(batch_size, refold_all):
+        """Fill translation_pairs.search_folded in batches."""
+        from . import db
+        from .pipeline.backfill import backfill_search_folded
+        click.echo(json.dumps(backfill_search_folded(db.session, batch_size=batch_size, refold_all=refold_all)))
@@ -0,0 +1,127 @@
+# app/compression.py
+"""
+Content-negotiated response compression.
+
+Dynamic responses (JSON pages, error bodies) are compressed in an
+after_request hook when the client accepts br or gzip, the media type is
+textual and the body is at least MIN_SIZE bytes. Streamed responses and
+anything that already carries a Content-Encoding are left alone; the text
+export streams encode themselves (export.gzip_chunks).
+
+Static files are never compressed per request: `python my_app/compression.py
+frontend_build` (run at image build time) writes `.br`/`.gz` siblings next to
+every compressible asset, and the SPA handler (spa.py) serves the best
+sibling the client accepts with the original file's media type.
+
+Brotli is optional: `brotli` or `brotlicffi` is used when installed,
+otherwise only gzip is offered.
+
+This module imports nothing from the package, so it runs as a plain script
+without loading the app (and its model dependencies).
+"""
+import gzip
+import mimetypes
+import os
+import sys
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:  # gzip only
+        brotli = None
+
+MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+# Dynamic responses favour speed; precompressed assets use the maximum levels
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE = {
+    'application/json', 'application/javascript', 'application/manifest+json', 'application/xml',
+    'application/x-ndjson', 'image/svg+xml', 'text/css', 'text/csv', 'text/html', 'text/javascript',
+    'text/plain', 'text/xml',
+}
+# Static sibling suffix per encoding, in server preference order
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def negotiate(available):
+    """Best of `available` that the request accepts (q-values honoured), or None."""
+    return request.accept_encodings.best_match(available)
+
+
+def compress(data: bytes, encoding: str, max_level=False) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if max_level else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if max_level else GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """after_request hook: compress eligible dynamic responses."""
+    if response.mimetype in COMPRESSIBLE:
+        response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE):
+        return response
+    if (response.content_length or 0) < MIN_SIZE:
+        return response
+    encoding = negotiate(encodings())
+    if encoding is None:
+        return response
+
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    tag, weak = response.get_etag()
+    if tag and not weak:
+        # A strong validator names exact bytes; the encoded body is a different representation
+        response.set_etag(tag, weak=True)
+    return response
+
+
+def precompress_dir(directory, min_size=MIN_SIZE):
+    """
+    Write `.gz` (and `.br` when brotli is available) siblings for compressible
+    files of at least `min_size` bytes. Up-to-date siblings are kept, and a
+    sibling that would not be smaller than the original is not written.
+    Returns the paths written.
+    """
+    written = []
+    suffixes = tuple(SUFFIXES.values())
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith(suffixes) or mimetypes.guess_type(name)[0] not in COMPRESSIBLE:
+                continue
+            stat = os.stat(path)
+            if stat.st_size < min_size:
+                continue
+            data = None
+            for encoding in encodings():
+                target = path + SUFFIXES[encoding]
+                if os.path.exists(target) and os.stat(target).st_mtime >= stat.st_mtime:
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                packed = compress(data, encoding, max_level=True)
+                if len(packed) >= len(data):
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(packed)
+                written.append(target)
+    return written
+
+
+if __name__ == '__main__':
+    for directory in sys.argv[1:] or ['frontend_build']:
+        for path in precompress_dir(directory):
+            print(path)
@@ -0,0 +1,65 @@
+# app/counts.py
+"""
+Totals for filtered translation queries without a COUNT(*) on every page.
+
+- Exact counts are cached per normalized filter set for a short TTL and
+  dropped whenever a handler writes to translation_pairs.
+- Estimated counts come from the PostgreSQL planner: pg_class.reltuples for
+  the unfiltered table, EXPLAIN row estimates otherwise.
+"""
+import json
+from flask import current_app
+from . import db
+from .cache import MISSING
+
+COUNT_TTL_SECONDS = 30
+
+# Request args that change which rows a list/export query matches
+FILTER_KEYS = ('source_lang', 'target_lang', 'status', 'domain', 'search', 'created_at_start', 'created_at_end',
+               'legacy_duplicate')
+
+
+def filter_key(args) -> tuple:
+    """Normalized, hashable view of the filters in `args`; unset and false boolean filters are left out."""
+    return tuple(
+        (k, str(args.get(k)).strip().lower())
+        for k in FILTER_KEYS
+        if args.get(k) not in (None, '', False)
+    )
+
+
+def _cache():
+    return current_app.extensions['count_cache']
+
+
+def invalidate():
+    """Call after any write to translation_pairs."""
+    _cache().clear()
+
+
+def exact_count(query, key) -> int:
+    cached = _cache().get(key)
+    if cached is not MISSING:
+        return cached
+    total = query.order_by(None).count()
+    _cache().set(key, total)
+    return total
+
+
+def estimated_count(query, key):
+    """Planner estimate on PostgreSQL; None where the dialect can't provide one."""
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    if not key:
+        row = db.session.execute(
+            db.text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'translation_pairs'::regclass")
+        ).first()
+        if row and row[0] >= 0:
+            return int(row[0])
+    compiled = query.order_by(None).statement.compile(dialect=db.engine.dialect)
+    plan = db.session.connection().exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
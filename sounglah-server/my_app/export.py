@@ -0,0 +1,454 @@
+# app/export.py
+"""
+Streaming export of translation pairs as CSV, gzip CSV, JSONL or Parquet.
+
+On PostgreSQL the filtered CSV SELECT (already joined to language names) runs
+as `COPY (...) TO STDOUT WITH CSV` on a dedicated connection, and the server's
+CSV bytes go to the client in CHUNK_BYTES pieces; Python never sees
+individual rows. Other databases (SQLite in tests) fall back to a batched
+csv.writer over the same SELECT, so both paths emit identical columns.
+
+JSONL and Parquet are built from FETCH_ROWS-row batches of a server-side
+cursor; Parquet is flushed one row group at a time, so memory stays bounded
+by ROW_GROUP_ROWS whatever the export size. gzip wraps either text format
+with a streaming compressor.
+
+For full-corpus dumps, run_partitioned_export splits the filtered rows into
+contiguous, equally sized id ranges and writes one file per range
+concurrently, each on its own database connection, plus a manifest.json
+listing the parts in id order. The manifest is written last, so its presence
+marks a finished export; export directories older than EXPORT_TTL_SECONDS are
+removed when the next partitioned export starts.
+"""
+import csv
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from io import StringIO
+from threading import Thread, Event
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import aliased
+
+from . import db
+from .models import TranslationPair, Language
+from .pipeline.io_utils import ensure_dir, write_json
+
+logger = logging.getLogger(__name__)
+
+HEADER = [
+    'id', 'source_text', 'target_text', 'source_language', 'target_language',
+    'status', 'domain', 'created_at', 'updated_at', 'reviewer_id'
+]
+CHUNK_BYTES = 1 << 20
+FETCH_ROWS = 5000
+ROW_GROUP_ROWS = 100000
+GZIP_LEVEL = 6
+
+# Chunks buffered between the COPY thread and the response
+QUEUE_CHUNKS = 8
+
+# format -> (Content-Type, file extension)
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'csv.gz': ('application/gzip', 'csv.gz'),
+    'jsonl': ('application/x-ndjson; charset=utf-8', 'jsonl'),
+    'jsonl.gz': ('application/gzip', 'jsonl.gz'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPORT_DIR = os.environ.get("EXPORT_DIR", os.path.join(BASE_DIR, "data", "exports"))
+# Concurrent partitions; each holds one pooled connection while it runs
+MAX_WORKERS = 4
+MAX_PARTS = 64
+EXPORT_TTL_SECONDS = int(os.environ.get("EXPORT_TTL_SECONDS", str(24 * 3600)))
+MANIFEST = 'manifest.json'
+
+_DONE = object()
+
+
+def _iso(column):
+    """Timestamp rendered like datetime.isoformat() (microseconds only when set)."""
+    if db.engine.dialect.name == 'postgresql':
+        return func.regexp_replace(func.to_char(column, 'YYYY-MM-DD"T"HH24:MI:SS.US'), r'\.0{6}$', '')
+    return column
+
+
+def export_query(query, text_timestamps=True):
+    """
+    Narrow a filtered TranslationPair query to the export columns, in id order.
+    `text_timestamps` renders created/updated_at as ISO strings in SQL (for
+    COPY); otherwise they stay datetimes (for JSONL and Parquet).
+    """
+    ts = _iso if text_timestamps else (lambda column: column)
+    sl = aliased(Language)
+    tl = aliased(Language)
+    return (
+        query.outerjoin(sl, TranslationPair.source_lang_id == sl.id)
+        .outerjoin(tl, TranslationPair.target_lang_id == tl.id)
+        .with_entities(
+            TranslationPair.id,
+            TranslationPair.source_text,
+            TranslationPair.target_text,
+            func.coalesce(sl.name, literal('')).label('source_language'),
+            func.coalesce(tl.name, literal('')).label('target_language'),
+            TranslationPair.status,
+            TranslationPair.domain,
+            ts(TranslationPair.created_at).label('created_at'),
+            ts(TranslationPair.updated_at).label('updated_at'),
+            TranslationPair.reviewer_id,
+        )
+        .order_by(TranslationPair.id.asc())
+    )
+
+
+def _fmt(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def writer_chunks(conn, stmt, header=True, stats=None):
+    """Fallback: csv.writer over a server-side cursor, one yield per FETCH_ROWS rows."""
+    out = StringIO()
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(HEADER)
+    for rows in _row_batches(conn, stmt, stats):
+        writer.writerows([_fmt(v) for v in row] for row in rows)
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate(0)
+    if out.tell():
+        yield out.getvalue()
+
+
+class _QueueWriter:
+    """File-like sink for copy_expert: coalesces COPY data into CHUNK_BYTES pieces."""
+
+    def __init__(self, q, cancelled):
+        self._q = q
+        self._cancelled = cancelled
+        self._buf = bytearray()
+
+    def write(self, data):
+        self._buf += data.encode('utf-8') if isinstance(data, str) else data
+        if len(self._buf) >= CHUNK_BYTES:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self._put(bytes(self._buf))
+            self._buf.clear()
+
+    def _put(self, item):
+        while True:
+            if self._cancelled.is_set():
+                # Client went away: raising aborts the COPY on the server
+                raise IOError('export cancelled')
+            try:
+                self._q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+def copy_sql(stmt, cursor, dialect, header=True):
+    """COPY command for `stmt` with every parameter inlined (COPY takes no bind parameters)."""
+    # render_postcompile expands IN lists (ids=...) into plain placeholders mogrify can fill
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    select_sql = cursor.mogrify(str(compiled), compiled.params).decode('utf-8')
+    return f"COPY ({select_sql}) TO STDOUT WITH (FORMAT csv{', HEADER true' if header else ''})"
+
+
+def copy_chunks(engine, stmt, header=True):
+    """Stream `COPY (stmt) TO STDOUT WITH CSV` from its own pooled connection."""
+    q = queue.Queue(maxsize=QUEUE_CHUNKS)
+    cancelled = Event()
+
+    def run():
+        conn = engine.raw_connection()
+        sink = _QueueWriter(q, cancelled)
+        try:
+            with conn.cursor() as cur:
+                cur.copy_expert(copy_sql(stmt, cur, engine.dialect, header=header), sink)
+            sink.flush()
+            sink._put(_DONE)
+        except Exception as e:
+            if not cancelled.is_set():
+                logger.error("COPY export failed", exc_info=True)
+                q.put(e)
+        finally:
+            conn.rollback()
+            conn.close()
+
+    Thread(target=run, daemon=True).start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+
+
+def csv_chunks(conn, engine, stmt, header=True, stats=None):
+    """CSV body for an export statement: COPY on PostgreSQL, csv.writer elsewhere."""
+    if engine.dialect.name == 'postgresql':
+        return copy_chunks(engine, stmt, header=header)
+    return writer_chunks(conn, stmt, header=header, stats=stats)
+
+
+def gzip_chunks(chunks):
+    """gzip-compress a stream of str/bytes chunks without buffering the whole body."""
+    comp = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = comp.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield comp.flush()
+
+
+def _row_batches(conn, stmt, stats=None):
+    """FETCH_ROWS-row batches from a server-side cursor; `conn` is a Session or Connection."""
+    result = conn.execute(stmt.execution_options(yield_per=FETCH_ROWS))
+    for rows in result.partitions():
+        if stats is not None:
+            stats['rows'] = stats.get('rows', 0) + len(rows)
+        yield rows
+
+
+def _json_default(obj):
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def jsonl_chunks(conn, stmt, stats=None):
+    dumps = json.JSONEncoder(ensure_ascii=False, default=_json_default).encode
+    for rows in _row_batches(conn, stmt, stats):
+        yield ''.join(dumps(dict(zip(HEADER, row))) + '\n' for row in rows)
+
+
+class _ByteSink:
+    """Write-only file object that hands out whatever has been written so far."""
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data):
+        self._buf += data
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = bytes(self._buf)
+        self._buf.clear()
+        return data
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ('id', pa.int64()),
+        ('source_text', pa.string()),
+        ('target_text', pa.string()),
+        ('source_language', pa.string()),
+        ('target_language', pa.string()),
+        ('status', pa.string()),
+        ('domain', pa.string()),
+        ('created_at', pa.timestamp('us')),
+        ('updated_at', pa.timestamp('us')),
+        ('reviewer_id', pa.int64()),
+    ])
+
+
+def parquet_chunks(conn, stmt, row_group_rows=ROW_GROUP_ROWS, stats=None):
+    """Parquet file streamed one row group at a time (footer last)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema()
+    sink = _ByteSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    pending = []
+
+    def flush():
+        columns = list(zip(*pending))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema,
+        ))
+        pending.clear()
+
+    for rows in _row_batches(conn, stmt, stats):
+        pending.extend(rows)
+        if len(pending) >= row_group_rows:
+            flush()
+            yield sink.drain()
+    if pending:
+        flush()
+    writer.close()
+    yield sink.drain()
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_statement(query, fmt='csv'):
+    """Export SELECT for a filtered query; CSV gets SQL-side ISO timestamps for COPY."""
+    return export_query(query, text_timestamps=fmt.startswith('csv')).statement
+
+
+def stream_chunks(conn, engine, stmt, fmt='csv', header=True, stats=None):
+    """Body chunks of `stmt` in `fmt` (a FORMATS key)."""
+    if fmt == 'parquet':
+        return parquet_chunks(conn, stmt, stats=stats)
+    base, _, compressed = fmt.partition('.')
+    if base == 'jsonl':
+        chunks = jsonl_chunks(conn, stmt, stats=stats)
+    else:
+        chunks = csv_chunks(conn, engine, stmt, header=header, stats=stats)
+    return gzip_chunks(chunks) if compressed else chunks
+
+
+def export_chunks(db_session, query, fmt='csv'):
+    """Response body for a filtered TranslationPair query."""
+    return stream_chunks(db_session, db.engine, export_statement(query, fmt), fmt)
+
+
+def partition_ranges(conn, stmt, parts):
+    """
+    Split the ids selected by `stmt` into at most `parts` contiguous
+    (first_id, last_id) ranges holding about the same number of rows, using
+    one ROW_NUMBER() pass over the (index-only) id list.
+    """
+    ids = stmt.with_only_columns(TranslationPair.id).order_by(None).subquery()
+    total = conn.execute(select(func.count()).select_from(ids)).scalar()
+    if not total:
+        return []
+    step = -(-total // max(1, parts))
+    numbered = select(ids.c.id, func.row_number().over(order_by=ids.c.id).label('rn')).subquery()
+    starts = conn.execute(
+        select(numbered.c.id).where((numbered.c.rn - 1) % step == 0).order_by(numbered.c.id)
+    ).scalars().all()
+    last = conn.execute(select(func.max(ids.c.id))).scalar()
+    ends = [s - 1 for s in starts[1:]] + [last]
+    return list(zip(starts, ends))
+
+
+def _write_part(engine, stmt, fmt, first_id, last_id, path):
+    """Write one id range to `path`; returns the row count."""
+    part = stmt.where(TranslationPair.id.between(first_id, last_id))
+    if fmt.startswith('csv') and engine.dialect.name == 'postgresql':
+        # COPY straight into the file; no Python per row or per chunk
+        conn = engine.raw_connection()
+        try:
+            opener = gzip.open if fmt.endswith('.gz') else open
+            with opener(path, 'wb') as f, conn.cursor() as cur:
+                cur.copy_expert(copy_sql(part, cur, engine.dialect), f)
+                return cur.rowcount
+        finally:
+            conn.rollback()
+            conn.close()
+
+    stats = {}
+    with engine.connect() as conn, open(path, 'wb') as f:
+        for chunk in stream_chunks(conn, engine, part, fmt, stats=stats):
+            f.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+    return stats.get('rows', 0)
+
+
+def run_partitioned_export(db_session, progress=None, stmt=None, fmt='csv', parts=4, workers=4,
+                           export_id=None, filters=None):
+    """
+    Export `stmt` (see export_statement) as `parts` files written by `workers`
+    threads into EXPORT_DIR/<export_id>/, then write manifest.json. Every part
+    is a complete file (CSV parts carry the header) covering one id range.
+    """
+    engine = db_session.get_bind()
+    workers = max(1, min(workers, MAX_WORKERS))
+    out_dir = ensure_dir(os.path.join(EXPORT_DIR, export_id))
+    ranges = partition_ranges(db_session, stmt, parts)
+    db_session.commit()  # don't hold the planning transaction open during the export
+    extension = FORMATS[fmt][1]
+
+    manifest_parts = [
+        {'file': f'part-{i:05d}.{extension}', 'first_id': lo, 'last_id': hi, 'rows': None, 'bytes': None}
+        for i, (lo, hi) in enumerate(ranges)
+    ]
+    done = rows = 0
+    if progress:
+        progress(0, len(ranges), rows=0)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_write_part, engine, stmt, fmt, p['first_id'], p['last_id'], os.path.join(out_dir, p['file'])): p
+            for p in manifest_parts
+        }
+        for future in as_completed(futures):
+            p = futures[future]
+            p['rows'] = future.result()
+            p['bytes'] = os.path.getsize(os.path.join(out_dir, p['file']))
+            done += 1
+            rows += p['rows']
+            if progress:
+                progress(done, len(ranges), rows=rows)
+
+    manifest = {
+        'export_id': export_id,
+        'format': fmt,
+        'filters': filters or {},
+        'columns': HEADER,
+        'total_rows': rows,
+        'parts': manifest_parts,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+    }
+    write_json(os.path.join(out_dir, MANIFEST), manifest)
+    return {'export_id': export_id, 'parts': len(manifest_parts), 'rows': rows}
+
+
+def is_finished(export_id):
+    return os.path.exists(os.path.join(EXPORT_DIR, export_id, MANIFEST))
+
+
+def remove_expired(max_age=None):
+    """Delete export directories last modified more than `max_age` seconds ago; returns their ids."""
+    if not os.path.isdir(EXPORT_DIR):
+        return []
+    cutoff = time.time() - (EXPORT_TTL_SECONDS if max_age is None else max_age)
+    removed = []
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(name)
+    return removed
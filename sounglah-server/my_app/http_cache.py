@@ -0,0 +1,45 @@
+# app/http_cache.py
+"""
+Conditional GET support: weak ETags (and Last-Modified where we know it) built
+from cheap version inputs, checked before the handler touches the data.
+
+    not_modified, headers = http_cache.check(version, ...)
+    if not_modified:
+        return not_modified
+    ...
+    return body, 200, headers
+"""
+import hashlib
+
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+
+# Clients must revalidate every time; the 304 makes that cheap
+CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts) -> str:
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def check(*parts, last_modified=None, undated=()):
+    """
+    Validators for a response determined by `parts` (versions, digests) and the
+    request URL. Returns (304 response or None, headers for the full response).
+    `last_modified` must be an aware UTC datetime covering every change to
+    `parts`; inputs it does not cover (e.g. a reference-table digest) go in
+    `undated`, which keeps them in the ETag and stops If-Modified-Since alone
+    from answering 304.
+    """
+    tag = make_etag(request.full_path, *parts, *undated)
+    headers = {'ETag': quote_etag(tag, weak=True), 'Cache-Control': CACHE_CONTROL}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(tag)
+    elif request.if_modified_since and last_modified is not None and not undated:
+        fresh = last_modified.replace(microsecond=0) <= request.if_modified_since
+    else:
+        fresh = False
+    return (Response(status=304, headers=headers) if fresh else None), headers
@@ -0,0 +1,164 @@
+# app/imports.py
+"""
+File imports of translation pairs (CSV, TSV, JSONL).
+
+The upload is spooled to IMPORT_DIR/<import_id>.<fmt> and parsed as a stream
+by a background job that inserts and commits CHUNK_ROWS rows at a time. After
+every commit a checkpoint (<import_id>.state.json) records how many rows are
+done, so a job killed by a crash or deploy resumes where it stopped instead
+of re-reading the file from the top. Rows already in the table (same
+content_hash) are reported as duplicates, so a replayed chunk adds nothing.
+Malformed lines and rows that fail validation are recorded in the checkpoint's
+`errors` with their line number, and the import carries on.
+"""
+import csv
+import json
+import os
+
+from . import bulk, counts, response_cache
+from .jobs import valid_id  # import ids are job ids
+from .pipeline.io_utils import ensure_dir
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_DIR = os.environ.get("IMPORT_DIR", os.path.join(BASE_DIR, "data", "imports"))
+
+FORMATS = ("csv", "tsv", "jsonl")
+CHUNK_ROWS = 5000
+# Error rows kept in the checkpoint for the report; the count is always exact
+MAX_REPORTED_ERRORS = 1000
+
+
+def guess_format(filename):
+    ext = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if ext == "ndjson":
+        ext = "jsonl"
+    return ext if ext in FORMATS else None
+
+
+def data_path(import_id, fmt):
+    return os.path.join(IMPORT_DIR, f"{import_id}.{fmt}")
+
+
+def state_path(import_id):
+    return os.path.join(IMPORT_DIR, f"{import_id}.state.json")
+
+
+def spool(file_storage, import_id, fmt):
+    """Copy the uploaded file to disk in blocks and write the initial checkpoint."""
+    ensure_dir(IMPORT_DIR)
+    file_storage.save(data_path(import_id, fmt))
+    save_state(import_id, {
+        "import_id": import_id, "format": fmt, "status": "queued",
+        "rows_done": 0, "added": 0, "duplicates": 0, "error_count": 0, "errors": [],
+    })
+
+
+def load_state(import_id):
+    try:
+        with open(state_path(import_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_state(import_id, state):
+    # Write-then-rename so a crash never leaves a torn checkpoint
+    path = state_path(import_id)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def iter_rows(path, fmt):
+    """
+    Yield (line number, row dict) from the spooled file without loading it into
+    memory. A line that can't be parsed is yielded as (line, ValueError) so the
+    import reports it and carries on.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if fmt == "jsonl":
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError as e:
+                    yield line_no, ValueError(f"Invalid JSON: {e}")
+            return
+
+        reader = csv.DictReader(f, delimiter="\t" if fmt == "tsv" else ",")
+        reader.fieldnames  # read the header so line numbers start at the first record
+        start = reader.line_num + 1
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                row = ValueError(f"Invalid {fmt.upper()}: {e}")
+            yield start, row
+            start = reader.line_num + 1
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_import(db_session, progress=None, import_id=None, chunk_rows=CHUNK_ROWS):
+    """
+    Import (or resume importing) a spooled file. Rows already counted in the
+    checkpoint are skipped; each chunk is committed before the checkpoint
+    advances, so at worst the last chunk is replayed (as duplicates) after a crash.
+    """
+    state = load_state(import_id)
+    fmt = state["format"]
+    skip = state["rows_done"]
+    state["status"] = "running"
+    save_state(import_id, state)
+
+    if progress:
+        progress(skip, added=state["added"], duplicates=state["duplicates"], error_count=state["error_count"])
+    rows = iter_rows(data_path(import_id, fmt), fmt)
+    for _ in range(skip):
+        next(rows, None)
+
+    try:
+        for chunk in _chunks(rows, chunk_rows):
+            lines, parsed = zip(*chunk)
+            values, results = bulk.prepare_pairs(list(parsed), first_row=state["rows_done"] + 1)
+            for line, result in zip(lines, results):
+                result["line"] = line
+            added, duplicates = bulk.insert_and_report(db_session, values, results)
+            db_session.commit()
+
+            errors = [r for r in results if r["status"] == "error"]
+            state["rows_done"] += len(chunk)
+            state["added"] += added
+            state["duplicates"] += duplicates
+            state["error_count"] += len(errors)
+            room = MAX_REPORTED_ERRORS - len(state["errors"])
+            state["errors"].extend(errors[:max(room, 0)])
+            save_state(import_id, state)
+            counts.invalidate()
+            response_cache.invalidate('translations')
+
+            if progress:
+                progress(state["rows_done"], added=state["added"], duplicates=state["duplicates"],
+                         error_count=state["error_count"])
+    except Exception:
+        state["status"] = "failed"
+        save_state(import_id, state)
+        raise
+
+    state["status"] = "succeeded"
+    save_state(import_id, state)
+    return {"rows": state["rows_done"], "added": state["added"], "duplicates": state["duplicates"],
+            "error_count": state["error_count"]}
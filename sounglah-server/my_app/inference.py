@@ -0,0 +1,80 @@
+# app/inference.py
+from contextlib import nullcontext
+
+try:
+    import torch
+except ImportError:  # torch ships with the model; tests can run without it
+    torch = None
+
+
+def _no_grad():
+    return torch.inference_mode() if torch is not None else nullcontext()
+
+
+def length_sorted_batches(texts: list[str], batch_size: int):
+    """
+    Yield (indices, texts) chunks with similar lengths grouped together so that
+    padding inside each batch stays small. Indices refer to the input order.
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i] or ""))
+    for start in range(0, len(order), batch_size):
+        idxs = order[start:start + batch_size]
+        yield idxs, [texts[i] or "" for i in idxs]
+
+
+def translate_batch(tokenizer, model, texts: list[str], *, batch_size: int = 32, max_length: int = 256) -> list[str]:
+    """
+    Translate many texts with the loaded seq2seq model.
+    Returns one output per input, in input order.
+    """
+    outputs: list[str] = [""] * len(texts)
+    with _no_grad():
+        for idxs, chunk in length_sorted_batches(texts, batch_size):
+            enc = tokenizer(
+                chunk,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=max_length,
+            )
+            generated = model.generate(**enc, max_length=max_length)
+            decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
+            for i, text in zip(idxs, decoded):
+                outputs[i] = text
+    return outputs
+
+
+def score_pairs(tokenizer, model, sources: list[str], targets: list[str], *, batch_size: int = 64, max_length: int = 256) -> list[float]:
+    """
+    Teacher-forced quality estimate: mean per-token log-probability of each
+    target given its source, from a single forward pass per batch (no generate).
+    Scores are <= 0; lower means the model finds the pair less plausible.
+    """
+    scores: list[float] = [0.0] * len(sources)
+    combined = [(s or "") + (t or "") for s, t in zip(sources, targets)]
+    with _no_grad():
+        for idxs, _ in length_sorted_batches(combined, batch_size):
+            enc = tokenizer(
+                [sources[i] or "" for i in idxs],
+                text_target=[targets[i] or "" for i in idxs],
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=max_length,
+            )
+            labels = enc["labels"]
+            mask = labels != tokenizer.pad_token_id
+            # -100 is ignored by the loss and still lets the model shift labels into decoder inputs
+            labels = labels.masked_fill(~mask, -100)
+            logits = model(
+                input_ids=enc["input_ids"],
+                attention_mask=enc["attention_mask"],
+                labels=labels,
+            ).logits
+            log_probs = logits.log_softmax(dim=-1)
+            token_lp = log_probs.gather(-1, labels.clamp(min=0).unsqueeze(-1)).squeeze(-1)
+            totals = (token_lp * mask).sum(dim=-1)
+            lengths = mask.sum(dim=-1).clamp(min=1)
+            for i, value in zip(idxs, (totals / lengths).tolist()):
+                scores[i] = float(value)
+    return scores
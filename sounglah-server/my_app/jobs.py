@@ -0,0 +1,135 @@
+# app/jobs.py
+"""
+In-process registry for long-running data jobs (bulk edits, imports, exports).
+Jobs run on a daemon thread inside an app context; their state lives in
+`app.extensions['jobs']` and is polled by the client.
+"""
+import logging
+import re
+import traceback
+from datetime import datetime, timezone
+from threading import Lock, Thread
+from uuid import uuid4
+
+from flask import current_app
+
+from . import db
+
+logger = logging.getLogger(__name__)
+
+_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# Finished jobs kept for polling before the oldest are forgotten
+MAX_FINISHED_JOBS = 200
+
+
+class Job:
+    def __init__(self, kind, user_id=None, job_id=None):
+        self.id = job_id or uuid4().hex
+        self.kind = kind
+        self.user_id = user_id
+        self.status = 'queued'
+        self.processed = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.stats = {}
+        # First processed value reported; resumed jobs start above zero
+        self._baseline = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at = None
+        self.finished_at = None
+        self._lock = Lock()
+
+    def progress(self, processed, total=None, **stats):
+        """Progress callback handed to the job function; extra counters go to `stats`."""
+        with self._lock:
+            if self._baseline is None:
+                self._baseline = processed
+            self.processed = processed
+            if total is not None:
+                self.total = total
+            self.stats.update(stats)
+
+    def _rate(self):
+        if not self.started_at or self._baseline is None:
+            return None
+        elapsed = ((self.finished_at or datetime.now(timezone.utc)) - self.started_at).total_seconds()
+        return round((self.processed - self._baseline) / elapsed, 1) if elapsed > 0 else None
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'processed': self.processed,
+                'total': self.total,
+                'rows_per_s': self._rate(),
+                'stats': dict(self.stats),
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at.isoformat(),
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            }
+
+
+class JobRegistry:
+    def __init__(self):
+        self._jobs = {}
+        self._lock = Lock()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def add(self, job):
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = sorted((j for j in self._jobs.values() if j.finished_at), key=lambda j: j.finished_at)
+            for old in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self._jobs[old.id]
+
+
+def _run(app, job, fn, kwargs):
+    with app.app_context():
+        job.status = 'running'
+        job.started_at = datetime.now(timezone.utc)
+        try:
+            result = fn(db.session, progress=job.progress, **kwargs)
+            job.result = result
+            job.status = 'succeeded'
+        except Exception:
+            db.session.rollback()
+            logger.error("%s job %s failed", job.kind, job.id, exc_info=True)
+            job.error = traceback.format_exc()[:4000]
+            job.status = 'failed'
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+
+def start(kind, fn, user_id=None, job_id=None, **kwargs):
+    """
+    Run `fn(db_session, progress=callback, **kwargs)` in the background and
+    return its Job. The function commits its own work in chunks. Pass `job_id`
+    to resume a job under the id the client already knows.
+    """
+    app = current_app._get_current_object()
+    job = Job(kind, user_id=user_id, job_id=job_id)
+    app.extensions['jobs'].add(job)
+    Thread(target=_run, args=(app, job, fn, kwargs), daemon=True).start()
+    return job
+
+
+def valid_id(job_id):
+    """Job ids name files and directories (imports, exports); only accept the hex ids we hand out."""
+    return bool(_ID_RE.match(job_id or ""))
+
+
+def get(job_id):
+    return current_app.extensions['jobs'].get(job_id)
+
+
+def is_active(job_id):
+    job = get(job_id)
+    return bool(job and job.status in ('queued', 'running'))
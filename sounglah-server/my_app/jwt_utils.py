@@ -65,6 +65,17 @@ def token_required(f):
     
     return decorated
 
+def admin_required(f):
+    """Decorator for admin-only endpoints; apply below token_required"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        user = get_current_user()
+        if not user or not user.role or user.role.name != 'admin':
+            return {'error': 'Admin role required'}, 403
+        return f(*args, **kwargs)
+
+    return decorated
+
 def get_current_user():
     """Get current user from Flask's g object"""
     return getattr(g, 'current_user', None)
@@ -0,0 +1,103 @@
+# app/lang_detect.py
+import logging
+import os
+import random
+import time
+from langid.langid import LanguageIdentifier, model
+from .cache import TTLCache, MISSING
+from .ngram_langid import NgramLangID, DEFAULT_PATH as NGRAM_PATH
+
+logger = logging.getLogger(__name__)
+
+# Only score the languages users can actually pick; langid has no Medumba model
+SUPPORTED_LANGUAGES = [
+    code.strip()
+    for code in os.environ.get("DETECTLANG_LANGUAGES", "en,fr").split(",")
+    if code.strip()
+]
+# Fraction of detection calls that get a log line
+LOG_SAMPLE_RATE = float(os.environ.get("DETECTLANG_LOG_SAMPLE_RATE", "0.01"))
+CACHE_SIZE = 8192
+MAX_BATCH = 1000
+# The n-gram model overrides langid only for labels langid can't produce (e.g. Medumba)
+NGRAM_MIN_PROB = 0.9
+
+# Singleton identifier with normalized probabilities in [0,1], like pipeline/filter_lang.py
+_IDENTIFIER = LanguageIdentifier.from_modelstring(model, norm_probs=True)
+_IDENTIFIER.set_languages(SUPPORTED_LANGUAGES)
+
+# Results only change when the n-gram model is reloaded, which clears the cache
+_cache = TTLCache(maxsize=CACHE_SIZE, ttl=float("inf"))
+_ngram = None
+_ngram_loaded = False
+
+
+def ngram_model():
+    """The trained n-gram identifier, or None if `flask langid-train` hasn't been run."""
+    global _ngram, _ngram_loaded
+    if not _ngram_loaded:
+        if os.path.exists(NGRAM_PATH):
+            try:
+                _ngram = NgramLangID.load(NGRAM_PATH)
+                logger.info("Loaded n-gram language model with labels %s", _ngram.labels)
+            except Exception:
+                logger.error("Failed to load n-gram language model", exc_info=True)
+        _ngram_loaded = True
+    return _ngram
+
+
+def reload_ngram_model():
+    global _ngram, _ngram_loaded
+    _ngram, _ngram_loaded = None, False
+    _cache.clear()
+    return ngram_model()
+
+
+def _classify(texts: list[str]) -> list[tuple[str, float]]:
+    results: list = [None] * len(texts)
+    ngram = ngram_model()
+    if ngram is not None:
+        for i, (label, prob) in enumerate(ngram.classify_batch(texts)):
+            if label not in SUPPORTED_LANGUAGES and prob >= NGRAM_MIN_PROB:
+                results[i] = (label, prob)
+    for i, text in enumerate(texts):
+        if results[i] is None:
+            label, prob = _IDENTIFIER.classify(text)
+            results[i] = (label, float(prob))
+    return results
+
+
+def detect_batch(texts: list[str]) -> list[tuple[str, float]]:
+    """(label, probability) per input; repeated inputs are served from an LRU cache."""
+    t0 = time.perf_counter()
+    texts = [t or "" for t in texts]
+    results: list = [None] * len(texts)
+    misses: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        hit = _cache.get(text)
+        if hit is MISSING:
+            misses.setdefault(text, []).append(i)
+        else:
+            results[i] = hit
+
+    if misses:
+        # Misses are classified together so the n-gram model scores them in one batch
+        unique = list(misses)
+        for text, value in zip(unique, _classify(unique)):
+            _cache.set(text, value)
+            for i in misses[text]:
+                results[i] = value
+
+    if random.random() < LOG_SAMPLE_RATE:
+        logger.info(
+            "detectlang batch=%d cache_misses=%d elapsed_ms=%.2f labels=%s",
+            len(texts),
+            len(misses),
+            (time.perf_counter() - t0) * 1000,
+            ",".join(sorted({label for label, _ in results})),
+        )
+    return results
+
+
+def detect(text: str) -> tuple[str, float]:
+    return detect_batch([text])[0]
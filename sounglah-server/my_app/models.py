@@ -2,7 +2,9 @@
 from . import db
 from datetime import datetime
 from uuid import uuid4
+from sqlalchemy import inspect
 from sqlalchemy.dialects.postgresql import ENUM, UUID, JSONB
+from .pipeline.normalize import fold_pair, content_hash
 
 translation_status_enum = ENUM('pending', 'rejected', 'approved', name='translation_status', create_type=True)
 augmentation_status_enum = ENUM('queued', 'running', 'succeeded', 'failed', name='augmentation_status', create_type=True)
@@ -24,11 +26,22 @@ class TranslationPair(db.Model):
     target_lang_id = db.Column(db.Integer, db.ForeignKey('languages.id', ondelete='CASCADE'), index=True)
     status = db.Column(translation_status_enum, nullable=False, default='pending', index=True)
     domain = db.Column(db.Text, index=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # Never NULL: created_at keyset cursors need a value on every row
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=db.func.now(), index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
     reviewer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     # Timestamp when a pair became approved; NULL for non-approved statuses
     approved_at = db.Column(db.DateTime, nullable=True, index=True)
+    # Machine-suggested target produced by the background pre-translation job
+    machine_translation = db.Column(db.Text, nullable=True)
+    machine_translated_at = db.Column(db.DateTime, nullable=True)
+    # Length-normalized model log-likelihood of target given source (higher = more plausible)
+    qe_score = db.Column(db.Float, nullable=True)
+    qe_scored_at = db.Column(db.DateTime, nullable=True)
+    # Accent/apostrophe-folded source + target (see pipeline.normalize.fold_pair) for search
+    search_folded = db.Column(db.Text, nullable=True)
+    # Hash of the normalized (source, target, language ids); see pipeline.normalize.content_hash
+    content_hash = db.Column(db.String(32), nullable=True)
 
     # Composite indexes for common query patterns
     __table_args__ = (
@@ -42,8 +55,60 @@ class TranslationPair(db.Model):
             'id',
             postgresql_where=(status == 'approved'),
         ),
+        # Keyset scans over pending pairs still waiting for a machine suggestion
+        db.Index(
+            'ix_translationpair_pending_untranslated',
+            'id',
+            postgresql_where=db.and_(
+                status == 'pending',
+                target_text.is_(None),
+                machine_translation.is_(None),
+            ),
+        ),
+        # Review queue ordered "most suspicious first" within a status
+        db.Index('ix_translationpair_status_qe', 'status', 'qe_score', 'id'),
+        # One row per normalized pair; duplicate checks are a single probe here
+        db.Index('ux_translationpair_content_hash', 'content_hash', unique=True),
+        # Trigram index so folded '%term%' search doesn't scan the table (needs pg_trgm)
+        db.Index(
+            'ix_translationpair_search_folded_trgm',
+            'search_folded',
+            postgresql_using='gin',
+            postgresql_ops={'search_folded': 'gin_trgm_ops'},
+        ),
+        # Keyset scans over pairs still waiting for a quality score
+        db.Index(
+            'ix_translationpair_unscored',
+            'id',
+            postgresql_where=db.and_(
+                target_text.is_not(None),
+                qe_score.is_(None),
+            ),
+        ),
     )
 
+# Columns search_folded and content_hash are derived from
+CONTENT_COLUMNS = ('source_text', 'target_text', 'source_lang_id', 'target_lang_id')
+
+def content_changed(pair):
+    """True when `pair` has pending changes to any of CONTENT_COLUMNS."""
+    state = inspect(pair)
+    return any(state.attrs[name].history.has_changes() for name in CONTENT_COLUMNS)
+
+@db.event.listens_for(TranslationPair, 'before_insert')
+def _set_derived_columns(mapper, connection, target):
+    target.search_folded = fold_pair(target.source_text, target.target_text)
+    target.content_hash = content_hash(
+        target.source_text, target.target_text, target.source_lang_id, target.target_lang_id
+    )
+
+@db.event.listens_for(TranslationPair, 'before_update')
+def _refresh_derived_columns(mapper, connection, target):
+    # Status/domain-only edits keep the stored hash, so pre-existing duplicates
+    # (left without one by the dedup migration) can still be reviewed
+    if content_changed(target):
+        _set_derived_columns(mapper, connection, target)
+
 class AudioRecording(db.Model):
     __tablename__ = 'audio_recordings'
     id = db.Column(db.Integer, primary_key=True)
@@ -115,3 +180,12 @@ class PipelineCursor(db.Model):
 
     # Updated each time the cursor is advanced
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class DataVersion(db.Model):
+    __tablename__ = 'data_versions'
+
+    # Table name (e.g., 'translation_pairs'); bumped after every committed write
+    name = db.Column(db.Text, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    changed_at = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,272 @@
+# app/near_dup.py
+"""
+MinHash/LSH index over source_text for "an almost identical sentence already
+exists" suggestions on create and upload.
+
+Each source is folded (pipeline.normalize.fold_for_search), cut into character
+3-gram shingles and reduced to a NUM_PERM-value MinHash signature; signatures
+are split into BANDS bands of ROWS values and every band is a hash-table key.
+Two sources whose shingle sets have Jaccard similarity s share at least one
+band with probability 1 - (1 - s**ROWS)**BANDS (~0.64 at s=0.5, >0.99 at
+s=0.8), so a lookup touches only a handful of buckets instead of the table.
+
+The index lives in `app.extensions['near_dup']`, one per process, and is
+built on a background thread when the first request arrives (`warm`). It
+keeps the highest id it has seen and pulls newer rows before each lookup
+(up to SYNC_CATCH_UP_LIMIT inline, more in the background), so rows inserted
+by other workers or bulk paths show up without a hook. Candidates are
+re-read from the database and scored by exact Jaccard on their current text,
+so edited or deleted rows never produce stale suggestions.
+"""
+import logging
+import zlib
+from threading import Lock, Thread
+
+import numpy as np
+from sqlalchemy import select
+
+from .pipeline.normalize import fold_for_search
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+MIN_SIMILARITY = 0.5
+TOP_K = 5
+# Candidates re-scored per text (highest band-collision counts first)
+MAX_CANDIDATES = 50
+# Rows pulled per catch-up query; larger backlogs are built on a background thread
+CATCH_UP_BATCH = 5000
+SYNC_CATCH_UP_LIMIT = 1000
+# New rows are buffered and merged into the sorted band arrays in one sort
+MERGE_BATCH = 20000
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20250825)
+_A = _rng.integers(1, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+# Odd multipliers combining a band's ROWS values into one 32-bit key
+_BAND_MULT = _rng.integers(1, 1 << 62, size=ROWS, dtype=np.uint64) | np.uint64(1)
+_SLOT_MASK = np.uint64(0xFFFFFFFF)
+_SHIFT = np.uint64(32)
+
+
+def shingles(text: str) -> set[int]:
+    t = " " + fold_for_search(text) + " "
+    return {zlib.crc32(t[i:i + SHINGLE].encode("utf-8")) & 0x7FFFFFFF for i in range(max(1, len(t) - SHINGLE + 1))}
+
+
+def signature(shingle_set: set[int]) -> np.ndarray:
+    """MinHash signature: min over shingles of (a*x + b) mod p, one per permutation."""
+    x = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+    return ((_A[:, None] * x[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def band_keys(sig: np.ndarray) -> np.ndarray:
+    """One 32-bit key per band (uint64 array of BANDS values)."""
+    return (sig.reshape(BANDS, ROWS) * _BAND_MULT).sum(axis=1) >> _SHIFT
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class MinHashIndex:
+    """
+    Each band is one sorted uint64 array of (band key << 32 | slot), where a
+    slot indexes the id array. An indexed row costs BANDS * 8 + 8 bytes
+    (~140 MB per million rows), with no per-row Python objects; a bucket is
+    the searchsorted range of one key. New rows are buffered and merged in
+    one sort per MERGE_BATCH rows (or at the end of a catch-up).
+    """
+
+    def __init__(self):
+        self._ids = np.empty(0, dtype=np.int64)  # slot -> pair id, ascending
+        self._bands = [np.empty(0, dtype=np.uint64) for _ in range(BANDS)]
+        self._pending_ids: list[int] = []
+        self._pending_keys: list[np.ndarray] = []
+        self.max_id = 0
+        self.building = False
+        self.warmed = False
+        self._lock = Lock()
+        self._catch_up_lock = Lock()
+
+    def __len__(self):
+        """Number of indexed rows."""
+        with self._lock:
+            return len(self._ids) + len(self._pending_ids)
+
+    def _merge(self):
+        if not self._pending_ids:
+            return
+        first = len(self._ids)
+        slots = np.arange(first, first + len(self._pending_ids), dtype=np.uint64)
+        keys = np.vstack(self._pending_keys)
+        self._ids = np.concatenate([self._ids, np.array(self._pending_ids, dtype=np.int64)])
+        for b in range(BANDS):
+            self._bands[b] = np.sort(np.concatenate([self._bands[b], (keys[:, b] << _SHIFT) | slots]))
+        self._pending_ids, self._pending_keys = [], []
+
+    def add(self, pair_id: int, source_text: str, merge=True):
+        """Index a new pair (ids arrive in ascending order), or re-index an edited one."""
+        keys = band_keys(signature(shingles(source_text)))
+        with self._lock:
+            if pair_id > self.max_id:
+                self._pending_ids.append(pair_id)
+                self._pending_keys.append(keys)
+                self.max_id = pair_id
+                if merge and len(self._pending_ids) >= MERGE_BATCH:
+                    self._merge()
+                return
+            self._merge()
+            slot = int(np.searchsorted(self._ids, pair_id))
+            if slot == len(self._ids) or self._ids[slot] != pair_id:
+                return
+            # Drop the slot's old entries from every band, then insert the new ones
+            entry = np.uint64(slot)
+            for b in range(BANDS):
+                band = self._bands[b]
+                band = band[(band & _SLOT_MASK) != entry]
+                new = (keys[b] << _SHIFT) | entry
+                self._bands[b] = np.insert(band, np.searchsorted(band, new), new)
+
+    def catch_up(self, db_session, limit=None) -> int:
+        """Index rows with id > max_id; returns how many were added."""
+        from .models import TranslationPair
+
+        added = 0
+        with self._catch_up_lock:
+            while limit is None or added < limit:
+                batch = CATCH_UP_BATCH if limit is None else min(CATCH_UP_BATCH, limit - added)
+                rows = db_session.execute(
+                    select(TranslationPair.id, TranslationPair.source_text)
+                    .where(TranslationPair.id > self.max_id)
+                    .order_by(TranslationPair.id)
+                    .limit(batch)
+                ).all()
+                if not rows:
+                    break
+                for r in rows:
+                    self.add(r.id, r.source_text, merge=False)
+                added += len(rows)
+                if len(self._pending_ids) >= MERGE_BATCH:
+                    with self._lock:
+                        self._merge()
+            with self._lock:
+                self._merge()
+        return added
+
+    def candidates(self, source_text: str) -> list[int]:
+        """Ids sharing at least one band, most shared bands first."""
+        keys = band_keys(signature(shingles(source_text)))
+        found = []
+        with self._lock:
+            for b in range(BANDS):
+                band = self._bands[b]
+                lo, hi = np.searchsorted(band, [keys[b] << _SHIFT, (keys[b] + np.uint64(1)) << _SHIFT])
+                if hi > lo:
+                    found.append(self._ids[(band[lo:hi] & _SLOT_MASK).astype(np.int64)])
+            if self._pending_ids:
+                shared = (np.vstack(self._pending_keys) == keys).sum(axis=1)
+                pending = np.array(self._pending_ids, dtype=np.int64)
+                found.append(np.repeat(pending, shared))
+        if not found:
+            return []
+        ids, hits = np.unique(np.concatenate(found), return_counts=True)
+        best = np.argsort(-hits, kind="stable")[:MAX_CANDIDATES]
+        return [int(i) for i in ids[best]]
+
+
+def reindex(pair_id: int, source_text: str):
+    """Call after a pair's source_text changes so lookups find its new text."""
+    from flask import current_app
+
+    index = current_app.extensions['near_dup']
+    if pair_id <= index.max_id:
+        index.add(pair_id, source_text)
+
+
+def _build(app, index):
+    with app.app_context():
+        from . import db
+        try:
+            index.catch_up(db.session)
+        except Exception:
+            logger.error("near-duplicate index build failed", exc_info=True)
+        finally:
+            db.session.remove()
+            index.building = False
+
+
+def _start_build(app, index):
+    index.building = True
+    Thread(target=_build, args=(app, index), daemon=True).start()
+
+
+def warm():
+    """before_request hook: build the process index in the background once, off the request path."""
+    from flask import current_app
+
+    index = current_app.extensions['near_dup']
+    if index.warmed:
+        return
+    index.warmed = True
+    if not index.building:
+        _start_build(current_app._get_current_object(), index)
+
+
+def _ready_index(db_session):
+    """The process index, caught up to the table unless a larger backlog is still building."""
+    from flask import current_app
+
+    index = current_app.extensions['near_dup']
+    if index.building:
+        return None
+    pending = index.catch_up(db_session, limit=SYNC_CATCH_UP_LIMIT)
+    if pending < SYNC_CATCH_UP_LIMIT:
+        return index
+    _start_build(current_app._get_current_object(), index)
+    return None
+
+
+def similar_batch(db_session, items, top_k=TOP_K, min_similarity=MIN_SIMILARITY) -> list[list[dict]]:
+    """
+    For each (source_text, source_lang_id), existing pairs in the same source
+    language whose source is at least `min_similarity` similar (shingle
+    Jaccard), best first. All candidates are re-read in one query.
+    """
+    from .models import TranslationPair
+
+    index = _ready_index(db_session)
+    if index is None or not items:
+        return [[] for _ in items]
+
+    per_item = [index.candidates(text) for text, _ in items]
+    wanted = {i for ids in per_item for i in ids}
+    if not wanted:
+        return [[] for _ in items]
+    rows = {
+        r.id: r for r in db_session.execute(
+            select(TranslationPair.id, TranslationPair.source_text, TranslationPair.target_text,
+                   TranslationPair.source_lang_id)
+            .where(TranslationPair.id.in_(wanted))
+        )
+    }
+
+    out = []
+    for (text, lang_id), ids in zip(items, per_item):
+        query = shingles(text)
+        scored = []
+        for pair_id in ids:
+            r = rows.get(pair_id)
+            if r is None or r.source_lang_id != lang_id:
+                continue
+            sim = jaccard(query, shingles(r.source_text))
+            if sim >= min_similarity:
+                scored.append({'id': r.id, 'source_text': r.source_text, 'target_text': r.target_text,
+                               'similarity': round(sim, 3)})
+        scored.sort(key=lambda s: -s['similarity'])
+        out.append(scored[:top_k])
+    return out
@@ -0,0 +1,165 @@
+# app/ngram_langid.py
+"""
+Character n-gram language identifier trained from our own approved pairs.
+
+langid.py ships no Medumba model, so this one learns every language we store
+(including the Medumba target side). Features are hashed character 1-4 grams;
+the model is multinomial naive Bayes, so a batch scores as one sparse
+feature-matrix x log-weight-matrix product.
+"""
+import os
+import time
+import unicodedata
+import zlib
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.environ.get("NGRAM_LANGID_PATH", os.path.join(BASE_DIR, "models", "langid-ngram.npz"))
+
+N_FEATURES = 2 ** 18
+NGRAM_RANGE = (1, 4)
+ALPHA = 0.1  # Laplace smoothing
+
+
+def _grams(text: str, n_features: int, ngram_range=NGRAM_RANGE) -> dict[int, int]:
+    t = " " + unicodedata.normalize("NFC", (text or "").lower()) + " "
+    counts: dict[int, int] = {}
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        for i in range(len(t) - n + 1):
+            h = zlib.crc32(t[i:i + n].encode("utf-8")) % n_features
+            counts[h] = counts.get(h, 0) + 1
+    return counts
+
+
+def featurize(texts: list[str], n_features: int = N_FEATURES):
+    """Sparse batch features as CSR-style (indptr, indices, values) arrays."""
+    indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+    indices, values = [], []
+    for row, text in enumerate(texts):
+        grams = _grams(text, n_features)
+        indices.extend(grams.keys())
+        values.extend(grams.values())
+        indptr[row + 1] = indptr[row] + len(grams)
+    return indptr, np.asarray(indices, dtype=np.int64), np.asarray(values, dtype=np.float32)
+
+
+class NgramLangID:
+    def __init__(self, labels: list[str], log_weights: np.ndarray, log_prior: np.ndarray):
+        self.labels = list(labels)
+        self.log_weights = log_weights.astype(np.float32)   # (n_features, n_labels)
+        self.log_prior = log_prior.astype(np.float32)       # (n_labels,)
+        self.n_features = log_weights.shape[0]
+
+    @classmethod
+    def train(cls, texts: list[str], labels: list[str], n_features: int = N_FEATURES, alpha: float = ALPHA):
+        classes = sorted(set(labels))
+        y = np.array([classes.index(label) for label in labels], dtype=np.int64)
+        indptr, indices, values = featurize(texts, n_features)
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        counts = np.zeros((n_features, len(classes)), dtype=np.float64)
+        np.add.at(counts, (indices, y[rows]), values)
+        totals = counts.sum(axis=0)
+        log_weights = np.log(counts + alpha) - np.log(totals + alpha * n_features)
+        log_prior = np.log(np.bincount(y, minlength=len(classes)) / len(y))
+        return cls(classes, log_weights, log_prior)
+
+    def scores(self, texts: list[str]) -> np.ndarray:
+        """Unnormalized log-scores, shape (len(texts), n_labels): X @ W + prior."""
+        if not texts:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+        indptr, indices, values = featurize(texts, self.n_features)
+        contrib = self.log_weights[indices] * values[:, None]
+        # Every text has at least the " " unigram, so no row is empty
+        return np.add.reduceat(contrib, indptr[:-1], axis=0) + self.log_prior
+
+    def classify_batch(self, texts: list[str]) -> list[tuple[str, float]]:
+        s = self.scores(texts)
+        if not len(s):
+            return []
+        s = s - s.max(axis=1, keepdims=True)
+        probs = np.exp(s)
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        return [(self.labels[b], float(probs[i, b])) for i, b in enumerate(best)]
+
+    def save(self, path: str = DEFAULT_PATH) -> str:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            labels=np.array(self.labels),
+            log_weights=self.log_weights,
+            log_prior=self.log_prior,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH):
+        data = np.load(path, allow_pickle=False)
+        return cls([str(x) for x in data["labels"]], data["log_weights"], data["log_prior"])
+
+
+def load_training_rows(db_session, min_chars: int = 3) -> tuple[list[str], list[str]]:
+    """Approved source/target texts labelled with their language ISO codes."""
+    from my_app.models import TranslationPair, Language
+
+    sl = aliased(Language); tl = aliased(Language)
+    stmt = (
+        select(
+            TranslationPair.source_text,
+            TranslationPair.target_text,
+            sl.iso_code.label("source_lang"),
+            tl.iso_code.label("target_lang"),
+        )
+        .join(sl, TranslationPair.source_lang_id == sl.id)
+        .join(tl, TranslationPair.target_lang_id == tl.id)
+        .where(TranslationPair.status == 'approved')
+    )
+    texts, labels = [], []
+    for r in db_session.execute(stmt):
+        for text, lang in ((r.source_text, r.source_lang), (r.target_text, r.target_lang)):
+            if lang and text and len(text.strip()) >= min_chars:
+                texts.append(text)
+                labels.append(lang)
+    return texts, labels
+
+
+def benchmark(model: NgramLangID, texts: list[str], labels: list[str]) -> dict:
+    """Accuracy and throughput of this model vs. langid.py on the same labelled texts."""
+    import langid
+
+    t0 = time.perf_counter()
+    ours = [label for label, _ in model.classify_batch(texts)]
+    ours_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    theirs = [langid.classify(t)[0] for t in texts]
+    theirs_s = time.perf_counter() - t0
+
+    gold = np.array(labels)
+    ours_ok = np.array(ours) == gold
+    theirs_ok = np.array(theirs) == gold
+    # langid can only be right on labels it knows
+    known = np.isin(gold, [code for code, _ in langid.rank("x")])
+    n = len(texts)
+
+    def _acc(mask, ok):
+        return round(float(ok[mask].mean()), 4) if mask.any() else None
+
+    return {
+        "samples": n,
+        "ngram": {
+            "accuracy": _acc(np.ones(n, dtype=bool), ours_ok),
+            "accuracy_langid_labels": _acc(known, ours_ok),
+            "texts_per_s": round(n / ours_s, 1) if ours_s > 0 else None,
+        },
+        "langid": {
+            "accuracy": _acc(np.ones(n, dtype=bool), theirs_ok),
+            "accuracy_langid_labels": _acc(known, theirs_ok),
+            "texts_per_s": round(n / theirs_s, 1) if theirs_s > 0 else None,
+        },
+        "per_label": {
+            label: int((gold == label).sum()) for label in sorted(set(labels))
+        },
+    }
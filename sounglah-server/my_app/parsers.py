@@ -1,4 +1,4 @@
-from flask_restx import reqparse
+from flask_restx import reqparse, inputs
 
 translate_args = reqparse.RequestParser()
 translate_args.add_argument('srcLanguage', type=str, help="Source Language missing", required=True)
@@ -19,6 +19,13 @@ get_translations_args.add_argument('search', type=str, help="Search term for sou
 get_translations_args.add_argument('after_id', type=int, help="Return results after this translation ID (for keyset pagination)")
 get_translations_args.add_argument('created_at_start', type=str, help="Start date (ISO8601) for created_at filter")
 get_translations_args.add_argument('created_at_end', type=str, help="End date (ISO8601) for created_at filter")
+get_translations_args.add_argument('sort', type=str, choices=('id', 'created_at', 'qe_score', 'relevance'), default='id', help="Sort order: id, created_at, qe_score (most suspicious first), or relevance (with search)")
+get_translations_args.add_argument('order', type=str, choices=('asc', 'desc'), default='asc', help="Sort direction for id and created_at")
+get_translations_args.add_argument('include_total', type=inputs.boolean, default=True, help="Set false to skip computing the total")
+get_translations_args.add_argument('count', type=str, choices=('exact', 'estimated'), default='exact', help="exact (cached briefly) or planner-estimated total")
+get_translations_args.add_argument('cursor', type=str, help="Opaque next_cursor from a previous page (keyset pagination)")
+get_translations_args.add_argument('legacy_duplicate', type=inputs.boolean, help="Only pre-existing duplicates left without a content hash (to reject or edit)")
+get_translations_args.add_argument('fields', type=str, help="Comma-separated fields to return per translation (default: all)")
 
 login_args = reqparse.RequestParser()
 login_args.add_argument('username', type=str, help="Username", required=True)
@@ -0,0 +1,38 @@
+# app/pipeline/backfill.py
+import time
+from sqlalchemy import select, update
+from my_app.models import TranslationPair
+from .normalize import fold_pair
+
+BATCH = 2000
+
+
+def backfill_search_folded(db_session, *, batch_size: int = BATCH, refold_all: bool = False) -> dict:
+    """
+    Compute `search_folded` in keyset batches, committing each one.
+    By default only rows with a NULL folded value are touched; `refold_all`
+    recomputes every row (e.g. after changing the folding rules).
+    """
+    t0 = time.time()
+    last_id = 0
+    updated = 0
+    while True:
+        stmt = (
+            select(TranslationPair.id, TranslationPair.source_text, TranslationPair.target_text)
+            .where(TranslationPair.id > last_id)
+            .order_by(TranslationPair.id.asc())
+            .limit(batch_size)
+        )
+        if not refold_all:
+            stmt = stmt.where(TranslationPair.search_folded.is_(None))
+        rows = db_session.execute(stmt).all()
+        if not rows:
+            break
+        db_session.execute(
+            update(TranslationPair),
+            [{"id": r.id, "search_folded": fold_pair(r.source_text, r.target_text)} for r in rows],
+        )
+        db_session.commit()
+        last_id = rows[-1].id
+        updated += len(rows)
+    return {"updated": updated, "runtime_s": round(time.time() - t0, 2)}
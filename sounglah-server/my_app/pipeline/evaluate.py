@@ -0,0 +1,71 @@
+# app/pipeline/evaluate.py
+import os
+import time
+import numpy as np
+from my_app.inference import translate_batch, length_sorted_batches
+from .io_utils import read_jsonl, write_json
+from .metrics import corpus_bleu, corpus_chrf
+
+PROCESSED_DIR = "data/processed"
+EVAL_BATCH = 32
+
+
+def run_eval(run_id: str, tokenizer, model, *, batch_size: int = EVAL_BATCH, label: str | None = None) -> dict:
+    """
+    Translate a pipeline run's test split and score it against the references.
+    Writes `_eval.json` (or `_eval_<label>.json`) next to the run's `_card.json`
+    so different models can be compared on identical data.
+
+    Latency percentiles are per batch: each sentence is charged the wall time
+    of the batch it was translated in, which is what a caller of the batched
+    endpoint waits. sentences_per_s is sentences over total wall time.
+    """
+    outdir = f"{PROCESSED_DIR}/{run_id}"
+    test_path = f"{outdir}/test.jsonl"
+    if not os.path.exists(test_path):
+        raise FileNotFoundError(f"No test split for run {run_id}: {test_path}")
+
+    rows = read_jsonl(test_path)
+    sources = [r["source_text"] for r in rows]
+    refs = [r["target_text"] for r in rows]
+
+    hyps = [""] * len(rows)
+    per_sentence_ms = []
+    t0 = time.perf_counter()
+    for idxs, chunk in length_sorted_batches(sources, batch_size):
+        tb = time.perf_counter()
+        outputs = translate_batch(tokenizer, model, chunk, batch_size=len(chunk))
+        elapsed_ms = (time.perf_counter() - tb) * 1000
+        # Every sentence in a batch waits for the whole batch
+        per_sentence_ms.extend([elapsed_ms] * len(chunk))
+        for i, out in zip(idxs, outputs):
+            hyps[i] = out
+    total_s = time.perf_counter() - t0
+
+    latencies = np.array(per_sentence_ms) if per_sentence_ms else np.zeros(1)
+    report = {
+        "run_id": run_id,
+        "label": label,
+        "created_at_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "model": getattr(getattr(model, "config", None), "_name_or_path", None),
+        "sentences": len(rows),
+        "batch_size": batch_size,
+        "quality": {
+            "bleu": round(corpus_bleu(hyps, refs), 2),
+            "chrf": round(corpus_chrf(hyps, refs), 2),
+        },
+        "throughput": {
+            "total_s": round(total_s, 3),
+            "sentences_per_s": round(len(rows) / total_s, 2) if total_s > 0 else None,
+            "latency_ms_p50": round(float(np.percentile(latencies, 50)), 2),
+            "latency_ms_p95": round(float(np.percentile(latencies, 95)), 2),
+            "latency_scope": "batch",
+        },
+        "samples": [
+            {"id": r.get("id"), "source": s, "reference": ref, "hypothesis": h}
+            for r, s, ref, h in list(zip(rows, sources, refs, hyps))[:10]
+        ],
+    }
+    name = f"_eval_{label}.json" if label else "_eval.json"
+    report["report_path"] = write_json(f"{outdir}/{name}", report)
+    return report
@@ -34,12 +34,15 @@ def run_filter_lang(
     min_prob: float = 0.55,     # top class probability
     min_margin: float = 0.20,   # separation from runner-up
     skip_short_words: int = 3,
-    skip_symboly: bool = True
+    skip_symboly: bool = True,
+    target_model=None,
 ):
     """
     - Skip checking very short/symbolic strings (UI labels etc.).
     - Keep rows when label==expected (even if low confidence), but count them.
     - Drop ONLY when label!=expected AND the detector is confident (prob & margin).
+    - With `target_model` (an NgramLangID), also check target_text for languages
+      the model knows, in one batched call.
     Returns: (kept_rows, stats, dropped_rows_for_review)
     """
     keep, dropped = [], []
@@ -72,4 +75,34 @@ def run_filter_lang(
                 stats["kept_lowconf"] += 1
                 keep.append(r)
 
+    if target_model is not None:
+        keep, target_stats, target_dropped = _filter_target(
+            keep, target_model, min_prob=min_prob, skip_short_words=skip_short_words, skip_symboly=skip_symboly
+        )
+        stats.update(target_stats)
+        dropped.extend(target_dropped)
+
+    return keep, stats, dropped
+
+def _filter_target(rows, target_model, *, min_prob, skip_short_words, skip_symboly):
+    stats = {"checked_target": 0, "dropped_lang_target": 0}
+    idxs = [
+        i for i, r in enumerate(rows)
+        if r.get("target_lang") in target_model.labels
+        and _word_count(r.get("target_text") or "") >= skip_short_words
+        and not (skip_symboly and _mostly_symbols_or_digits(r.get("target_text") or ""))
+    ]
+    if not idxs:
+        return rows, stats, []
+
+    predictions = dict(zip(idxs, target_model.classify_batch([rows[i]["target_text"] for i in idxs])))
+    stats["checked_target"] = len(idxs)
+    keep, dropped = [], []
+    for i, r in enumerate(rows):
+        pred = predictions.get(i)
+        if pred and pred[0] != r["target_lang"] and pred[1] >= min_prob:
+            stats["dropped_lang_target"] += 1
+            dropped.append({**r, "side": "target", "detected": pred[0], "prob": pred[1]})
+        else:
+            keep.append(r)
     return keep, stats, dropped
@@ -18,6 +18,10 @@ def write_jsonl(path: str, rows: list[dict]) -> str:
             f.write(json.dumps(r, ensure_ascii=False, default=_default) + "\n")
     return path
 
+def read_jsonl(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
 def write_json(path: str, obj) -> str:
     ensure_dir(os.path.dirname(path))
     with open(path, "w", encoding="utf-8") as f:
@@ -0,0 +1,70 @@
+# app/pipeline/metrics.py
+from __future__ import annotations
+from collections import Counter
+from typing import List
+import numpy as np
+import regex as re
+
+BLEU_MAX_N = 4
+CHRF_MAX_N = 6
+CHRF_BETA = 2.0
+
+# 13a-style tokenization: split punctuation and symbols off words
+_PUNCT_RE = re.compile(r"([\p{P}\p{S}])")
+_WS_RE = re.compile(r"\s+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _WS_RE.sub(" ", _PUNCT_RE.sub(r" \1 ", text or "")).split()
+
+
+def _ngrams(seq, n: int) -> Counter:
+    return Counter(tuple(seq[i:i + n]) for i in range(len(seq) - n + 1))
+
+
+def _match_stats(hyp_units, ref_units, max_n: int) -> np.ndarray:
+    """
+    Row of [matches_1..matches_n, totals_hyp_1..n, totals_ref_1..n] for one segment.
+    Clipped matches come from Counter intersection.
+    """
+    row = np.zeros(3 * max_n, dtype=np.int64)
+    for n in range(1, max_n + 1):
+        h, r = _ngrams(hyp_units, n), _ngrams(ref_units, n)
+        row[n - 1] = sum((h & r).values())
+        row[max_n + n - 1] = max(0, len(hyp_units) - n + 1)
+        row[2 * max_n + n - 1] = max(0, len(ref_units) - n + 1)
+    return row
+
+
+def corpus_bleu(hyps: List[str], refs: List[str], max_n: int = BLEU_MAX_N) -> float:
+    """Corpus BLEU (0-100) with brevity penalty, single reference."""
+    if not hyps:
+        return 0.0
+    toks = [(_tokenize(h), _tokenize(r)) for h, r in zip(hyps, refs)]
+    stats = np.stack([_match_stats(h, r, max_n) for h, r in toks]).sum(axis=0)
+    matches, totals = stats[:max_n], stats[max_n:2 * max_n]
+    if np.any(matches == 0):
+        return 0.0
+    log_prec = np.log(matches / totals).mean()
+    hyp_len = sum(len(h) for h, _ in toks)
+    ref_len = sum(len(r) for _, r in toks)
+    bp = 1.0 if hyp_len > ref_len else np.exp(1 - ref_len / max(1, hyp_len))
+    return float(100 * bp * np.exp(log_prec))
+
+
+def corpus_chrf(hyps: List[str], refs: List[str], max_n: int = CHRF_MAX_N, beta: float = CHRF_BETA) -> float:
+    """Corpus chrF (0-100): character n-gram F-beta, whitespace ignored."""
+    if not hyps:
+        return 0.0
+    stats = np.stack([
+        _match_stats(list(_WS_RE.sub("", h or "")), list(_WS_RE.sub("", r or "")), max_n)
+        for h, r in zip(hyps, refs)
+    ]).sum(axis=0).astype(np.float64)
+    matches, hyp_tot, ref_tot = stats[:max_n], stats[max_n:2 * max_n], stats[2 * max_n:]
+    prec = np.divide(matches, hyp_tot, out=np.zeros(max_n), where=hyp_tot > 0)
+    rec = np.divide(matches, ref_tot, out=np.zeros(max_n), where=ref_tot > 0)
+    p, r = prec.mean(), rec.mean()
+    if p + r == 0:
+        return 0.0
+    b2 = beta ** 2
+    return float(100 * (1 + b2) * p * r / (b2 * p + r))
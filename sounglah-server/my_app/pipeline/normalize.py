@@ -1,4 +1,4 @@
-import unicodedata, regex as re
+import hashlib, unicodedata, regex as re
 NBSP = "\u00A0"; ZWS = "\u200B"
 
 APOS_VARIANTS = ["'", "’", "ʼ", "ʹ"]  # keep U+02BC on target (Medumba)
@@ -40,3 +40,32 @@ def normalize_record(r: dict) -> dict:
 
 def run_normalize(rows): 
     return [normalize_record(r) for r in rows]
+
+# Medumba letters reviewers type as plain ASCII
+_ASCII_FOLD = str.maketrans({"ə": "e", "ɛ": "e", "ɔ": "o", "ʉ": "u", "ŋ": "ng", "Ə": "e", "Ɛ": "e", "Ɔ": "o", "Ʉ": "u", "Ŋ": "ng"})
+
+def fold_for_search(s: str) -> str:
+    """
+    Accent- and apostrophe-insensitive form used by the search_folded column:
+    same whitespace/NFC/apostrophe rules as above, then combining marks and
+    apostrophes dropped, Medumba letters mapped to ASCII and case folded,
+    so 'Bônkeʼ bə̂' and 'bonke be' match.
+    """
+    s = _canonical_apostrophes_med(_to_nfc(_clean_ws(s))).replace("ʼ", "")
+    s = "".join(ch for ch in unicodedata.normalize("NFD", s) if not unicodedata.combining(ch))
+    return s.translate(_ASCII_FOLD).casefold()
+
+def fold_pair(source_text: str, target_text: str) -> str:
+    # Newline never survives _clean_ws, so a match can't straddle the two texts
+    return fold_for_search(source_text) + "\n" + fold_for_search(target_text)
+
+def _dedup_form(s: str) -> str:
+    return _canonical_apostrophes_med(_to_nfc(_clean_ws(s))).casefold()
+
+def content_hash(source_text: str, target_text: str, source_lang_id, target_lang_id) -> str:
+    """
+    Identity of a pair for duplicate detection: languages plus both texts with
+    whitespace, Unicode form, apostrophes and case normalized. 32 hex chars.
+    """
+    key = "\x1f".join((str(source_lang_id), str(target_lang_id), _dedup_form(source_text), _dedup_form(target_text)))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
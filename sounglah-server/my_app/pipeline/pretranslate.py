@@ -0,0 +1,82 @@
+# app/pipeline/pretranslate.py
+import time
+from datetime import datetime
+from sqlalchemy import select, update
+from my_app.models import TranslationPair
+from my_app.inference import translate_batch
+
+# Tunables
+SCAN_BATCH = 256     # rows fetched per keyset page
+MODEL_BATCH = 32     # sentences per generate() call
+MAX_LENGTH = 256
+
+
+def pending_untranslated(after_id: int, limit: int):
+    """Keyset page of pending pairs that have no target and no suggestion yet."""
+    return (
+        select(TranslationPair.id, TranslationPair.source_text)
+        .where(TranslationPair.status == 'pending')
+        .where(TranslationPair.target_text.is_(None))
+        .where(TranslationPair.machine_translation.is_(None))
+        .where(TranslationPair.id > after_id)
+        .order_by(TranslationPair.id.asc())
+        .limit(limit)
+    )
+
+
+def run_pretranslate(
+    db_session,
+    tokenizer,
+    model,
+    *,
+    scan_batch: int = SCAN_BATCH,
+    model_batch: int = MODEL_BATCH,
+    max_rows: int | None = None,
+) -> dict:
+    """
+    Fill `machine_translation` for pending pairs with a NULL target.
+    - Walks candidates by id (keyset), never by OFFSET.
+    - Commits after each page, so a crashed run resumes where it stopped:
+      rows that already have a suggestion no longer match the scan.
+    Returns counts and runtime.
+    """
+    t0 = time.time()
+    last_id = 0
+    translated = 0
+    pages = 0
+
+    while max_rows is None or translated < max_rows:
+        limit = scan_batch if max_rows is None else min(scan_batch, max_rows - translated)
+        rows = db_session.execute(pending_untranslated(last_id, limit)).all()
+        if not rows:
+            break
+
+        outputs = translate_batch(
+            tokenizer,
+            model,
+            [r.source_text for r in rows],
+            batch_size=model_batch,
+            max_length=MAX_LENGTH,
+        )
+        now = datetime.utcnow()
+        db_session.execute(
+            update(TranslationPair),
+            [
+                {"id": r.id, "machine_translation": out, "machine_translated_at": now}
+                for r, out in zip(rows, outputs)
+            ],
+        )
+        db_session.commit()
+
+        last_id = rows[-1].id
+        translated += len(rows)
+        pages += 1
+
+    runtime = time.time() - t0
+    return {
+        "translated": translated,
+        "pages": pages,
+        "last_id": last_id,
+        "runtime_s": round(runtime, 2),
+        "rows_per_s": round(translated / runtime, 2) if runtime > 0 else None,
+    }
@@ -0,0 +1,74 @@
+# app/pipeline/quality_estimate.py
+import time
+from datetime import datetime
+from sqlalchemy import select, update
+from my_app.models import TranslationPair
+from my_app.inference import score_pairs
+
+# Tunables
+SCAN_BATCH = 1024    # rows fetched per keyset page
+MODEL_BATCH = 64     # pairs per forward pass
+MAX_LENGTH = 256
+
+
+def unscored(after_id: int, limit: int):
+    """Keyset page of pairs with a target but no quality score yet."""
+    return (
+        select(TranslationPair.id, TranslationPair.source_text, TranslationPair.target_text)
+        .where(TranslationPair.target_text.is_not(None))
+        .where(TranslationPair.qe_score.is_(None))
+        .where(TranslationPair.id > after_id)
+        .order_by(TranslationPair.id.asc())
+        .limit(limit)
+    )
+
+
+def run_qe_score(
+    db_session,
+    tokenizer,
+    model,
+    *,
+    scan_batch: int = SCAN_BATCH,
+    model_batch: int = MODEL_BATCH,
+    max_rows: int | None = None,
+) -> dict:
+    """
+    Store `qe_score` (length-normalized log-likelihood of target given source)
+    for every pair that has a target and no score. Same keyset/commit-per-page
+    shape as the pre-translation job, so it is resumable.
+    """
+    t0 = time.time()
+    last_id = 0
+    scored = 0
+
+    while max_rows is None or scored < max_rows:
+        limit = scan_batch if max_rows is None else min(scan_batch, max_rows - scored)
+        rows = db_session.execute(unscored(last_id, limit)).all()
+        if not rows:
+            break
+
+        scores = score_pairs(
+            tokenizer,
+            model,
+            [r.source_text for r in rows],
+            [r.target_text for r in rows],
+            batch_size=model_batch,
+            max_length=MAX_LENGTH,
+        )
+        now = datetime.utcnow()
+        db_session.execute(
+            update(TranslationPair),
+            [{"id": r.id, "qe_score": s, "qe_scored_at": now} for r, s in zip(rows, scores)],
+        )
+        db_session.commit()
+
+        last_id = rows[-1].id
+        scored += len(rows)
+
+    runtime = time.time() - t0
+    return {
+        "scored": scored,
+        "last_id": last_id,
+        "runtime_s": round(runtime, 2),
+        "rows_per_s": round(scored / runtime, 2) if runtime > 0 else None,
+    }
@@ -9,6 +9,7 @@ from .filter_bad import run_filter           # expects (rows, stats, drops)
 from .io_utils import write_jsonl, write_json, ensure_dir
 from .filter_near_dup import run_filter_near
 from .split import split_rows
+from my_app.lang_detect import ngram_model
 
 # Tunables
 LANGID_MIN_PROB = 0.55
@@ -75,6 +76,7 @@ def run_once(db_session, run_id: str, sample_size: int | None = 50) -> dict:
         min_margin=LANGID_MIN_MARGIN,
         skip_short_words=SKIP_SHORT_WORDS,
         skip_symboly=SKIP_SYMBOLY,
+        target_model=ngram_model(),
     )
 
     # --- 4) basic quality filters (length ratio, empties, exact dups)
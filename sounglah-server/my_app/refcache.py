@@ -0,0 +1,146 @@
+# app/refcache.py
+"""
+Process-local cache of the small reference tables (languages, roles).
+
+Rows are held as plain snapshots (SimpleNamespace), so they can be shared across
+requests and threads without detached-instance issues. Write handlers call
+`invalidate(...)` after committing; the TTL bounds staleness for writes made
+by other worker processes. A lookup for an id missing from the snapshot (one
+created by another worker) reloads the table, but at most once per
+MISS_RELOAD_SECONDS, so repeated lookups of a bad id stay cheap.
+"""
+import hashlib
+import time
+from threading import Lock
+from types import SimpleNamespace
+from flask import current_app
+
+TTL_SECONDS = 300
+MISS_RELOAD_SECONDS = 5
+
+LANGUAGE_FIELDS = ('id', 'name', 'iso_code', 'region', 'description')
+ROLE_FIELDS = ('id', 'name', 'description')
+
+
+class _Table:
+    def __init__(self, model_name, fields):
+        self._model_name = model_name
+        self._fields = fields
+        self._rows = None
+        self._loaded_at = 0.0
+        self.digest = None
+        self._lock = Lock()
+
+    def rows(self) -> dict:
+        rows = self._rows
+        if rows is None or time.monotonic() - self._loaded_at > TTL_SECONDS:
+            with self._lock:
+                if self._rows is None or time.monotonic() - self._loaded_at > TTL_SECONDS:
+                    from . import models
+                    model = getattr(models, self._model_name)
+                    values = [tuple(getattr(obj, f) for f in self._fields) for obj in model.query.order_by(model.id.asc())]
+                    self._rows = {v[0]: SimpleNamespace(**dict(zip(self._fields, v))) for v in values}
+                    # Content fingerprint: equal snapshots in any worker give equal ETags
+                    self.digest = hashlib.blake2b(repr(values).encode('utf-8'), digest_size=8).hexdigest()
+                    self._loaded_at = time.monotonic()
+                rows = self._rows
+        return rows
+
+    def invalidate(self):
+        self._rows = None
+
+    def reload_for_miss(self) -> dict:
+        """Rows reloaded for an id the snapshot lacks, unless it was loaded in the last MISS_RELOAD_SECONDS."""
+        with self._lock:
+            if self._rows is not None and time.monotonic() - self._loaded_at >= MISS_RELOAD_SECONDS:
+                self._rows = None
+        return self.rows()
+
+
+class RefCache:
+    def __init__(self):
+        self.tables = {
+            'languages': _Table('Language', LANGUAGE_FIELDS),
+            'roles': _Table('Role', ROLE_FIELDS),
+        }
+
+
+def _cache() -> RefCache:
+    return current_app.extensions['refcache']
+
+
+def invalidate(*tables):
+    """Drop cached rows for the named tables (all of them if none given)."""
+    cache = _cache()
+    for name in tables or cache.tables:
+        cache.tables[name].invalidate()
+
+
+def digest(name) -> str:
+    """Fingerprint of the current snapshot of a cached table (loads it if needed)."""
+    table = _cache().tables[name]
+    table.rows()
+    return table.digest
+
+
+# --- Languages
+
+def languages() -> dict:
+    """id -> language snapshot, ordered by id."""
+    return _cache().tables['languages'].rows()
+
+
+def languages_by_id(ids) -> dict:
+    """Snapshots for the given ids; reloads (rate-limited) if one was created elsewhere."""
+    ids = {i for i in ids if i is not None}
+    rows = languages()
+    if not ids <= rows.keys():
+        rows = _cache().tables['languages'].reload_for_miss()
+    return {i: rows[i] for i in ids if i in rows}
+
+
+def language(lang_id):
+    return languages_by_id([lang_id]).get(lang_id)
+
+
+def language_by_name(name):
+    """Exact, case-insensitive match on name or ISO code."""
+    if not name:
+        return None
+    needle = name.strip().lower()
+    for lang in languages().values():
+        if (lang.name or '').lower() == needle or (lang.iso_code or '').lower() == needle:
+            return lang
+    return None
+
+
+def search_language(term):
+    """Exact name/ISO match first, then the first language whose name or ISO contains the term."""
+    exact = language_by_name(term)
+    if exact or not term:
+        return exact
+    needle = term.strip().lower()
+    for lang in languages().values():
+        if needle in (lang.name or '').lower() or needle in (lang.iso_code or '').lower():
+            return lang
+    return None
+
+
+# --- Roles
+
+def roles() -> dict:
+    return _cache().tables['roles'].rows()
+
+
+def role(role_id):
+    rows = roles()
+    if role_id not in rows:
+        rows = _cache().tables['roles'].reload_for_miss()
+    return rows.get(role_id)
+
+
+def role_by_name(name):
+    for r in roles().values():
+        if r.name == name:
+            return r
+    return None
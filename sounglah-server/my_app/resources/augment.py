@@ -1,14 +1,23 @@
 from flask import Blueprint, jsonify, request, current_app
-from threading import Thread
+from threading import Thread, Lock
+import logging
 import traceback
 from uuid import uuid4
 from datetime import datetime, timezone
 from my_app import db
+from my_app.jwt_utils import token_required, admin_required
 from my_app.models import AugmentationRun
 from my_app.pipeline.run_pipeline import run_once
+from my_app.pipeline.pretranslate import run_pretranslate
+from my_app.pipeline.quality_estimate import run_qe_score
+
+logger = logging.getLogger(__name__)
 
 augment_bp = Blueprint("augment", __name__)
 
+# Only one model-backed batch job per process; they compete for the same CPU
+_model_job_lock = Lock()
+
 def _job(app, run_id, user_id):
     # IMPORTANT: push an app context in background threads
     with app.app_context():
@@ -87,3 +96,45 @@ def get_run(run_id):
         "finished_at": r.finished_at.isoformat() if r.finished_at else None,
         "error": r.error,
     })
+
+def _model_job(app, name, fn, tokenizer, model, max_rows):
+    with app.app_context():
+        try:
+            result = fn(db.session, tokenizer, model, max_rows=max_rows)
+            # Each committed batch bumps data_versions, which expires cached translation responses
+            logger.info("%s finished: %s", name, result)
+        except Exception:
+            db.session.rollback()
+            logger.error("%s failed", name, exc_info=True)
+        finally:
+            _model_job_lock.release()
+
+def _start_model_job(name, fn):
+    body = request.get_json(silent=True) or {}
+    max_rows = int(body["max_rows"]) if body.get("max_rows") else None
+
+    tokenizer = current_app.extensions.get("ml_tokenizer")
+    model = current_app.extensions.get("ml_model")
+    if not tokenizer or not model:
+        return jsonify({"error": "Translation model is not available"}), 500
+    if not _model_job_lock.acquire(blocking=False):
+        return jsonify({"error": "A model job is already running"}), 409
+
+    Thread(
+        target=_model_job,
+        args=(current_app._get_current_object(), name, fn, tokenizer, model, max_rows),
+        daemon=True,
+    ).start()
+    return jsonify({"ok": True, "job": name}), 202
+
+@augment_bp.post("/admin/pretranslate")
+@token_required
+@admin_required
+def start_pretranslate():
+    return _start_model_job("pretranslate", run_pretranslate)
+
+@augment_bp.post("/admin/qe-score")
+@token_required
+@admin_required
+def start_qe_score():
+    return _start_model_job("qe_score", run_qe_score)
@@ -3,9 +3,11 @@ from flask_restx import Api, Resource
 from ..models import User, Role
 from ..jwt_utils import generate_token, verify_password, token_required, get_current_user
 from ..parsers import login_args
+from .. import serializers
 
 auth_bp = Blueprint('auth', __name__)
 api = Api(auth_bp)
+api.representation('application/json')(serializers.output_json)
 
 @api.route('/login')
 class LoginResource(Resource):
@@ -1,7 +1,6 @@
 from flask import Blueprint, jsonify, request
 from flask_restx import Api, Resource
-from ..parsers import detect_lang_args
-import langid
+from ..lang_detect import detect_batch, MAX_BATCH
 
 detectlang_bp = Blueprint('detectlang', __name__)
 api = Api(detectlang_bp)
@@ -13,13 +12,26 @@ class DetectLangResource(Resource):
         data = request.get_json()
 
         text = data.get('text_to_detect_lang', '')
-        lang, confidence = langid.classify(text)
-
-        print(f"lang: {lang}")
-        print(f"confidence: {confidence}")
-        print(f"Text: {text} lang: {lang} Confidence {confidence:.2f})")
+        [(lang, confidence)] = detect_batch([text])
 
         return jsonify({
             'language': lang,
             'confidence': confidence
-        })
\ No newline at end of file
+        })
+
+@api.route('/batch')
+class DetectLangBatchResource(Resource):
+    def post(self):
+        data = request.get_json(silent=True) or {}
+        texts = data.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            return {'error': 'Expected "texts" as a list of strings'}, 400
+        if len(texts) > MAX_BATCH:
+            return {'error': f'At most {MAX_BATCH} texts per request'}, 400
+
+        return {
+            'results': [
+                {'language': lang, 'confidence': confidence}
+                for lang, confidence in detect_batch(texts)
+            ]
+        }
@@ -3,42 +3,38 @@ from flask_restx import Api, Resource
 from ..models import Language
 from ..jwt_utils import token_required
 from .. import db
+from .. import refcache
+from .. import http_cache
+from .. import response_cache
+from .. import serializers
 
 languages_bp = Blueprint('languages', __name__)
 api = Api(languages_bp)
+api.representation('application/json')(serializers.output_json)
 
 @api.route('/list')
 class ListLanguagesResource(Resource):
     @token_required
+    @response_cache.cached('languages')
     def get(self):
-        languages = Language.query.all()
-        return {
-            'languages': [
-                {
-                    'id': lang.id,
-                    'name': lang.name,
-                    'iso_code': lang.iso_code,
-                    'region': lang.region,
-                    'description': lang.description
-                }
-                for lang in languages
-            ]
-        }
+        not_modified, cache_headers = http_cache.check(refcache.digest('languages'))
+        if not_modified:
+            return not_modified
+        try:
+            only = serializers.fields(request.args.get('fields'), serializers.LANGUAGE)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        languages = refcache.languages().values()
+        return {'languages': serializers.many(serializers.LANGUAGE, languages, only=only)}, 200, cache_headers
 
 @api.route('/<int:language_id>')
 class LanguageResource(Resource):
     @token_required
     def get(self, language_id):
-        language = Language.query.get(language_id)
+        language = refcache.language(language_id)
         if not language:
             return {'error': 'Language not found'}, 404
-        return {
-            'id': language.id,
-            'name': language.name,
-            'iso_code': language.iso_code,
-            'region': language.region,
-            'description': language.description
-        }
+        return serializers.one(serializers.LANGUAGE, language)
 
     @token_required
     def put(self, language_id):
@@ -68,13 +64,9 @@ class LanguageResource(Resource):
             language.description = data['description']
         
         db.session.commit()
-        return {
-            'id': language.id,
-            'name': language.name,
-            'iso_code': language.iso_code,
-            'region': language.region,
-            'description': language.description
-        }
+        refcache.invalidate('languages')
+        response_cache.invalidate('languages')
+        return serializers.one(serializers.LANGUAGE, language)
 
     @token_required
     def delete(self, language_id):
@@ -92,6 +84,8 @@ class LanguageResource(Resource):
         
         db.session.delete(language)
         db.session.commit()
+        refcache.invalidate('languages')
+        response_cache.invalidate('languages')
         return {'message': 'Language deleted successfully'}
 
 @api.route('')
@@ -121,11 +115,7 @@ class CreateLanguageResource(Resource):
         
         db.session.add(language)
         db.session.commit()
+        refcache.invalidate('languages')
+        response_cache.invalidate('languages')
         
-        return {
-            'id': language.id,
-            'name': language.name,
-            'iso_code': language.iso_code,
-            'region': language.region,
-            'description': language.description
-        }, 201 
\ No newline at end of file
+        return serializers.one(serializers.LANGUAGE, language), 201 
\ No newline at end of file
@@ -1,102 +1,220 @@
-from flask import Blueprint, request, Response, stream_with_context
-from flask_restx import Api, Resource
-from ..models import TranslationPair, Language
+from flask import Blueprint, request, Response, stream_with_context, send_from_directory
+from flask_restx import Api, Resource, inputs
+from ..models import TranslationPair, content_changed
 from ..jwt_utils import token_required
 from ..parsers import get_translations_args
-from flask import request
+from flask import request, g
 from datetime import datetime
+from sqlalchemy import tuple_, func
+from sqlalchemy.orm import load_only
 from .. import db
-import csv
-from io import StringIO
+from .. import refcache
+from .. import counts
+from .. import bulk
+from .. import jobs
+from .. import imports
+from .. import near_dup
+from .. import export
+from .. import compression
+from .. import versions
+from .. import http_cache
+from .. import response_cache
+from .. import serializers
+from uuid import uuid4
+from ..pipeline.normalize import fold_for_search, content_hash
+from sqlalchemy.exc import IntegrityError
+import base64
+import os
+import json
 
 translations_bp = Blueprint('translations', __name__)
 api = Api(translations_bp)
+api.representation('application/json')(serializers.output_json)
+
+def _language_map(lang_ids):
+    """Languages referenced by a page of translations, served from the reference cache."""
+    return refcache.languages_by_id(lang_ids)
+
+def _requested_fields(value):
+    """(fields, error response) for a `fields=` sparse fieldset."""
+    try:
+        return serializers.fields(value, serializers.TRANSLATION), None
+    except ValueError as e:
+        return None, ({'error': str(e)}, 400)
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+def _find_duplicate(source_text, target_text, source_lang_id, target_lang_id, exclude_id=None):
+    """Existing pair with the same normalized content (one unique-index probe)."""
+    query = TranslationPair.query.filter(
+        TranslationPair.content_hash == content_hash(source_text, target_text, source_lang_id, target_lang_id)
+    )
+    if exclude_id is not None:
+        query = query.filter(TranslationPair.id != exclude_id)
+    return query.first()
+
+def _duplicate_response(duplicate):
+    return {
+        'error': 'Duplicate translation pair',
+        'duplicate_of': duplicate.id if duplicate else None
+    }, 409
+
+def _contains_pattern(term):
+    """LIKE pattern matching `term` anywhere, with its own % and _ taken literally (escape='\\')."""
+    return '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+def _apply_filters(query, args):
+    """Filters shared by list and export; `args` is parsed args or request.args."""
+    if args.get('source_lang'):
+        source_lang = refcache.search_language(args['source_lang'])
+        if source_lang:
+            query = query.filter(TranslationPair.source_lang_id == source_lang.id)
+    if args.get('target_lang'):
+        target_lang = refcache.search_language(args['target_lang'])
+        if target_lang:
+            query = query.filter(TranslationPair.target_lang_id == target_lang.id)
+    if args.get('status'):
+        query = query.filter(TranslationPair.status == args['status'])
+    if args.get('domain'):
+        query = query.filter(TranslationPair.domain.ilike(_contains_pattern(args['domain']), escape='\\'))
+    if str(args.get('legacy_duplicate') or '').lower() in ('1', 'true', 'yes'):
+        # Pre-existing duplicates the dedup migration left without a content hash
+        query = query.filter(TranslationPair.content_hash.is_(None))
+    if args.get('search'):
+        # Match the pre-folded column (served by its pg_trgm GIN index), so
+        # plain-ASCII terms find accented Medumba text without per-row functions
+        folded = fold_for_search(args['search'])
+        if folded:
+            query = query.filter(TranslationPair.search_folded.like(_contains_pattern(folded), escape='\\'))
+    # Date range filtering
+    start_dt = _parse_date(args.get('created_at_start'))
+    if start_dt:
+        query = query.filter(TranslationPair.created_at >= start_dt)
+    end_dt = _parse_date(args.get('created_at_end'))
+    if end_dt:
+        query = query.filter(TranslationPair.created_at <= end_dt)
+    return query
+
+# Sort orders that support keyset pagination: (sort key columns..., id tie-breaker)
+_KEYSET_COLUMNS = {
+    'id': (TranslationPair.id,),
+    'created_at': (TranslationPair.created_at, TranslationPair.id),
+}
+
+def _encode_cursor(sort, descending, translation):
+    payload = {'s': sort, 'd': descending, 'id': translation.id}
+    if sort == 'created_at':
+        payload['c'] = translation.created_at.isoformat()
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def _decode_cursor(value):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+        sort = payload['s']
+        if sort not in _KEYSET_COLUMNS:
+            return None
+        key = (datetime.fromisoformat(payload['c']), int(payload['id'])) if sort == 'created_at' else (int(payload['id']),)
+        return sort, bool(payload['d']), key
+    except (ValueError, KeyError, TypeError):
+        return None
+
+def _keyset_page(query, sort, descending, after, limit):
+    """Seek past `after` (a key tuple) in (sort key, id) order; no OFFSET scan."""
+    columns = _KEYSET_COLUMNS[sort]
+    if after is not None:
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+    # created_at is NOT NULL, so the row-value comparison never meets a NULL
+    query = query.order_by(*[c.desc() if descending else c.asc() for c in columns])
+    return query.limit(limit).all()
+
+def _relevance_order(term):
+    """Best trigram similarity to the search term first (PostgreSQL); id order elsewhere."""
+    if not term or db.engine.dialect.name != 'postgresql':
+        return (TranslationPair.id.asc(),)
+    score = func.similarity(TranslationPair.search_folded, fold_for_search(term))
+    return (score.desc(), TranslationPair.id.asc())
+
+def _translations_validators():
+    """ETag/Last-Modified for GETs whose body depends on translation_pairs and language names."""
+    version, changed_at = versions.current('translation_pairs')
+    # Language renames don't move changed_at, so the digest can only be checked through the ETag
+    return http_cache.check(version, last_modified=changed_at, undated=(refcache.digest('languages'),))
 
 @api.route('/list')
 class ListTranslationsResource(Resource):
     @token_required
+    @response_cache.cached('translations', 'languages')
     def get(self):
+        not_modified, cache_headers = _translations_validators()
+        if not_modified:
+            return not_modified
         args = get_translations_args.parse_args()
-        query = TranslationPair.query
-        if args.get('source_lang'):
-            source_lang = Language.query.filter(
-                (Language.name.ilike(f"%{args['source_lang']}%")) |
-                (Language.iso_code.ilike(f"%{args['source_lang']}%"))
-            ).first()
-            if source_lang:
-                query = query.filter(TranslationPair.source_lang_id == source_lang.id)
-        if args.get('target_lang'):
-            target_lang = Language.query.filter(
-                (Language.name.ilike(f"%{args['target_lang']}%")) |
-                (Language.iso_code.ilike(f"%{args['target_lang']}%"))
-            ).first()
-            if target_lang:
-                query = query.filter(TranslationPair.target_lang_id == target_lang.id)
-        if args.get('status'):
-            query = query.filter(TranslationPair.status == args['status'])
-        if args.get('domain'):
-            query = query.filter(TranslationPair.domain.ilike(f"%{args['domain']}%"))
-        if args.get('search'):
-            search_term = f"%{args['search']}%"
-            query = query.filter(
-                (TranslationPair.source_text.ilike(search_term)) |
-                (TranslationPair.target_text.ilike(search_term))
-            )
-        # Date range filtering
-        created_at_start = args.get('created_at_start')
-        created_at_end = args.get('created_at_end')
-        from datetime import datetime
-        if created_at_start:
-            try:
-                start_dt = datetime.fromisoformat(created_at_start)
-                query = query.filter(TranslationPair.created_at >= start_dt)
-            except Exception:
-                pass
-        if created_at_end:
-            try:
-                end_dt = datetime.fromisoformat(created_at_end)
-                query = query.filter(TranslationPair.created_at <= end_dt)
-            except Exception:
-                pass
-        total_count = query.count()
+        only, error = _requested_fields(args.get('fields'))
+        if error:
+            return error
+        query = _apply_filters(TranslationPair.query, args)
+        total_count, total_is_estimate = None, False
+        if args.get('include_total'):
+            key = counts.filter_key(args)
+            if args.get('count') == 'estimated':
+                total_count = counts.estimated_count(query, key)
+                total_is_estimate = total_count is not None
+            if total_count is None:
+                total_count = counts.exact_count(query, key)
+        if only:
+            # Fetch only the columns the requested fields read
+            query = query.options(load_only(*serializers.translation_columns(only)))
 
-        # Offset-based pagination
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 10))
-        offset = (page - 1) * limit
-        query = query.order_by(TranslationPair.id.asc())
-        translations = query.offset(offset).limit(limit).all()
-
-        result = []
-        for translation in translations:
-            source_lang = Language.query.get(translation.source_lang_id)
-            target_lang = Language.query.get(translation.target_lang_id)
-            result.append({
-                'id': translation.id,
-                'source_text': translation.source_text,
-                'target_text': translation.target_text,
-                'source_language': {
-                    'id': source_lang.id,
-                    'name': source_lang.name,
-                    'iso_code': source_lang.iso_code
-                } if source_lang else None,
-                'target_language': {
-                    'id': target_lang.id,
-                    'name': target_lang.name,
-                    'iso_code': target_lang.iso_code
-                } if target_lang else None,
-                'status': translation.status,
-                'domain': translation.domain,
-                'created_at': translation.created_at.isoformat() if translation.created_at else None,
-                'updated_at': translation.updated_at.isoformat() if translation.updated_at else None
-            })
+        sort = args.get('sort') or 'id'
+        descending = args.get('order') == 'desc'
+        after = None
+        if args.get('cursor'):
+            decoded = _decode_cursor(args['cursor'])
+            if decoded is None:
+                return {'error': 'Invalid cursor'}, 400
+            # The cursor pins the order it was issued for
+            sort, descending, after = decoded
+        elif args.get('after_id') is not None:
+            sort, after = 'id', (args['after_id'],)
 
+        next_cursor = None
+        if sort in _KEYSET_COLUMNS and (after is not None or 'page' not in request.args):
+            # Keyset (seek) pagination: constant cost per page however deep
+            translations = _keyset_page(query, sort, descending, after, limit)
+            if len(translations) == limit:
+                next_cursor = _encode_cursor(sort, descending, translations[-1])
+        else:
+            # Offset-based pagination
+            offset = (page - 1) * limit
+            if sort == 'qe_score':
+                # Lowest likelihood first; unscored pairs go to the end
+                query = query.order_by(TranslationPair.qe_score.asc().nulls_last(), TranslationPair.id.asc())
+            elif sort == 'relevance':
+                query = query.order_by(*_relevance_order(args.get('search')))
+            else:
+                query = query.order_by(*[c.desc() if descending else c.asc() for c in _KEYSET_COLUMNS[sort]])
+            translations = query.offset(offset).limit(limit).all()
+            if len(translations) == limit and sort in _KEYSET_COLUMNS:
+                next_cursor = _encode_cursor(sort, descending, translations[-1])
+
+        languages = _language_map(
+            lang_id for t in translations for lang_id in (t.source_lang_id, t.target_lang_id)
+        ) if serializers.wants_languages(only) else {}
         return {
-            'translations': result,
+            'translations': serializers.translations(translations, languages, only),
             'total': total_count,
+            'total_is_estimate': total_is_estimate,
             'limit': limit,
-            'page': page
-        }
+            'page': page,
+            'next_cursor': next_cursor
+        }, 200, cache_headers
 
     @token_required
     def post(self):
@@ -105,10 +223,15 @@ class ListTranslationsResource(Resource):
         for field in required_fields:
             if field not in data or not data[field]:
                 return {'error': f'Missing required field: {field}'}, 400
-        source_lang = Language.query.get(data['source_lang_id'])
-        target_lang = Language.query.get(data['target_lang_id'])
+        source_lang = refcache.language(data['source_lang_id'])
+        target_lang = refcache.language(data['target_lang_id'])
         if not source_lang or not target_lang:
             return {'error': 'Invalid source or target language ID'}, 400
+        duplicate = _find_duplicate(data['source_text'], data['target_text'],
+                                    data['source_lang_id'], data['target_lang_id'])
+        if duplicate:
+            return _duplicate_response(duplicate)
+        similar = near_dup.similar_batch(db.session, [(data['source_text'], data['source_lang_id'])])[0]
         pair = TranslationPair(
             source_text=data['source_text'],
             target_text=data['target_text'],
@@ -117,49 +240,34 @@ class ListTranslationsResource(Resource):
             status='pending',
             domain=data.get('domain')
         )
-        from .. import db
         db.session.add(pair)
-        db.session.commit()
-        return {
-            'id': pair.id,
-            'source_text': pair.source_text,
-            'target_text': pair.target_text,
-            'source_lang_id': pair.source_lang_id,
-            'target_lang_id': pair.target_lang_id,
-            'status': pair.status,
-            'domain': pair.domain,
-            'created_at': pair.created_at.isoformat() if pair.created_at else None,
-            'updated_at': pair.updated_at.isoformat() if pair.updated_at else None
-        }, 201
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Lost a race with an identical insert
+            db.session.rollback()
+            return _duplicate_response(_find_duplicate(pair.source_text, pair.target_text,
+                                                       pair.source_lang_id, pair.target_lang_id))
+        counts.invalidate()
+        response_cache.invalidate('translations')
+        return dict(serializers.one(serializers.CREATED_TRANSLATION, pair), similar=similar), 201
 
 @api.route('/<int:id>')
 class GetTranslationByIdResource(Resource):
     @token_required
+    @response_cache.cached('translations', 'languages')
     def get(self, id):
+        not_modified, cache_headers = _translations_validators()
+        if not_modified:
+            return not_modified
+        only, error = _requested_fields(request.args.get('fields'))
+        if error:
+            return error
         translation = TranslationPair.query.get(id)
         if not translation:
             return {'error': 'Translation not found'}, 404
-        source_lang = Language.query.get(translation.source_lang_id)
-        target_lang = Language.query.get(translation.target_lang_id)
-        return {
-            'id': translation.id,
-            'source_text': translation.source_text,
-            'target_text': translation.target_text,
-            'source_language': {
-                'id': source_lang.id,
-                'name': source_lang.name,
-                'iso_code': source_lang.iso_code
-            } if source_lang else None,
-            'target_language': {
-                'id': target_lang.id,
-                'name': target_lang.name,
-                'iso_code': target_lang.iso_code
-            } if target_lang else None,
-            'status': translation.status,
-            'domain': translation.domain,
-            'created_at': translation.created_at.isoformat() if translation.created_at else None,
-            'updated_at': translation.updated_at.isoformat() if translation.updated_at else None
-        }
+        languages = _language_map([translation.source_lang_id, translation.target_lang_id])
+        return serializers.translation(translation, languages, only), 200, cache_headers
 
     @token_required
     def put(self, id):
@@ -167,10 +275,21 @@ class GetTranslationByIdResource(Resource):
         if not translation:
             return {'error': 'Translation not found'}, 404
         data = request.get_json()
+        source_changed = False
         # Update fields if present in request
         if 'source_text' in data:
+            if data['source_text'] != translation.source_text:
+                # Suggestion was generated for the old source; let the job redo it
+                translation.machine_translation = None
+                translation.machine_translated_at = None
+                translation.qe_score = None
+                translation.qe_scored_at = None
+            source_changed = data['source_text'] != translation.source_text
             translation.source_text = data['source_text']
         if 'target_text' in data:
+            if data['target_text'] != translation.target_text:
+                translation.qe_score = None
+                translation.qe_scored_at = None
             translation.target_text = data['target_text']
         if 'source_lang_id' in data:
             translation.source_lang_id = data['source_lang_id']
@@ -186,29 +305,39 @@ class GetTranslationByIdResource(Resource):
                 translation.approved_at = None
         if 'domain' in data:
             translation.domain = data['domain']
+        duplicate = None
+        if content_changed(translation):
+            with db.session.no_autoflush:
+                duplicate = _find_duplicate(translation.source_text, translation.target_text,
+                                            translation.source_lang_id, translation.target_lang_id, exclude_id=id)
+        if duplicate:
+            db.session.rollback()
+            return _duplicate_response(duplicate)
         translation.updated_at = datetime.utcnow()
-        db.session.commit()
-        source_lang = Language.query.get(translation.source_lang_id)
-        target_lang = Language.query.get(translation.target_lang_id)
-        return {
-            'id': translation.id,
-            'source_text': translation.source_text,
-            'target_text': translation.target_text,
-            'source_language': {
-                'id': source_lang.id,
-                'name': source_lang.name,
-                'iso_code': source_lang.iso_code
-            } if source_lang else None,
-            'target_language': {
-                'id': target_lang.id,
-                'name': target_lang.name,
-                'iso_code': target_lang.iso_code
-            } if target_lang else None,
-            'status': translation.status,
-            'domain': translation.domain,
-            'created_at': translation.created_at.isoformat() if translation.created_at else None,
-            'updated_at': translation.updated_at.isoformat() if translation.updated_at else None
-        }
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return {'error': 'Duplicate translation pair'}, 409
+        counts.invalidate()
+        response_cache.invalidate('translations')
+        if source_changed:
+            near_dup.reindex(translation.id, translation.source_text)
+        languages = _language_map([translation.source_lang_id, translation.target_lang_id])
+        return serializers.translation(translation, languages)
+
+# Near-duplicate suggestions are skipped for larger uploads to keep the request short
+SIMILAR_MAX_ROWS = 1000
+
+def _attach_similar(values, results):
+    """Add `similar` (existing near-duplicate pairs) to upload rows that have any."""
+    if not values or len(values) > SIMILAR_MAX_ROWS:
+        return
+    similar = near_dup.similar_batch(db.session, [(v['source_text'], v['source_lang_id']) for v in values])
+    added = (r for r in results if r['status'] == 'added')
+    for result, matches in zip(added, similar):
+        if matches:
+            result['similar'] = matches
 
 @api.route('/upload_csv', methods=['POST'])
 class UploadCSVTranslationsResource(Resource):
@@ -217,45 +346,19 @@ class UploadCSVTranslationsResource(Resource):
         data = request.get_json()
         if not isinstance(data, list):
             return {'error': 'Expected a list of translation pairs.'}, 400
-        results = []
-        added = 0
-        for idx, row in enumerate(data):
-            src_lang_name = row.get('source_language')
-            tgt_lang_name = row.get('target_language')
-            source_lang = Language.query.filter(Language.name.ilike(src_lang_name)).first()
-            target_lang = Language.query.filter(Language.name.ilike(tgt_lang_name)).first()
-            if not source_lang or not target_lang:
-                results.append({
-                    'row': idx + 1,
-                    'source_text': row.get('source_text', ''),
-                    'target_text': row.get('target_text', ''),
-                    'source_language': src_lang_name,
-                    'target_language': tgt_lang_name,
-                    'status': 'error',
-                    'error': 'Source or target language not found.'
-                })
-                continue
-            pair = TranslationPair(
-                source_text=row.get('source_text', ''),
-                target_text=row.get('target_text', ''),
-                source_lang_id=source_lang.id,
-                target_lang_id=target_lang.id,
-                status='pending',
-                domain=row.get('domain')
-            )
-            db.session.add(pair)
-            added += 1
-            results.append({
-                'row': idx + 1,
-                'source_text': pair.source_text,
-                'target_text': pair.target_text,
-                'source_language': src_lang_name,
-                'target_language': tgt_lang_name,
-                'status': 'added'
-            })
-        db.session.commit()
+        values, results = bulk.prepare_pairs(data)
+        _attach_similar(values, results)
+        try:
+            added, duplicates = bulk.insert_and_report(db.session, values, results)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            return {'error': 'Database error during upload.'}, 500
+        counts.invalidate()
+        response_cache.invalidate('translations')
         return {
             'added': added,
+            'duplicates': duplicates,
             'total': len(data),
             'results': results
         }
@@ -269,120 +372,225 @@ class BulkUpdateTranslationsResource(Resource):
         status = data.get('status')
         if not isinstance(ids, list) or not status:
             return {'error': 'Missing ids or status'}, 400
-        success = []
-        failed = []
-        for id in ids:
-            translation = TranslationPair.query.get(id)
-            if not translation:
-                failed.append(id)
-                continue
-            previous_status = translation.status
-            translation.status = status
-            if status == 'approved' and previous_status != 'approved':
-                translation.approved_at = datetime.utcnow()
-            elif previous_status == 'approved' and status != 'approved':
-                translation.approved_at = None
-            translation.updated_at = datetime.utcnow()
-            try:
-                db.session.add(translation)
-                success.append(id)
-            except Exception:
-                failed.append(id)
+        if status not in bulk.STATUSES:
+            return {'error': f'Invalid status: {status}'}, 400
+        valid_ids = [i for i in ids if isinstance(i, int) and not isinstance(i, bool)]
+        invalid_ids = [i for i in ids if i not in valid_ids]
         try:
+            success, failed = bulk.update_status(db.session, valid_ids, status)
             db.session.commit()
         except Exception:
             db.session.rollback()
             return {'error': 'Database error during bulk update.'}, 500
+        counts.invalidate()
+        response_cache.invalidate('translations')
         return {
             'success': success,
-            'failed': failed,
+            'failed': failed + invalid_ids,
             'updated_status': status
         }
 
+# Filters accepted by bulk_update_by_filter (same meaning as the list endpoint)
+_BULK_FILTER_KEYS = ('source_lang', 'target_lang', 'status', 'domain', 'search', 'created_at_start', 'created_at_end',
+                     'legacy_duplicate')
+
+def _parse_filters(raw):
+    """
+    Validate a JSON `filters` object for the job endpoints: (filters, None) or
+    (None, error response). The list endpoint quietly drops a filter it can't
+    use; a bulk job must not, since that would widen what it touches.
+    """
+    if not isinstance(raw, dict):
+        return None, ({'error': 'filters must be an object'}, 400)
+    filters = {}
+    for key, value in raw.items():
+        if key not in _BULK_FILTER_KEYS or value in (None, '', False):
+            continue
+        if key == 'legacy_duplicate':
+            try:
+                value = inputs.boolean(value)
+            except ValueError:
+                return None, ({'error': 'legacy_duplicate must be a boolean'}, 400)
+            if not value:
+                continue
+        elif not isinstance(value, str):
+            return None, ({'error': f'{key} must be a string'}, 400)
+        elif key == 'status' and value not in bulk.STATUSES:
+            return None, ({'error': f'Invalid status filter: {value}'}, 400)
+        elif key in ('created_at_start', 'created_at_end') and _parse_date(value) is None:
+            return None, ({'error': f'{key} must be an ISO 8601 date'}, 400)
+        elif key in ('source_lang', 'target_lang') and refcache.search_language(value) is None:
+            return None, ({'error': f'Unknown language: {value}'}, 400)
+        filters[key] = value
+    return filters, None
+
+def _bulk_update_job(db_session, progress, ids_stmt, status, domain):
+    result = bulk.update_by_filter(db_session, ids_stmt, status=status, domain=domain, progress=progress)
+    counts.invalidate()
+    response_cache.invalidate('translations')
+    return result
+
+@api.route('/bulk_update_by_filter', methods=['POST'])
+class BulkUpdateByFilterResource(Resource):
+    @token_required
+    def post(self):
+        """
+        Change status and/or domain for every translation matching the list
+        filters. Runs as a background job; poll /jobs/<id> for progress.
+        """
+        data = request.get_json(silent=True) or {}
+        filters, error = _parse_filters(data.get('filters') or {})
+        if error:
+            return error
+        status = data.get('status')
+        domain = data.get('domain')
+        if not filters:
+            return {'error': 'At least one filter is required'}, 400
+        if status is None and domain is None:
+            return {'error': 'Missing status or domain'}, 400
+        if status is not None and status not in bulk.STATUSES:
+            return {'error': f'Invalid status: {status}'}, 400
+
+        ids_stmt = _apply_filters(TranslationPair.query, filters).with_entities(TranslationPair.id).statement
+        job = jobs.start('bulk_update', _bulk_update_job, user_id=g.current_user.id,
+                         ids_stmt=ids_stmt, status=status, domain=domain)
+        return {'job_id': job.id, 'status': job.status}, 202
+
+@api.route('/jobs/<string:job_id>', methods=['GET'])
+class TranslationJobResource(Resource):
+    @token_required
+    def get(self, job_id):
+        job = jobs.get(job_id)
+        if job:
+            return job.to_dict()
+        # Imports outlive the process: report the last checkpoint after a restart
+        state = imports.valid_id(job_id) and imports.load_state(job_id)
+        if not state:
+            return {'error': 'Job not found'}, 404
+        status = 'interrupted' if state['status'] in ('queued', 'running') else state['status']
+        return {
+            'id': job_id,
+            'kind': 'import',
+            'status': status,
+            'processed': state['rows_done'],
+            'stats': {'added': state['added'], 'duplicates': state['duplicates'], 'error_count': state['error_count']},
+        }
+
+def _import_job_response(job):
+    return {'job_id': job.id, 'status': job.status}, 202
+
+@api.route('/import', methods=['POST'])
+class ImportTranslationsResource(Resource):
+    @token_required
+    def post(self):
+        """
+        Import a CSV, TSV or JSONL file (multipart field `file`) with the same
+        columns as upload_csv. The file is spooled to disk and imported by a
+        background job; poll /jobs/<job_id>, fetch /import/<job_id> for errors.
+        """
+        upload = request.files.get('file')
+        if not upload:
+            return {'error': 'Missing file'}, 400
+        fmt = request.form.get('format') or imports.guess_format(upload.filename)
+        if fmt not in imports.FORMATS:
+            return {'error': f"Unsupported format; use one of: {', '.join(imports.FORMATS)}"}, 400
+        import_id = uuid4().hex
+        imports.spool(upload, import_id, fmt)
+        job = jobs.start('import', imports.run_import, user_id=g.current_user.id,
+                         job_id=import_id, import_id=import_id)
+        return _import_job_response(job)
+
+@api.route('/import/<string:import_id>', methods=['GET'])
+class ImportReportResource(Resource):
+    @token_required
+    def get(self, import_id):
+        state = imports.valid_id(import_id) and imports.load_state(import_id)
+        if not state:
+            return {'error': 'Import not found'}, 404
+        return state
+
+@api.route('/import/<string:import_id>/resume', methods=['POST'])
+class ResumeImportResource(Resource):
+    @token_required
+    def post(self, import_id):
+        state = imports.valid_id(import_id) and imports.load_state(import_id)
+        if not state:
+            return {'error': 'Import not found'}, 404
+        if state['status'] == 'succeeded':
+            return {'error': 'Import already finished'}, 409
+        if jobs.is_active(import_id):
+            return {'error': 'Import is already running'}, 409
+        job = jobs.start('import', imports.run_import, user_id=g.current_user.id,
+                         job_id=import_id, import_id=import_id)
+        return _import_job_response(job)
+
 @api.route('/export', methods=['GET'])
 class ExportTranslationsResource(Resource):
     @token_required
     def get(self):
-        # Parse filters
+        query = _apply_filters(TranslationPair.query, request.args)
         ids = request.args.get('ids')
-        status = request.args.get('status')
-        source_lang = request.args.get('source_lang')
-        target_lang = request.args.get('target_lang')
-        domain = request.args.get('domain')
-        created_at_start = request.args.get('created_at_start')
-        created_at_end = request.args.get('created_at_end')
-
-        query = TranslationPair.query
         if ids:
             id_list = [int(i) for i in ids.split(',') if i.strip().isdigit()]
             query = query.filter(TranslationPair.id.in_(id_list))
-        if status:
-            query = query.filter(TranslationPair.status == status)
-        if source_lang:
-            lang = Language.query.filter(
-                (Language.name.ilike(f"%{source_lang}%")) |
-                (Language.iso_code.ilike(f"%{source_lang}%"))
-            ).first()
-            if lang:
-                query = query.filter(TranslationPair.source_lang_id == lang.id)
-        if target_lang:
-            lang = Language.query.filter(
-                (Language.name.ilike(f"%{target_lang}%")) |
-                (Language.iso_code.ilike(f"%{target_lang}%"))
-            ).first()
-            if lang:
-                query = query.filter(TranslationPair.target_lang_id == lang.id)
-        if domain:
-            query = query.filter(TranslationPair.domain.ilike(f"%{domain}%"))
-        # Date range filtering
-        if created_at_start:
-            try:
-                start_dt = datetime.fromisoformat(created_at_start)
-                query = query.filter(TranslationPair.created_at >= start_dt)
-            except Exception:
-                pass
-        if created_at_end:
-            try:
-                end_dt = datetime.fromisoformat(created_at_end)
-                query = query.filter(TranslationPair.created_at <= end_dt)
-            except Exception:
-                pass
-        query = query.order_by(TranslationPair.id.asc())
-
-        @stream_with_context
-        def generate():
-            output = StringIO()
-            writer = csv.writer(output)
-            # Write header
-            writer.writerow([
-                'id', 'source_text', 'target_text', 'source_language', 'target_language',
-                'status', 'domain', 'created_at', 'updated_at', 'reviewer_id'
-            ])
-            yield output.getvalue()
-            output.seek(0)
-            output.truncate(0)
-            # Stream rows
-            for row in query.yield_per(1000):
-                source_lang = Language.query.get(row.source_lang_id)
-                target_lang = Language.query.get(row.target_lang_id)
-                writer.writerow([
-                    row.id,
-                    row.source_text,
-                    row.target_text,
-                    source_lang.name if source_lang else '',
-                    target_lang.name if target_lang else '',
-                    row.status,
-                    row.domain,
-                    row.created_at.isoformat() if row.created_at else '',
-                    row.updated_at.isoformat() if row.updated_at else '',
-                    row.reviewer_id or ''
-                ])
-                yield output.getvalue()
-                output.seek(0)
-                output.truncate(0)
+        fmt = request.args.get('format', 'csv')
+        if fmt not in export.FORMATS:
+            return {'error': f"Unsupported format; use one of: {', '.join(export.FORMATS)}"}, 400
+        if fmt == 'parquet' and not export.parquet_available():
+            return {'error': 'Parquet export requires pyarrow'}, 501
+        content_type, extension = export.FORMATS[fmt]
+        # CSV goes through COPY ... TO STDOUT on PostgreSQL
+        chunks = export.export_chunks(db.session, query, fmt)
 
         headers = {
-            'Content-Disposition': 'attachment; filename=translations_export.csv',
-            'Content-Type': 'text/csv; charset=utf-8'
+            'Content-Disposition': f'attachment; filename=translations_export.{extension}',
+            'Content-Type': content_type
         }
-        return Response(generate(), headers=headers)
\ No newline at end of file
+        # Streamed bodies skip the after_request compressor, so encode text formats on the fly
+        if content_type.split(';')[0] in compression.COMPRESSIBLE and compression.negotiate(['gzip']):
+            chunks = export.gzip_chunks(chunks)
+            headers['Content-Encoding'] = 'gzip'
+        return Response(stream_with_context(chunks), headers=headers)
+
+@api.route('/export/partitioned', methods=['POST'])
+class PartitionedExportResource(Resource):
+    @token_required
+    def post(self):
+        """
+        Export the filtered set as `parts` files written concurrently (one DB
+        connection each) plus a manifest. Runs as a job; when it succeeds the
+        files are served from /exports/<job_id>/<file>.
+        """
+        data = request.get_json(silent=True) or {}
+        filters, error = _parse_filters(data.get('filters') or {})
+        if error:
+            return error
+        fmt = data.get('format', 'csv')
+        if fmt not in export.FORMATS:
+            return {'error': f"Unsupported format; use one of: {', '.join(export.FORMATS)}"}, 400
+        if fmt == 'parquet' and not export.parquet_available():
+            return {'error': 'Parquet export requires pyarrow'}, 501
+        workers = data.get('workers', export.MAX_WORKERS // 2)
+        parts = data.get('parts', workers)
+        if not all(isinstance(v, int) and v >= 1 for v in (workers, parts)) or parts > export.MAX_PARTS:
+            return {'error': f'parts must be an integer between 1 and {export.MAX_PARTS}, workers a positive integer'}, 400
+
+        export.remove_expired()
+        stmt = export.export_statement(_apply_filters(TranslationPair.query, filters), fmt)
+        export_id = uuid4().hex
+        job = jobs.start('export', export.run_partitioned_export, user_id=g.current_user.id, job_id=export_id,
+                         stmt=stmt, fmt=fmt, parts=parts, workers=workers, export_id=export_id, filters=filters)
+        return {'job_id': job.id, 'status': job.status}, 202
+
+@api.route('/exports/<string:export_id>/<string:filename>', methods=['GET'])
+class ExportFileResource(Resource):
+    @token_required
+    def get(self, export_id, filename):
+        if not jobs.valid_id(export_id):
+            return {'error': 'Export not found'}, 404
+        # Parts are partial until the job writes the manifest
+        if jobs.is_active(export_id):
+            return {'error': 'Export is still running'}, 409
+        if not export.is_finished(export_id):
+            return {'error': 'Export not found'}, 404
+        return send_from_directory(os.path.join(export.EXPORT_DIR, export_id), filename, as_attachment=True)
@@ -2,35 +2,34 @@ from flask import Blueprint, request
 from flask_restx import Api, Resource
 from ..models import User, Role
 from .. import db
+from .. import refcache
+from .. import http_cache
+from .. import response_cache
+from .. import serializers
 from ..jwt_utils import token_required
 import bcrypt
 
 users_bp = Blueprint('users', __name__)
 api = Api(users_bp)
+api.representation('application/json')(serializers.output_json)
 
 @api.route('/list')
 class ListUsersResource(Resource):
     @token_required
+    @response_cache.cached('users', 'roles')
     def get(self):
+        try:
+            only = serializers.fields(request.args.get('fields'), serializers.USER)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         role = request.args.get('role')
         query = User.query
         if role:
-            role_obj = Role.query.filter_by(name=role).first()
+            role_obj = refcache.role_by_name(role)
             if role_obj:
                 query = query.filter_by(role_id=role_obj.id)
         users = query.all()
-        return {
-            'users': [
-                {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email,
-                    'role': user.role.name if user.role else None,
-                    'created_at': user.created_at.isoformat() if user.created_at else None
-                }
-                for user in users
-            ]
-        }
+        return {'users': serializers.many(serializers.USER, users, only=only)}
 
 @api.route('/')
 @api.route('')  # Handle both /api/users and /api/users/
@@ -53,18 +52,18 @@ class CreateUserResource(Resource):
         role_obj = None
         if 'role_id' in data and data['role_id']:
             # Frontend sends role_id as number
-            role_obj = Role.query.get(data['role_id'])
+            role_obj = refcache.role(data['role_id'])
             if not role_obj:
                 return {'error': f'Role with ID {data["role_id"]} does not exist'}, 400
         elif 'role' in data and data['role']:
             # Backend expects role as string
             role_name = data['role']
-            role_obj = Role.query.filter_by(name=role_name).first()
+            role_obj = refcache.role_by_name(role_name)
             if not role_obj:
                 return {'error': f'Role {role_name} does not exist'}, 400
         else:
             # Default to 'editor' role if no role specified
-            role_obj = Role.query.filter_by(name='editor').first()
+            role_obj = refcache.role_by_name('editor')
             if not role_obj:
                 return {'error': 'Default editor role does not exist'}, 400
         
@@ -88,14 +87,9 @@ class CreateUserResource(Resource):
             )
             db.session.add(user)
             db.session.commit()
+            response_cache.invalidate('users')
             
-            return {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': user.role.name if user.role else None,
-                'created_at': user.created_at.isoformat() if user.created_at else None
-            }, 201
+            return serializers.one(serializers.USER, user), 201
             
         except Exception as e:
             db.session.rollback()
@@ -143,20 +137,15 @@ class UpdateDeleteUserResource(Resource):
             # Update role if provided
             if 'role_id' in data:
                 role_id = data['role_id']
-                role_obj = Role.query.get(role_id)
+                role_obj = refcache.role(role_id)
                 if not role_obj:
                     return {'error': 'Role not found'}, 400
                 user.role_id = role_id
             
             db.session.commit()
+            response_cache.invalidate('users')
             
-            return {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': user.role.name if user.role else None,
-                'created_at': user.created_at.isoformat() if user.created_at else None
-            }
+            return serializers.one(serializers.USER, user)
             
         except Exception as e:
             db.session.rollback()
@@ -180,6 +169,7 @@ class UpdateDeleteUserResource(Resource):
             
             db.session.delete(user)
             db.session.commit()
+            response_cache.invalidate('users')
             
             return {
                 'message': 'User deleted successfully',
@@ -195,22 +185,18 @@ class UpdateDeleteUserResource(Resource):
 
 roles_bp = Blueprint('roles', __name__)
 roles_api = Api(roles_bp)
+roles_api.representation('application/json')(serializers.output_json)
 
 @roles_api.route('/list')
 class ListRolesResource(Resource):
     @token_required
+    @response_cache.cached('roles')
     def get(self):
-        roles = Role.query.all()
-        return {
-            'roles': [
-                {
-                    'id': role.id,
-                    'name': role.name,
-                    'description': role.description
-                }
-                for role in roles
-            ]
-        }
+        not_modified, cache_headers = http_cache.check(refcache.digest('roles'))
+        if not_modified:
+            return not_modified
+        roles = refcache.roles().values()
+        return {'roles': serializers.many(serializers.ROLE, roles)}, 200, cache_headers
 
 @roles_api.route('/')
 @roles_api.route('')  # Handle both /api/roles and /api/roles/
@@ -227,11 +213,9 @@ class CreateRoleResource(Resource):
         role = Role(name=name, description=description)
         db.session.add(role)
         db.session.commit()
-        return {
-            'id': role.id,
-            'name': role.name,
-            'description': role.description
-        }, 201
+        refcache.invalidate('roles')
+        response_cache.invalidate('roles')
+        return serializers.one(serializers.ROLE, role), 201
 
 @roles_api.route('/<int:role_id>')
 class UpdateDeleteRoleResource(Resource):
@@ -248,11 +232,9 @@ class UpdateDeleteRoleResource(Resource):
         if 'description' in data:
             role.description = data['description']
         db.session.commit()
-        return {
-            'id': role.id,
-            'name': role.name,
-            'description': role.description
-        }
+        refcache.invalidate('roles')
+        response_cache.invalidate('roles')
+        return serializers.one(serializers.ROLE, role)
 
     @token_required
     def delete(self, role_id):
@@ -261,4 +243,6 @@ class UpdateDeleteRoleResource(Resource):
             return {'error': 'Role not found'}, 404
         db.session.delete(role)
         db.session.commit()
+        refcache.invalidate('roles')
+        response_cache.invalidate('roles')
         return {'message': 'Role deleted'}
\ No newline at end of file
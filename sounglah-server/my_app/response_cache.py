@@ -0,0 +1,223 @@
+# app/response_cache.py
+"""
+Response cache for hot GET resources.
+
+Entries are keyed by endpoint, view arguments, the normalized query string,
+the caller's role and the current version of every tag the resource depends
+on ('translations', 'languages', 'users', 'roles'). Write handlers call
+`invalidate(tag)`, which bumps that tag's version: every key built with the
+old version simply stops being looked up and ages out, so invalidation is one
+counter increment on any backend.
+
+Tags backed by a table tracked in data_versions (TABLE_TAGS) also key on that
+table's counter, which every committed ORM write bumps (versions.py). Bulk
+paths, background jobs and other workers therefore invalidate those entries
+as soon as each batch commits, without calling `invalidate`.
+
+Backends:
+  * LocalBackend (default): in-process LRU (cache.TTLCache) plus tag counters;
+    writes made through another worker show up after at most TTL_SECONDS.
+  * SharedBackend: anything speaking the small Redis subset used here
+    (get, set with ex, mget, incr). RESPONSE_CACHE_URL=redis://... uses
+    redis-py when installed; RESPONSE_CACHE_URL=memory:// uses InMemoryRedis,
+    a local stand-in with the same semantics (JSON round-trip, TTLs).
+"""
+import json
+import logging
+import os
+import time
+from functools import wraps
+from threading import Lock
+
+from flask import Response, current_app, g, request
+from werkzeug.http import unquote_etag
+
+from .cache import TTLCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL", "30"))
+MAX_ENTRIES = 2048
+KEY_PREFIX = "rc:"
+# Cache tag -> data_versions name of the table behind it
+TABLE_TAGS = {'translations': 'translation_pairs'}
+
+
+class LocalBackend:
+    def __init__(self, maxsize=MAX_ENTRIES, ttl=TTL_SECONDS):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._tags = {}
+        self._lock = Lock()
+
+    def get(self, key):
+        value = self._entries.get(key)
+        return None if value is MISSING else value
+
+    def set(self, key, value):
+        self._entries.set(key, value)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return [self._tags.get(t, 0) for t in tags]
+
+    def bump(self, tag):
+        with self._lock:
+            self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+
+
+class SharedBackend:
+    """Cache in a Redis-like store shared by all workers; values travel as JSON."""
+
+    def __init__(self, client, ttl=TTL_SECONDS):
+        self._client = client
+        self._ttl = ttl
+
+    def get(self, key):
+        raw = self._client.get(KEY_PREFIX + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self._client.set(KEY_PREFIX + key, json.dumps(value, separators=(',', ':')), ex=self._ttl)
+
+    def tag_versions(self, tags):
+        return [int(v or 0) for v in self._client.mget([f"{KEY_PREFIX}tag:{t}" for t in tags])]
+
+    def bump(self, tag):
+        self._client.incr(f"{KEY_PREFIX}tag:{tag}")
+
+
+class InMemoryRedis:
+    """In-process stand-in for the Redis commands SharedBackend uses."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = Lock()
+
+    def _live(self, key):
+        item = self._data.get(key)
+        if item and item[1] is not None and item[1] < time.monotonic():
+            del self._data[key]
+            return None
+        return item
+
+    def get(self, key):
+        with self._lock:
+            item = self._live(key)
+            return item[0] if item else None
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value.encode('utf-8') if isinstance(value, str) else value,
+                               time.monotonic() + ex if ex else None)
+
+    def mget(self, keys):
+        return [self.get(k) for k in keys]
+
+    def incr(self, key):
+        with self._lock:
+            item = self._live(key)
+            value = int(item[0]) + 1 if item else 1
+            self._data[key] = (str(value).encode(), item[1] if item else None)
+            return value
+
+
+def make_backend(url=None):
+    url = url if url is not None else os.environ.get("RESPONSE_CACHE_URL", "")
+    if not url:
+        return LocalBackend()
+    if url == "memory://":
+        return SharedBackend(InMemoryRedis())
+    try:
+        import redis
+    except ImportError:
+        logger.warning("RESPONSE_CACHE_URL is set but redis is not installed; using the in-process cache")
+        return LocalBackend()
+    return SharedBackend(redis.Redis.from_url(url))
+
+
+def _backend():
+    return current_app.extensions.get('response_cache')
+
+
+def invalidate(*tags):
+    """Drop every cached response that depends on any of `tags`."""
+    backend = _backend()
+    if backend is None:
+        return
+    for tag in tags:
+        try:
+            backend.bump(tag)
+        except Exception:
+            logger.warning("response cache invalidation failed for %s", tag, exc_info=True)
+
+
+def _role():
+    from . import refcache
+
+    user = getattr(g, 'current_user', None)
+    return getattr(refcache.role(user.role_id), 'name', None) if user else None
+
+
+def _versions(backend, tags):
+    """Each tag's counter, paired with its table's data_versions counter where it has one."""
+    from . import versions
+
+    return [[version, versions.current(TABLE_TAGS[tag])[0]] if tag in TABLE_TAGS else version
+            for tag, version in zip(tags, backend.tag_versions(tags))]
+
+
+def _key(tags, versions):
+    args = sorted(request.args.items(multi=True))
+    view_args = sorted((request.view_args or {}).items())
+    return json.dumps([request.endpoint, view_args, args, _role(), list(zip(tags, versions))],
+                      separators=(',', ':'), default=str)
+
+
+def _split(result):
+    """(body, status, headers) from whatever a Resource method returned."""
+    if not isinstance(result, tuple):
+        return result, 200, {}
+    body, status, headers = result + (200, {})[len(result) - 1:]
+    return body, status, dict(headers or {})
+
+
+def cached(*tags):
+    """
+    Cache a Resource GET's 200 responses under `tags`. Apply inside
+    @token_required so the caller's role is known and auth still runs.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            backend = _backend()
+            if backend is None:
+                return fn(*args, **kwargs)
+            try:
+                key = _key(tags, _versions(backend, tags))
+                hit = backend.get(key)
+            except Exception:
+                logger.warning("response cache lookup failed", exc_info=True)
+                return fn(*args, **kwargs)
+
+            if hit is not None:
+                body, headers = hit
+                etag = headers.get('ETag')
+                if etag and request.if_none_match and request.if_none_match.contains_weak(unquote_etag(etag)[0]):
+                    return Response(status=304, headers=headers)
+                return body, 200, headers
+
+            result = fn(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            body, status, headers = _split(result)
+            if status == 200:
+                try:
+                    backend.set(key, [body, headers])
+                except Exception:
+                    logger.warning("response cache store failed", exc_info=True)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,106 @@
+# app/spa.py
+"""
+Serving the built React app (frontend_build).
+
+`AssetManifest` walks the build directory once at startup and records every
+file with the precompressed siblings it has (see compression.precompress_dir),
+so a request never probes the filesystem to decide what it is. index.html is
+read into memory together with its encoded variants.
+
+One catch-all route (`serve`) handles everything that is not an API route:
+  * a known file is sent as-is or as its best accepted .br/.gz sibling;
+    Vite's content-hashed assets (assets/name-<hash>.ext) are immutable and
+    cached for a year, other files for an hour;
+  * unknown paths under api/ or assets/ are 404s (an unknown API route, or an
+    asset from an older build that must not come back as HTML);
+  * anything else is a client-side route and gets index.html, which browsers
+    revalidate on every load (ETag, so usually a 304) to pick up new builds.
+
+The manifest is built when the app starts; restart to pick up a rebuilt frontend.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+
+from flask import Response, abort, current_app, request, send_from_directory
+
+from . import compression
+
+INDEX = 'index.html'
+HASHED_ASSET = re.compile(r'^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+ASSET_CACHE_CONTROL = 'public, max-age=3600'
+INDEX_CACHE_CONTROL = 'no-cache'
+NOT_SPA_PREFIXES = ('api/', 'assets/')
+
+
+class AssetManifest:
+    def __init__(self, directory):
+        self.directory = directory
+        # relative path -> encodings with a precompressed sibling, in server preference order
+        self.files: dict[str, tuple[str, ...]] = {}
+        # encoding (None for identity) -> index.html body
+        self.index: dict[str | None, bytes] = {}
+        self.index_etag = None
+        if directory and os.path.isdir(directory):
+            self._scan()
+
+    def _scan(self):
+        found = set()
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                found.add(os.path.relpath(os.path.join(root, name), self.directory).replace(os.sep, '/'))
+        suffixes = tuple(compression.SUFFIXES.values())
+        for path in found:
+            if path.endswith(suffixes) and path.rsplit('.', 1)[0] in found:
+                continue
+            self.files[path] = tuple(e for e, s in compression.SUFFIXES.items() if path + s in found)
+
+        if INDEX in self.files:
+            with open(os.path.join(self.directory, INDEX), 'rb') as f:
+                body = f.read()
+            self.index[None] = body
+            if len(body) >= compression.MIN_SIZE:
+                for encoding in compression.encodings():
+                    self.index[encoding] = compression.compress(body, encoding, max_level=True)
+            self.index_etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+
+    def asset_response(self, path):
+        mimetype = mimetypes.guess_type(path)[0]
+        encodings = self.files[path]
+        encoding = compression.negotiate(encodings) if encodings else None
+        if encoding is None:
+            response = send_from_directory(self.directory, path)
+        else:
+            response = send_from_directory(self.directory, path + compression.SUFFIXES[encoding], mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+        if mimetype in compression.COMPRESSIBLE:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = (
+            IMMUTABLE_CACHE_CONTROL if HASHED_ASSET.match(path) else ASSET_CACHE_CONTROL
+        )
+        return response
+
+    def index_response(self):
+        if not self.index:
+            abort(404)
+        encoding = compression.negotiate([e for e in self.index if e]) if len(self.index) > 1 else None
+        response = Response(self.index[encoding], mimetype='text/html')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f"{self.index_etag}-{encoding}")
+        else:
+            response.set_etag(self.index_etag)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = INDEX_CACHE_CONTROL
+        return response.make_conditional(request)
+
+
+def serve(path):
+    manifest = current_app.extensions['spa']
+    if path in manifest.files and path != INDEX:
+        return manifest.asset_response(path)
+    if path.startswith(NOT_SPA_PREFIXES):
+        abort(404)
+    return manifest.index_response()
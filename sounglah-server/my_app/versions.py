@@ -0,0 +1,88 @@
+# app/versions.py
+"""
+Per-table version counters (data_versions) for HTTP validators.
+
+Any ORM flush or ORM-enabled INSERT/UPDATE/DELETE statement (bulk.py, the
+pipeline jobs) touching a tracked table marks it on the session; after the
+transaction commits the counter is bumped in its own short transaction.
+Bumping after commit means the counter row is never locked for the length of
+a bulk write, and the worst a reader racing the bump can do is cache the new
+body under the old version, which only costs one extra refetch.
+"""
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import db
+from .models import DataVersion, TranslationPair
+
+logger = logging.getLogger(__name__)
+
+TRACKED = {TranslationPair.__table__.name}
+_PENDING = 'data_versions_pending'
+
+
+def _mark(session, table_name):
+    if table_name in TRACKED:
+        session.info.setdefault(_PENDING, set()).add(table_name)
+
+
+@event.listens_for(Session, 'after_flush')
+def _after_flush(session, flush_context):
+    for obj in (*session.new, *session.deleted, *session.dirty):
+        table = getattr(obj, '__table__', None)
+        if table is not None and (obj not in session.dirty or session.is_modified(obj)):
+            _mark(session, table.name)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _do_orm_execute(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        mapper = state.bind_mapper
+        if mapper is not None:
+            _mark(state.session, mapper.local_table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    names = session.info.pop(_PENDING, None)
+    if names:
+        try:
+            bump(session.get_bind(), *names)
+        except Exception:
+            logger.warning("Could not bump data_versions for %s", sorted(names), exc_info=True)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop(_PENDING, None)
+
+
+def bump(engine, *names):
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for name in names:
+            result = conn.execute(
+                update(DataVersion).where(DataVersion.name == name)
+                .values(version=DataVersion.version + 1, changed_at=now)
+            )
+            if result.rowcount == 0:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(insert(DataVersion).values(name=name, version=1, changed_at=now))
+                except IntegrityError:
+                    # Another process created it first; its bump is as good as ours
+                    pass
+
+
+def current(name):
+    """(version, changed_at as aware UTC) for a tracked table; (0, None) before its first write."""
+    row = db.session.execute(
+        select(DataVersion.version, DataVersion.changed_at).where(DataVersion.name == name)
+    ).first()
+    if not row:
+        return 0, None
+    return row.version, row.changed_at.replace(tzinfo=timezone.utc) if row.changed_at else None
@@ -10,6 +10,8 @@ def app():
     """Create and configure a new app instance for each test."""
     # Use test database
     os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+    # Tests build the near-duplicate index inline on the shared in-memory connection
+    os.environ['NEAR_DUP_PRELOAD'] = '0'
     
     app = create_app()
     app.config['TESTING'] = True
@@ -54,4 +54,100 @@ class TestAuthentication:
         data = json.loads(response.data)
         assert 'token' in data
         assert 'user' in data
-        assert data['user']['username'] == 'admin'
\ No newline at end of file
+        assert data['user']['username'] == 'admin'
+
+class TestDetectLang:
+    """Test language detection endpoints."""
+
+    def test_detect_batch(self, client):
+        """Batch detection returns one result per input, restricted to supported languages."""
+        texts = ['The weather is nice today', 'Je voudrais un café, s\'il vous plaît', 'The weather is nice today']
+        response = client.post('/api/detectlang/batch', json={'texts': texts})
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [r['language'] for r in data['results']] == ['en', 'fr', 'en']
+        assert all(0 <= r['confidence'] <= 1 for r in data['results'])
+
+    def test_detect_batch_invalid_payload(self, client):
+        """Batch detection rejects non-list payloads."""
+        response = client.post('/api/detectlang/batch', json={'texts': 'hello'})
+        assert response.status_code == 400
+
+
+class TestCompression:
+    """Content-negotiated compression of API responses and static assets."""
+
+    def test_api_response_compressed(self, client, auth_headers, sample_languages, monkeypatch):
+        """JSON bodies above the threshold are encoded with the best accepted coding."""
+        import gzip
+        from my_app import compression
+        monkeypatch.setattr(compression, 'MIN_SIZE', 64)
+        plain = client.get('/api/languages/list', headers=auth_headers())
+        assert 'Content-Encoding' not in plain.headers
+        assert 'Accept-Encoding' in plain.headers['Vary']
+
+        response = client.get('/api/languages/list', headers={**auth_headers(), 'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.data)) == json.loads(plain.data)
+
+        if compression.brotli is not None:
+            response = client.get('/api/languages/list', headers={**auth_headers(), 'Accept-Encoding': 'gzip, br'})
+            assert response.headers['Content-Encoding'] == 'br'
+            assert json.loads(compression.brotli.decompress(response.data)) == json.loads(plain.data)
+
+        monkeypatch.setattr(compression, 'MIN_SIZE', 1 << 20)
+        small = client.get('/api/languages/list', headers={**auth_headers(), 'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in small.headers
+
+    def test_precompressed_static_assets(self, app, client, tmp_path):
+        """Static files are served from their build-time .gz/.br siblings."""
+        import gzip
+        from my_app import compression
+        (tmp_path / 'assets').mkdir()
+        script = b'console.log("sounglah");\n' * 200
+        (tmp_path / 'assets' / 'index-abc123.js').write_bytes(script)
+        (tmp_path / 'logo.png').write_bytes(b'\x89PNG' + b'\0' * 4096)
+        written = compression.precompress_dir(str(tmp_path))
+        assert str(tmp_path / 'assets' / 'index-abc123.js.gz') in written
+        assert not any('logo.png' in path for path in written)
+        assert compression.precompress_dir(str(tmp_path)) == []
+
+        from my_app import spa
+        app.extensions['spa'] = spa.AssetManifest(str(tmp_path))
+        response = client.get('/assets/index-abc123.js', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.mimetype in ('text/javascript', 'application/javascript')
+        assert gzip.decompress(response.data) == script
+
+        response = client.get('/assets/index-abc123.js')
+        assert 'Content-Encoding' not in response.headers and response.data == script
+
+
+class TestSpaServing:
+    """The built frontend is served from a startup manifest."""
+
+    def test_assets_index_and_client_routes(self, app, client, tmp_path):
+        """Hashed assets are immutable, client routes get the in-memory index.html, misses 404."""
+        from my_app import spa
+        (tmp_path / 'assets').mkdir()
+        (tmp_path / 'assets' / 'index-BNb4gJzo.js').write_text('console.log(1);')
+        (tmp_path / 'favicon.ico').write_bytes(b'\0' * 16)
+        (tmp_path / 'index.html').write_text('<!doctype html><div id="root"></div>')
+        app.extensions['spa'] = spa.AssetManifest(str(tmp_path))
+
+        asset = client.get('/assets/index-BNb4gJzo.js')
+        assert asset.status_code == 200 and 'immutable' in asset.headers['Cache-Control']
+        icon = client.get('/favicon.ico')
+        assert icon.status_code == 200 and 'immutable' not in icon.headers['Cache-Control']
+
+        # Served from memory: later edits on disk are not picked up until restart
+        (tmp_path / 'index.html').write_text('changed')
+        for route in ('/', '/translate', '/dashboard/settings'):
+            page = client.get(route)
+            assert page.status_code == 200 and b'id="root"' in page.data
+            assert page.headers['Cache-Control'] == spa.INDEX_CACHE_CONTROL
+        assert client.get('/', headers={'If-None-Match': page.headers['ETag']}).status_code == 304
+
+        assert client.get('/assets/index-OLDHASH1.js').status_code == 404
+        assert client.get('/api/nonexistent').status_code == 404
@@ -0,0 +1,272 @@
+import json
+import pytest
+from types import SimpleNamespace
+from my_app import db
+from my_app.models import TranslationPair
+from my_app.pipeline.pretranslate import run_pretranslate
+from my_app.pipeline import quality_estimate
+
+
+class FakeTokenizer:
+    """Stands in for the HF tokenizer: passes raw strings through."""
+
+    def __call__(self, texts, **kwargs):
+        return {'input_ids': list(texts)}
+
+    def batch_decode(self, sequences, skip_special_tokens=True):
+        return list(sequences)
+
+
+class FakeModel:
+    """'Translates' by upper-casing, and records batch sizes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def generate(self, input_ids, **kwargs):
+        self.batches.append(len(input_ids))
+        return [t.upper() for t in input_ids]
+
+
+class TestPretranslate:
+    """Tests for the background pre-translation job."""
+
+    def test_fills_only_pending_pairs_without_target(self, app, sample_languages):
+        with app.app_context():
+            rows = [
+                TranslationPair(source_text=f'hello {i}', target_text=None,
+                                source_lang_id=sample_languages[0], target_lang_id=sample_languages[1],
+                                status='pending')
+                for i in range(5)
+            ]
+            rows.append(TranslationPair(source_text='done', target_text='fait',
+                                        source_lang_id=sample_languages[0], target_lang_id=sample_languages[1],
+                                        status='pending'))
+            rows.append(TranslationPair(source_text='approved', target_text=None,
+                                        source_lang_id=sample_languages[0], target_lang_id=sample_languages[1],
+                                        status='approved'))
+            db.session.add_all(rows)
+            db.session.commit()
+
+            model = FakeModel()
+            result = run_pretranslate(db.session, FakeTokenizer(), model, scan_batch=2, model_batch=2)
+
+            assert result['translated'] == 5
+            assert max(model.batches) <= 2
+            suggested = {p.source_text: p.machine_translation for p in TranslationPair.query.all()}
+            assert suggested['hello 3'] == 'HELLO 3'
+            assert suggested['done'] is None
+            assert suggested['approved'] is None
+
+            # A second run finds nothing left to do
+            assert run_pretranslate(db.session, FakeTokenizer(), FakeModel())['translated'] == 0
+
+    def test_respects_max_rows(self, app, sample_languages):
+        with app.app_context():
+            db.session.add_all([
+                TranslationPair(source_text=f'row {i}', source_lang_id=sample_languages[0],
+                                target_lang_id=sample_languages[1], status='pending')
+                for i in range(4)
+            ])
+            db.session.commit()
+
+            result = run_pretranslate(db.session, FakeTokenizer(), FakeModel(), scan_batch=3, max_rows=3)
+            assert result['translated'] == 3
+            assert TranslationPair.query.filter(TranslationPair.machine_translation.is_(None)).count() == 1
+
+
+class FakeScoringTokenizer:
+    """Encodes each character as token 1 ('a') or 2 (anything else), padded with 0."""
+
+    pad_token_id = 0
+
+    def __call__(self, texts, text_target=None, **kwargs):
+        import torch
+
+        def encode(batch):
+            ids = [[1 if c == 'a' else 2 for c in t] for t in batch]
+            width = max(len(i) for i in ids)
+            return torch.tensor([i + [0] * (width - len(i)) for i in ids])
+
+        input_ids = encode(texts)
+        return {'input_ids': input_ids, 'attention_mask': (input_ids != 0).long(), 'labels': encode(text_target)}
+
+
+class FakeScoringModel:
+    """Predicts token 1 at every position with high confidence."""
+
+    def __call__(self, input_ids, attention_mask, labels):
+        import torch
+
+        logits = torch.zeros(labels.shape[0], labels.shape[1], 3)
+        logits[..., 1] = 10.0
+        return SimpleNamespace(logits=logits)
+
+
+def _stub_scores(tokenizer, model, sources, targets, **kwargs):
+    return [-float(len(t)) for t in targets]
+
+
+class TestQualityEstimate:
+    """Tests for the teacher-forced quality-estimate job and its admin endpoint."""
+
+    def test_score_pairs_ignores_padding(self):
+        pytest.importorskip('torch')
+        from my_app.inference import score_pairs
+        scores = score_pairs(FakeScoringTokenizer(), FakeScoringModel(),
+                             ['x', 'x', 'x'], ['aaaa', 'a', 'abbb'], batch_size=3)
+        # Padded positions must not drag the short target's mean down
+        assert scores[0] == pytest.approx(scores[1])
+        assert scores[2] < scores[0] <= 0
+
+    def test_scores_only_unscored_pairs_with_target(self, app, sample_languages, monkeypatch):
+        monkeypatch.setattr(quality_estimate, 'score_pairs', _stub_scores)
+        with app.app_context():
+            db.session.add_all([
+                TranslationPair(source_text=f's{i}', target_text='t' * (i + 1), source_lang_id=sample_languages[0],
+                                target_lang_id=sample_languages[1], status='pending')
+                for i in range(4)
+            ] + [
+                TranslationPair(source_text='no target', source_lang_id=sample_languages[0],
+                                target_lang_id=sample_languages[1], status='pending'),
+                TranslationPair(source_text='scored', target_text='x', qe_score=-9.0, source_lang_id=sample_languages[0],
+                                target_lang_id=sample_languages[1], status='pending'),
+            ])
+            db.session.commit()
+
+            result = quality_estimate.run_qe_score(db.session, None, None, scan_batch=2, max_rows=3)
+            assert result['scored'] == 3
+            assert quality_estimate.run_qe_score(db.session, None, None)['scored'] == 1
+
+            pairs = {p.source_text: p for p in TranslationPair.query.all()}
+            assert pairs['s3'].qe_score == -4.0 and pairs['s3'].qe_scored_at is not None
+            assert pairs['no target'].qe_score is None
+            assert pairs['scored'].qe_score == -9.0 and pairs['scored'].qe_scored_at is None
+
+    def test_qe_score_endpoint_requires_admin(self, app, client, auth_headers, sample_languages):
+        from my_app.models import Role, User
+        with app.app_context():
+            role = Role(name='editor')
+            db.session.add(role)
+            db.session.flush()
+            editor = User(username='ed', email='ed@example.com', password_hash='x', role_id=role.id)
+            db.session.add(editor)
+            db.session.commit()
+            editor_id = editor.id
+
+        assert client.post('/api/augment/admin/qe-score').status_code == 401
+        assert client.post('/api/augment/admin/pretranslate').status_code == 401
+        editor_headers = auth_headers(user_id=editor_id, username='ed', role='editor')
+        assert client.post('/api/augment/admin/qe-score', headers=editor_headers).status_code == 403
+        assert client.post('/api/augment/admin/pretranslate', headers=editor_headers).status_code == 403
+
+    def test_qe_score_endpoint_runs_job(self, app, client, auth_headers, sample_translation, monkeypatch):
+        from my_app.resources import augment
+        monkeypatch.setattr(quality_estimate, 'score_pairs', _stub_scores)
+        monkeypatch.setitem(app.extensions, 'ml_tokenizer', object())
+        monkeypatch.setitem(app.extensions, 'ml_model', object())
+
+        response = client.post('/api/augment/admin/qe-score', headers=auth_headers())
+        assert response.status_code == 202
+        # The job releases the lock when it finishes
+        assert augment._model_job_lock.acquire(timeout=10)
+        augment._model_job_lock.release()
+
+        pair = db.session.get(TranslationPair, sample_translation['id'])
+        db.session.refresh(pair)
+        assert pair.qe_score == -len('Bonjour le monde')
+        assert pair.qe_scored_at is not None
+
+        # Editing the target invalidates the score and its timestamp
+        client.put(f"/api/translations/{sample_translation['id']}", headers=auth_headers(),
+                   json={'target_text': 'Salut le monde'})
+        db.session.refresh(pair)
+        assert pair.qe_score is None and pair.qe_scored_at is None
+
+
+class TestEvaluate:
+    """Tests for the held-out evaluation report."""
+
+    def test_report_written_with_metrics_and_latency(self, tmp_path, monkeypatch):
+        from my_app.pipeline import evaluate
+        from my_app.pipeline.io_utils import write_jsonl
+        rows = [{'id': i, 'source_text': f'sentence number {i}', 'target_text': f'voici la phrase numéro {i}'} for i in range(5)]
+        write_jsonl(str(tmp_path / 'run1' / 'test.jsonl'), rows)
+        references = {r['source_text']: r['target_text'] for r in rows}
+        batches = []
+
+        def fake_translate(tokenizer, model, texts, batch_size=32, max_length=256):
+            batches.append(len(texts))
+            # One sentence comes back wrong so the scores land strictly inside (0, 100)
+            return [references[t] if t != 'sentence number 0' else 'autre chose' for t in texts]
+
+        monkeypatch.setattr(evaluate, 'PROCESSED_DIR', str(tmp_path))
+        monkeypatch.setattr(evaluate, 'translate_batch', fake_translate)
+        report = evaluate.run_eval('run1', None, None, batch_size=2, label='stub')
+
+        assert report['report_path'] == str(tmp_path / 'run1' / '_eval_stub.json')
+        with open(report['report_path'], encoding='utf-8') as f:
+            assert json.load(f)['sentences'] == 5
+        assert batches == [2, 2, 1]
+        assert 0 < report['quality']['bleu'] < 100 and 0 < report['quality']['chrf'] < 100
+        throughput = report['throughput']
+        assert set(throughput) == {'total_s', 'sentences_per_s', 'latency_ms_p50', 'latency_ms_p95', 'latency_scope'}
+        assert throughput['latency_scope'] == 'batch'
+        assert 0 <= throughput['latency_ms_p50'] <= throughput['latency_ms_p95']
+        assert len(report['samples']) == 5 and report['samples'][1]['hypothesis'] == 'voici la phrase numéro 1'
+
+    def test_missing_test_split(self, tmp_path, monkeypatch):
+        from my_app.pipeline import evaluate
+        monkeypatch.setattr(evaluate, 'PROCESSED_DIR', str(tmp_path))
+        with pytest.raises(FileNotFoundError):
+            evaluate.run_eval('nope', None, None)
+
+
+class TestMetrics:
+    """Sanity checks for the evaluation metrics."""
+
+    def test_identical_corpus_scores_100(self):
+        from my_app.pipeline.metrics import corpus_bleu, corpus_chrf
+        refs = ['Be o tshob mbe.', 'Bônkeʼ nə ndaʼ ntshob']
+        assert corpus_bleu(refs, refs) == pytest.approx(100.0)
+        assert corpus_chrf(refs, refs) == pytest.approx(100.0)
+
+    def test_partial_match_scores_between_bounds(self):
+        from my_app.pipeline.metrics import corpus_bleu, corpus_chrf
+        hyps = ['the cat sat on the mat today']
+        refs = ['the cat sat on the mat']
+        assert 0 < corpus_bleu(hyps, refs) < 100
+        assert 0 < corpus_chrf(hyps, refs) < 100
+        assert corpus_chrf(['xyz'], ['abc']) == 0.0
+
+
+class TestNgramLangID:
+    """Tests for the character n-gram language identifier."""
+
+    TRAIN = [
+        ('The children are playing outside', 'en'),
+        ('Where is the market today', 'en'),
+        ('I would like some water please', 'en'),
+        ('Bônkeʼ bə̂ ndaʼ ntshob', 'med'),
+        ('Be o tshob mbe', 'med'),
+        ('Mə̀ kə̀ ŋkaʼ nə̂ ntshob', 'med'),
+    ]
+
+    def test_classifies_batch(self):
+        from my_app.ngram_langid import NgramLangID
+        model = NgramLangID.train([t for t, _ in self.TRAIN], [l for _, l in self.TRAIN], n_features=2 ** 12)
+        labels = [label for label, _ in model.classify_batch(['the market is outside', 'bônkeʼ ntshob'])]
+        assert labels == ['en', 'med']
+
+    def test_filter_drops_confident_target_mismatch(self):
+        from my_app.ngram_langid import NgramLangID
+        from my_app.pipeline.filter_lang import run_filter_lang
+        model = NgramLangID.train([t for t, _ in self.TRAIN], [l for _, l in self.TRAIN], n_features=2 ** 12)
+        rows = [
+            {'id': 1, 'source_text': 'Hi', 'target_text': 'Bônkeʼ bə̂ ndaʼ ntshob', 'source_lang': 'en', 'target_lang': 'med'},
+            {'id': 2, 'source_text': 'Hi', 'target_text': 'The children are playing outside', 'source_lang': 'en', 'target_lang': 'med'},
+        ]
+        keep, stats, drops = run_filter_lang(rows, target_model=model, min_prob=0.55)
+        assert [r['id'] for r in keep] == [1]
+        assert stats['dropped_lang_target'] == 1
+        assert drops[0]['side'] == 'target'
@@ -1,4 +1,5 @@
 import pytest
+import os
 import json
 from my_app.models import TranslationPair, Language
 
@@ -207,4 +208,724 @@ class TestTranslationEndpoints:
             assert db_translation.target_text == translation_data['target_text']
             assert db_translation.source_lang_id == translation_data['source_lang_id']
             assert db_translation.target_lang_id == translation_data['target_lang_id']
-            assert db_translation.domain == translation_data['domain'] 
\ No newline at end of file
+            assert db_translation.domain == translation_data['domain']
+
+    def test_list_sorted_by_qe_score(self, client, auth_headers, sample_languages):
+        """Most suspicious (lowest qe_score) first, unscored pairs last."""
+        with client.application.app_context():
+            from my_app import db
+            for text, score in [('ok', -0.2), ('unscored', None), ('suspicious', -4.5)]:
+                db.session.add(TranslationPair(
+                    source_text=text, target_text=text,
+                    source_lang_id=sample_languages[0], target_lang_id=sample_languages[1],
+                    status='pending', qe_score=score,
+                ))
+            db.session.commit()
+
+        response = client.get('/api/translations/list?sort=qe_score', headers=auth_headers())
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [t['source_text'] for t in data['translations']] == ['suspicious', 'ok', 'unscored']
+
+    def test_list_query_count_independent_of_page_size(self, client, auth_headers, sample_languages):
+        """Language lookups are batched, so a bigger page issues no extra queries."""
+        from sqlalchemy import event
+        with client.application.app_context():
+            from my_app import db
+            for i in range(20):
+                db.session.add(TranslationPair(
+                    source_text=f'row {i}', target_text=f'ligne {i}',
+                    source_lang_id=sample_languages[i % 2], target_lang_id=sample_languages[2],
+                    status='pending',
+                ))
+            db.session.commit()
+            engine = db.engine
+
+        def count_queries(limit, query=''):
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(engine, 'before_cursor_execute', listener)
+            try:
+                response = client.get(f'/api/translations/list?limit={limit}{query}', headers=auth_headers())
+            finally:
+                event.remove(engine, 'before_cursor_execute', listener)
+            assert response.status_code == 200
+            assert len(json.loads(response.data)['translations']) == limit
+            return len(statements)
+
+        count_queries(1)  # warm up the auth user lookup
+        full = count_queries(20)
+        assert count_queries(2) == full
+        # Sparse fieldsets narrow the SELECT without lazy-loading deferred columns per row
+        assert count_queries(20, '&fields=id,source_text') == full
+        assert count_queries(20, '&fields=id,target_language') == full
+
+    def test_language_cache_invalidated_on_create(self, client, auth_headers, sample_languages):
+        """A language created through the API shows up in the cached list right away."""
+        assert len(json.loads(client.get('/api/languages/list', headers=auth_headers()).data)['languages']) == 3
+
+        response = client.post('/api/languages', json={'name': 'Medumba', 'iso_code': 'med'}, headers=auth_headers())
+        assert response.status_code == 201
+
+        names = [l['name'] for l in json.loads(client.get('/api/languages/list', headers=auth_headers()).data)['languages']]
+        assert names == ['English', 'French', 'Spanish', 'Medumba']
+
+    def test_language_cache_rate_limits_miss_reloads(self, app, sample_languages):
+        """Unknown ids reload the table at most once per MISS_RELOAD_SECONDS."""
+        from my_app import db, refcache
+        table = app.extensions['refcache'].tables['languages']
+        assert refcache.language(sample_languages[0]).name == 'English'
+        loaded_at = table._loaded_at
+        for _ in range(5):
+            assert refcache.language(9999) is None
+        assert table._loaded_at == loaded_at
+
+        # Created by "another worker": found once the reload interval has passed
+        db.session.add(Language(name='Medumba', iso_code='med'))
+        db.session.commit()
+        new_id = Language.query.filter_by(iso_code='med').one().id
+        assert refcache.language(new_id) is None
+        table._loaded_at -= refcache.MISS_RELOAD_SECONDS
+        assert refcache.language(new_id).name == 'Medumba'
+
+    def test_language_filter_prefers_exact_iso_match(self, client, auth_headers, sample_languages):
+        """'en' resolves to English even though 'French' contains 'en'."""
+        with client.application.app_context():
+            from my_app import db
+            db.session.add(TranslationPair(source_text='Bonjour', target_text='Hola',
+                                           source_lang_id=sample_languages[1], target_lang_id=sample_languages[2]))
+            db.session.add(TranslationPair(source_text='Hello', target_text='Hola',
+                                           source_lang_id=sample_languages[0], target_lang_id=sample_languages[2]))
+            db.session.commit()
+
+        response = client.get('/api/translations/list?source_lang=en', headers=auth_headers())
+        assert [t['source_text'] for t in json.loads(response.data)['translations']] == ['Hello']
+
+    def test_keyset_pagination_with_cursor(self, client, auth_headers, sample_languages):
+        """Following next_cursor walks every row exactly once, in (created_at, id) order."""
+        from datetime import datetime, timedelta
+        with client.application.app_context():
+            from my_app import db
+            base = datetime(2025, 1, 1)
+            for i in range(7):
+                db.session.add(TranslationPair(
+                    source_text=f'row {i}', target_text=f'ligne {i}',
+                    source_lang_id=sample_languages[0], target_lang_id=sample_languages[1],
+                    # Two rows per timestamp to exercise the id tie-breaker
+                    created_at=base + timedelta(days=i // 2),
+                ))
+            db.session.commit()
+
+        seen = []
+        url = '/api/translations/list?sort=created_at&order=desc&limit=3'
+        while url:
+            data = json.loads(client.get(url, headers=auth_headers()).data)
+            seen.extend(t['source_text'] for t in data['translations'])
+            url = f"/api/translations/list?limit=3&cursor={data['next_cursor']}" if data['next_cursor'] else None
+
+        assert seen == ['row 6', 'row 5', 'row 4', 'row 3', 'row 2', 'row 1', 'row 0']
+
+    def test_created_at_cursor_for_rows_inserted_outside_the_orm(self, client, auth_headers, sample_languages):
+        """Raw inserts get a server-side created_at, so their cursors still decode."""
+        from sqlalchemy import text
+        with client.application.app_context():
+            from my_app import db
+            for i in range(3):
+                db.session.execute(text(
+                    "INSERT INTO translation_pairs (source_text, source_lang_id, target_lang_id, status) "
+                    "VALUES (:s, :a, :b, 'pending')"), {'s': f'raw {i}', 'a': sample_languages[0], 'b': sample_languages[1]})
+            db.session.commit()
+
+        data = json.loads(client.get('/api/translations/list?sort=created_at&limit=2', headers=auth_headers()).data)
+        assert all(t['created_at'] for t in data['translations'])
+        response = client.get(f"/api/translations/list?limit=2&cursor={data['next_cursor']}", headers=auth_headers())
+        assert response.status_code == 200
+
+    def test_keyset_pagination_after_id(self, client, auth_headers, sample_languages):
+        """after_id seeks by primary key."""
+        with client.application.app_context():
+            from my_app import db
+            pairs = [TranslationPair(source_text=f'row {i}', target_text='x',
+                                     source_lang_id=sample_languages[0], target_lang_id=sample_languages[1])
+                     for i in range(4)]
+            db.session.add_all(pairs)
+            db.session.commit()
+            second_id = pairs[1].id
+
+        data = json.loads(client.get(f'/api/translations/list?after_id={second_id}&limit=10',
+                                     headers=auth_headers()).data)
+        assert [t['source_text'] for t in data['translations']] == ['row 2', 'row 3']
+        assert data['next_cursor'] is None
+
+    def test_invalid_cursor_rejected(self, client, auth_headers):
+        response = client.get('/api/translations/list?cursor=not-a-cursor', headers=auth_headers())
+        assert response.status_code == 400
+
+    def test_total_cached_and_invalidated_on_write(self, client, auth_headers, sample_translation, sample_languages):
+        """Totals are cached per filter set and refreshed after writes through the API."""
+        def total(query=''):
+            return json.loads(client.get(f'/api/translations/list?{query}', headers=auth_headers()).data)['total']
+
+        assert total() == 1
+        assert json.loads(client.get('/api/translations/list?include_total=false',
+                                     headers=auth_headers()).data)['total'] is None
+
+        client.post('/api/translations/list', json={
+            'source_text': 'Good night', 'target_text': 'Bonne nuit',
+            'source_lang_id': sample_languages[0], 'target_lang_id': sample_languages[1],
+        }, headers=auth_headers())
+        assert total() == 2
+        # Estimates fall back to exact counts off PostgreSQL
+        assert total('count=estimated') == 2
+
+    def test_unfiltered_estimate_ignores_false_boolean_filters(self, client, auth_headers, sample_translation,
+                                                               monkeypatch):
+        """legacy_duplicate=false is no filter: the list still gets the whole-table estimate."""
+        from my_app import counts
+        keys = []
+        monkeypatch.setattr(counts, 'estimated_count', lambda query, key: keys.append(key) or 1000)
+        for query in ('count=estimated', 'count=estimated&legacy_duplicate=false'):
+            data = json.loads(client.get(f'/api/translations/list?{query}', headers=auth_headers()).data)
+            assert data['total'] == 1000 and data['total_is_estimate'] is True
+        assert keys == [(), ()]
+
+    def test_search_with_relevance_sort(self, client, auth_headers, sample_translation):
+        """sort=relevance is accepted and still applies the search filter."""
+        response = client.get('/api/translations/list?search=hello&sort=relevance', headers=auth_headers())
+        assert response.status_code == 200
+        assert [t['source_text'] for t in json.loads(response.data)['translations']] == ['Hello world']
+
+    def test_search_matches_folded_medumba_text(self, client, auth_headers, sample_languages):
+        """Plain ASCII search terms match diacritics and the U+02BC apostrophe."""
+        with client.application.app_context():
+            from my_app import db
+            db.session.add(TranslationPair(source_text='Children', target_text='Bônkeʼ bə̂',
+                                           source_lang_id=sample_languages[0], target_lang_id=sample_languages[1]))
+            db.session.commit()
+
+        response = client.get('/api/translations/list?search=bonke be', headers=auth_headers())
+        assert [t['source_text'] for t in json.loads(response.data)['translations']] == ['Children']
+
+    def test_search_and_domain_wildcards_are_literal(self, client, auth_headers, sample_languages):
+        """% and _ in search and domain filters match themselves, not any text."""
+        with client.application.app_context():
+            from my_app import db
+            for source, domain in (('100% sure', 'a_b'), ('1000 sure', 'axb')):
+                db.session.add(TranslationPair(source_text=source, target_text='x', domain=domain,
+                                               source_lang_id=sample_languages[0], target_lang_id=sample_languages[1]))
+            db.session.commit()
+
+        def sources(query):
+            response = client.get(f'/api/translations/list?{query}', headers=auth_headers())
+            return [t['source_text'] for t in json.loads(response.data)['translations']]
+
+        assert sources('search=100%25') == ['100% sure']
+        assert sources('domain=a_b') == ['100% sure']
+        assert sources('search=%25') == ['100% sure']
+
+    def test_bulk_update_status(self, client, auth_headers, sample_languages):
+        """Set-based bulk update reports missing ids and keeps approved_at semantics."""
+        from datetime import datetime
+        stamped = datetime(2024, 1, 1)
+        with client.application.app_context():
+            from my_app import db
+            pending = TranslationPair(source_text='a', target_text='b', status='pending',
+                                      source_lang_id=sample_languages[0], target_lang_id=sample_languages[1])
+            approved = TranslationPair(source_text='c', target_text='d', status='approved', approved_at=stamped,
+                                       source_lang_id=sample_languages[0], target_lang_id=sample_languages[1])
+            db.session.add_all([pending, approved])
+            db.session.commit()
+            ids = [pending.id, approved.id]
+
+        response = client.post('/api/translations/bulk_update',
+                               json={'ids': ids + [9999], 'status': 'approved'}, headers=auth_headers())
+        data = json.loads(response.data)
+        assert sorted(data['success']) == sorted(ids)
+        assert data['failed'] == [9999]
+
+        with client.application.app_context():
+            from my_app import db
+            db.session.expire_all()
+            assert db.session.get(TranslationPair, ids[0]).approved_at is not None
+            assert db.session.get(TranslationPair, ids[1]).approved_at == stamped
+
+        client.post('/api/translations/bulk_update', json={'ids': ids, 'status': 'rejected'}, headers=auth_headers())
+        with client.application.app_context():
+            from my_app import db
+            db.session.expire_all()
+            assert {p.approved_at for p in TranslationPair.query.all()} == {None}
+
+        response = client.post('/api/translations/bulk_update', json={'ids': ids, 'status': 'bogus'}, headers=auth_headers())
+        assert response.status_code == 400
+
+    def test_bulk_update_by_filter(self, client, auth_headers, sample_languages):
+        """Filter-driven bulk update runs as a job and touches only matching rows."""
+        import time
+        with client.application.app_context():
+            from my_app import db
+            db.session.add_all([
+                TranslationPair(source_text=f'row {i}', target_text='t', status='pending',
+                                domain='news' if i % 2 else 'bible',
+                                source_lang_id=sample_languages[0], target_lang_id=sample_languages[1])
+                for i in range(10)
+            ])
+            db.session.commit()
+
+        response = client.post('/api/translations/bulk_update_by_filter',
+                               json={'filters': {'domain': 'news'}, 'status': 'approved'}, headers=auth_headers())
+        assert response.status_code == 202
+        job_id = json.loads(response.data)['job_id']
+
+        for _ in range(100):
+            job = json.loads(client.get(f'/api/translations/jobs/{job_id}', headers=auth_headers()).data)
+            if job['status'] in ('succeeded', 'failed'):
+                break
+            time.sleep(0.05)
+        assert job['status'] == 'succeeded', job['error']
+        assert job['result'] == {'matched': 5, 'updated': 5}
+        assert job['processed'] == job['total'] == 5
+
+        with client.application.app_context():
+            approved = TranslationPair.query.filter_by(status='approved').all()
+            assert {p.domain for p in approved} == {'news'} and len(approved) == 5
+
+        response = client.post('/api/translations/bulk_update_by_filter',
+                               json={'filters': {}, 'status': 'approved'}, headers=auth_headers())
+        assert response.status_code == 400
+
+        # Filters that can't be applied are rejected before a job starts, not dropped
+        for bad in ({'status': 'bogus'}, {'created_at_start': 'yesterday'}, {'source_lang': 5},
+                    {'target_lang': 'Klingon'}, {'legacy_duplicate': 'maybe'}):
+            response = client.post('/api/translations/bulk_update_by_filter',
+                                   json={'filters': {'domain': 'news', **bad}, 'status': 'rejected'},
+                                   headers=auth_headers())
+            assert response.status_code == 400, bad
+        with client.application.app_context():
+            assert TranslationPair.query.filter_by(status='rejected').count() == 0
+
+    def test_upload_csv_bulk_insert(self, client, auth_headers, sample_languages):
+        """Bulk upload inserts valid rows, reports bad ones, and keeps rows searchable."""
+        src, tgt = 'English', 'French'
+        rows = [{'source_text': f'Hello {i}', 'target_text': f'Mbə̂ {i}', 'source_language': src,
+                 'target_language': tgt, 'domain': 'greetings'} for i in range(50)]
+        rows.insert(3, {'source_text': 'x', 'target_text': 'y', 'source_language': 'Klingon', 'target_language': tgt})
+        # No source_text: inserted as '' and reported as added, as the upload always has
+        rows.append({'target_text': 'z', 'source_language': src, 'target_language': tgt})
+
+        response = client.post('/api/translations/upload_csv', json=rows, headers=auth_headers())
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['added'] == 51 and data['total'] == 52
+        assert [r['row'] for r in data['results']] == list(range(1, 53))
+        assert data['results'][3]['status'] == 'error'
+        assert data['results'][4] == {'row': 5, 'source_text': 'Hello 3', 'target_text': 'Mbə̂ 3',
+                                      'source_language': src, 'target_language': tgt, 'status': 'added'}
+        assert data['results'][-1] == {'row': 52, 'source_text': '', 'target_text': 'z',
+                                       'source_language': src, 'target_language': tgt, 'status': 'added'}
+
+        with client.application.app_context():
+            assert TranslationPair.query.filter_by(domain='greetings').count() == 50
+        response = client.get('/api/translations/list?search=mbe 7', headers=auth_headers())
+        assert json.loads(response.data)['total'] >= 1
+
+    def _wait_for_job(self, client, auth_headers, job_id):
+        import time
+        for _ in range(100):
+            job = json.loads(client.get(f'/api/translations/jobs/{job_id}', headers=auth_headers()).data)
+            if job['status'] not in ('queued', 'running'):
+                return job
+            time.sleep(0.05)
+        return job
+
+    def test_import_file_and_resume(self, client, auth_headers, sample_languages, tmp_path, monkeypatch):
+        """File imports stream in a job, report errors, and resume from the checkpoint."""
+        from io import BytesIO
+        from my_app import imports
+        monkeypatch.setattr(imports, 'IMPORT_DIR', str(tmp_path))
+        lines = ['source_text\ttarget_text\tsource_language\ttarget_language']
+        lines += [f'Hi {i}\tMbə̂ {i}\tEnglish\tFrench' for i in range(6)]
+        lines.append('Bad\tRow\tKlingon\tFrench')
+        body = ('\n'.join(lines) + '\n').encode('utf-8')
+
+        response = client.post('/api/translations/import', headers=auth_headers(),
+                               data={'file': (BytesIO(body), 'pairs.tsv')}, content_type='multipart/form-data')
+        assert response.status_code == 202
+        job_id = json.loads(response.data)['job_id']
+        job = self._wait_for_job(client, auth_headers, job_id)
+        assert job['status'] == 'succeeded', job['error']
+        assert job['result'] == {'rows': 7, 'added': 6, 'duplicates': 0, 'error_count': 1}
+
+        report = json.loads(client.get(f'/api/translations/import/{job_id}', headers=auth_headers()).data)
+        assert [e['row'] for e in report['errors']] == [7]
+        assert client.post(f'/api/translations/import/{job_id}/resume', headers=auth_headers()).status_code == 409
+
+        # Simulate a crash after the first 4 rows were committed
+        state = imports.load_state(job_id)
+        state.update(status='running', rows_done=4, added=4, error_count=0, errors=[])
+        imports.save_state(job_id, state)
+        client.application.extensions['jobs']._jobs.clear()
+        assert self._wait_for_job(client, auth_headers, job_id)['status'] == 'interrupted'
+
+        response = client.post(f'/api/translations/import/{job_id}/resume', headers=auth_headers())
+        assert response.status_code == 202
+        job = self._wait_for_job(client, auth_headers, job_id)
+        # Rows 5-6 were replayed and caught by the content hash; rows 1-4 were skipped
+        assert job['result'] == {'rows': 7, 'added': 4, 'duplicates': 2, 'error_count': 1}
+        with client.application.app_context():
+            assert TranslationPair.query.filter(TranslationPair.source_text.like('Hi %')).count() == 6
+
+    @pytest.mark.parametrize('fmt', ['jsonl', 'csv'])
+    def test_import_reports_bad_lines_and_continues(self, client, auth_headers, sample_languages,
+                                                    tmp_path, monkeypatch, fmt):
+        """A malformed line in the middle of a file is reported with its line number; the rest imports."""
+        from io import BytesIO
+        from my_app import imports
+        monkeypatch.setattr(imports, 'IMPORT_DIR', str(tmp_path))
+        if fmt == 'jsonl':
+            good = lambda i: json.dumps({'source_text': f'Line {i}', 'target_text': f'Ndà {i}',
+                                         'source_language': 'English', 'target_language': 'French'})
+            lines = [good(1), '{"source_text": "broken', '["not", "an", "object"]', '',
+                     json.dumps({'source_text': 5, 'source_language': 'English', 'target_language': 'French'}),
+                     good(2)]
+            bad_lines = [2, 3, 5]
+        else:
+            lines = ['source_text,target_text,source_language,target_language',
+                     'Line 1,Ndà 1,English,French', 'Short row', 'Line 2,Ndà 2,English,French']
+            bad_lines = [3]
+        body = ('\n'.join(lines) + '\n').encode('utf-8')
+
+        response = client.post('/api/translations/import', headers=auth_headers(),
+                               data={'file': (BytesIO(body), f'pairs.{fmt}')}, content_type='multipart/form-data')
+        job = self._wait_for_job(client, auth_headers, json.loads(response.data)['job_id'])
+        assert job['status'] == 'succeeded', job['error']
+        assert job['result']['added'] == 2 and job['result']['error_count'] == len(bad_lines)
+
+        report = json.loads(client.get(f"/api/translations/import/{job['id']}", headers=auth_headers()).data)
+        assert [e['line'] for e in report['errors']] == bad_lines
+        assert all(e['error'] for e in report['errors'])
+        with client.application.app_context():
+            assert TranslationPair.query.filter(TranslationPair.source_text.like('Line %')).count() == 2
+
+    def test_duplicate_pairs_rejected(self, client, auth_headers, sample_languages):
+        """Normalized duplicates are caught on create, update and upload."""
+        en, fr = sample_languages[0], sample_languages[1]
+        first = client.post('/api/translations/list', headers=auth_headers(), json={
+            'source_text': 'Good  morning', 'target_text': "Bɔ'ɔ", 'source_lang_id': en, 'target_lang_id': fr})
+        assert first.status_code == 201
+        first_id = json.loads(first.data)['id']
+
+        response = client.post('/api/translations/list', headers=auth_headers(), json={
+            'source_text': 'good morning ', 'target_text': 'Bɔʼɔ', 'source_lang_id': en, 'target_lang_id': fr})
+        assert response.status_code == 409
+        assert json.loads(response.data)['duplicate_of'] == first_id
+
+        other = json.loads(client.post('/api/translations/list', headers=auth_headers(), json={
+            'source_text': 'Good night', 'target_text': 'x', 'source_lang_id': en, 'target_lang_id': fr}).data)['id']
+        response = client.put(f'/api/translations/{other}', headers=auth_headers(),
+                              json={'source_text': 'Good morning', 'target_text': "Bɔ'ɔ"})
+        assert response.status_code == 409
+
+        rows = [{'source_text': 'GOOD MORNING', 'target_text': "Bɔ'ɔ", 'source_language': 'English', 'target_language': 'French'},
+                {'source_text': 'Thanks', 'target_text': 'y', 'source_language': 'English', 'target_language': 'French'},
+                {'source_text': 'thanks', 'target_text': 'y', 'source_language': 'English', 'target_language': 'French'}]
+        data = json.loads(client.post('/api/translations/upload_csv', json=rows, headers=auth_headers()).data)
+        assert data['added'] == 1 and data['duplicates'] == 2
+        assert data['results'][0]['duplicate_of'] == first_id
+        assert data['results'][2]['status'] == 'duplicate'
+        assert data['results'][2]['duplicate_of'] not in (None, first_id)
+
+    def test_legacy_duplicates_can_be_reviewed(self, client, auth_headers, sample_languages):
+        """Pre-existing duplicates (no content hash) accept status-only edits and can be listed."""
+        from my_app import db
+        en, fr = sample_languages[0], sample_languages[1]
+        ids = [json.loads(client.post('/api/translations/list', headers=auth_headers(), json={
+            'source_text': text, 'target_text': 'Mbʉ', 'source_lang_id': en, 'target_lang_id': fr}).data)['id']
+            for text in ('Hello', 'Hello there')]
+        with client.application.app_context():
+            # What the dedup migration leaves behind for the second copy
+            db.session.execute(TranslationPair.__table__.update()
+                               .where(TranslationPair.id == ids[1])
+                               .values(source_text='Hello', content_hash=None))
+            db.session.commit()
+
+        listed = json.loads(client.get('/api/translations/list?legacy_duplicate=true',
+                                       headers=auth_headers()).data)['translations']
+        assert [t['id'] for t in listed] == [ids[1]]
+
+        response = client.put(f'/api/translations/{ids[1]}', headers=auth_headers(), json={'status': 'rejected'})
+        assert response.status_code == 200
+        assert json.loads(response.data)['status'] == 'rejected'
+        # Editing its text still goes through the duplicate check
+        response = client.put(f'/api/translations/{ids[1]}', headers=auth_headers(), json={'source_text': ' hello'})
+        assert response.status_code == 409
+
+    def test_create_and_upload_suggest_similar(self, client, auth_headers, sample_languages):
+        """Near-duplicate sources in the same language are suggested on create and upload."""
+        en, fr = sample_languages[0], sample_languages[1]
+        existing = json.loads(client.post('/api/translations/list', headers=auth_headers(), json={
+            'source_text': 'Where is the market today?', 'target_text': 'a', 'source_lang_id': en, 'target_lang_id': fr}).data)
+        assert existing['similar'] == []
+
+        created = json.loads(client.post('/api/translations/list', headers=auth_headers(), json={
+            'source_text': 'Where is the market?', 'target_text': 'b', 'source_lang_id': en, 'target_lang_id': fr}).data)
+        assert [s['id'] for s in created['similar']] == [existing['id']]
+        assert 0.5 <= created['similar'][0]['similarity'] < 1
+
+        rows = [{'source_text': 'where is the market today', 'target_text': 'c', 'source_language': 'English', 'target_language': 'French'},
+                {'source_text': 'Completely unrelated words', 'target_text': 'd', 'source_language': 'English', 'target_language': 'French'},
+                {'source_text': 'Where is the market today?', 'target_text': 'e', 'source_language': 'French', 'target_language': 'English'}]
+        data = json.loads(client.post('/api/translations/upload_csv', json=rows, headers=auth_headers()).data)
+        assert {s['id'] for s in data['results'][0]['similar']} == {existing['id'], created['id']}
+        assert 'similar' not in data['results'][1]
+        assert 'similar' not in data['results'][2]
+
+    def test_near_dup_index_reindex_replaces_old_entries(self):
+        """Re-indexing an edited pair drops its old band entries; len counts rows, not buckets."""
+        from my_app.near_dup import MinHashIndex
+
+        index = MinHashIndex()
+        index.add(1, 'the quick brown fox jumps')
+        index.add(2, 'a completely different sentence')
+        assert len(index) == 2
+        assert 1 in index.candidates('the quick brown fox jumps')
+
+        index.add(1, 'lorem ipsum dolor sit amet')  # merges the pending rows first
+        assert len(index) == 2
+        assert 1 not in index.candidates('the quick brown fox jumps')
+        assert index.candidates('lorem ipsum dolor sit amet')[0] == 1
+        assert index.candidates('a completely different sentence')[0] == 2
+
+        index.add(3, 'the quick brown fox jumps')
+        assert index.candidates('the quick brown fox jumps') == [3]
+        assert len(index) == 3
+
+    def test_export_csv(self, client, auth_headers, sample_translation):
+        """Export streams a header plus one CSV row per matching pair with language names."""
+        import csv
+        from io import StringIO
+        response = client.get('/api/translations/export', headers=auth_headers())
+        assert response.status_code == 200
+        rows = list(csv.reader(StringIO(response.get_data(as_text=True))))
+        assert rows[0][:5] == ['id', 'source_text', 'target_text', 'source_language', 'target_language']
+        assert len(rows) == 2
+        assert rows[1][1:5] == ['Hello world', 'Bonjour le monde', 'English', 'French']
+        assert rows[1][9] == ''
+
+        response = client.get('/api/translations/export?status=approved', headers=auth_headers())
+        assert len(list(csv.reader(StringIO(response.get_data(as_text=True))))) == 1
+
+    def test_copy_sql_inlines_id_filter(self, app):
+        """COPY SQL for PostgreSQL expands the ids IN list and inlines every parameter."""
+        from sqlalchemy.dialects import postgresql
+        from my_app import export
+
+        class FakeCursor:
+            def mogrify(self, sql, params):
+                quoted = {k: str(v) if isinstance(v, int) else "'%s'" % str(v).replace("'", "''")
+                          for k, v in params.items()}
+                return (sql % quoted).encode('utf-8')
+
+        query = TranslationPair.query.filter(TranslationPair.status == 'pending',
+                                             TranslationPair.id.in_([1, 2]))
+        sql = export.copy_sql(export.export_statement(query), FakeCursor(), postgresql.psycopg2.dialect())
+        assert 'POSTCOMPILE' not in sql and '%(' not in sql
+        assert 'IN (1, 2)' in sql and "= 'pending'" in sql
+        assert sql.startswith('COPY (SELECT') and sql.endswith('TO STDOUT WITH (FORMAT csv, HEADER true)')
+
+    def test_export_formats(self, client, auth_headers, sample_translation):
+        """gzip CSV, JSONL and Parquet exports carry the same rows as CSV."""
+        import gzip
+        import io
+        plain = client.get('/api/translations/export', headers=auth_headers()).get_data()
+        response = client.get('/api/translations/export?format=csv.gz', headers=auth_headers())
+        assert response.headers['Content-Disposition'].endswith('.csv.gz')
+        assert gzip.decompress(response.get_data()) == plain
+
+        # Text exports are gzip-encoded on the fly when accepted; gzip files are not encoded twice
+        headers = {**auth_headers(), 'Accept-Encoding': 'gzip'}
+        response = client.get('/api/translations/export', headers=headers)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.get_data()) == plain
+        response = client.get('/api/translations/export?format=csv.gz', headers=headers)
+        assert 'Content-Encoding' not in response.headers
+        assert gzip.decompress(response.get_data()) == plain
+
+        lines = client.get('/api/translations/export?format=jsonl', headers=auth_headers()).get_data(as_text=True).splitlines()
+        assert len(lines) == 1
+        row = json.loads(lines[0])
+        assert row['source_language'] == 'English' and row['reviewer_id'] is None
+
+        pq = pytest.importorskip('pyarrow.parquet')
+        response = client.get('/api/translations/export?format=parquet', headers=auth_headers())
+        table = pq.read_table(io.BytesIO(response.get_data()))
+        assert table.num_rows == 1
+        assert table.column('target_text').to_pylist() == ['Bonjour le monde']
+
+        assert client.get('/api/translations/export?format=xml', headers=auth_headers()).status_code == 400
+
+    def test_partitioned_export(self, client, auth_headers, sample_languages, tmp_path, monkeypatch):
+        """Partitioned export writes contiguous id-range parts and a manifest."""
+        import csv
+        from io import StringIO
+        from my_app import export
+        monkeypatch.setattr(export, 'EXPORT_DIR', str(tmp_path))
+        stale = tmp_path / ('0' * 32)
+        stale.mkdir()
+        os.utime(stale, (0, 0))
+        with client.application.app_context():
+            from my_app import db
+            db.session.add_all([
+                TranslationPair(source_text=f'row {i}', target_text='t', status='pending',
+                                domain='news' if i % 3 else 'other',
+                                source_lang_id=sample_languages[0], target_lang_id=sample_languages[1])
+                for i in range(20)
+            ])
+            db.session.commit()
+
+        response = client.post('/api/translations/export/partitioned', headers=auth_headers(),
+                               json={'filters': {'domain': 'news'}, 'parts': 3, 'workers': 2})
+        assert response.status_code == 202
+        job = self._wait_for_job(client, auth_headers, json.loads(response.data)['job_id'])
+        assert job['status'] == 'succeeded', job['error']
+        assert job['result']['rows'] == 13 and job['result']['parts'] == 3
+
+        export_id = job['id']
+        manifest = json.loads(client.get(f'/api/translations/exports/{export_id}/manifest.json',
+                                         headers=auth_headers()).get_data())
+        assert [p['rows'] for p in manifest['parts']] == [5, 5, 3]
+        ids = []
+        for part in manifest['parts']:
+            body = client.get(f"/api/translations/exports/{export_id}/{part['file']}", headers=auth_headers())
+            rows = list(csv.reader(StringIO(body.get_data(as_text=True))))
+            assert rows[0][0] == 'id'
+            ids += [int(r[0]) for r in rows[1:]]
+            assert part['first_id'] <= int(rows[1][0]) and int(rows[-1][0]) <= part['last_id']
+        assert ids == sorted(ids) and len(ids) == 13
+        # Expired exports are swept when the next one starts
+        assert not stale.exists()
+
+    def test_partitioned_export_limits_and_unfinished_files(self, client, auth_headers, tmp_path, monkeypatch):
+        """Oversized part counts are rejected; files of a running or unfinished export are not served."""
+        from my_app import export, jobs
+        monkeypatch.setattr(export, 'EXPORT_DIR', str(tmp_path))
+        response = client.post('/api/translations/export/partitioned', headers=auth_headers(),
+                               json={'parts': export.MAX_PARTS + 1})
+        assert response.status_code == 400
+
+        export_id = 'a' * 32
+        (tmp_path / export_id).mkdir()
+        (tmp_path / export_id / 'part-00000.csv').write_text('id\n')
+        url = f'/api/translations/exports/{export_id}/part-00000.csv'
+        client.application.extensions['jobs'].add(jobs.Job('export', job_id=export_id))
+        assert client.get(url, headers=auth_headers()).status_code == 409
+        client.application.extensions['jobs'].get(export_id).status = 'failed'
+        assert client.get(url, headers=auth_headers()).status_code == 404
+
+    def test_conditional_get(self, client, auth_headers, sample_translation):
+        """Unchanged GETs answer If-None-Match with 304; any write changes the ETag."""
+        url = f"/api/translations/{sample_translation['id']}"
+        first = client.get(url, headers=auth_headers())
+        etag = first.headers['ETag']
+        assert first.status_code == 200 and etag.startswith('W/')
+
+        cached = client.get(url, headers={**auth_headers(), 'If-None-Match': etag})
+        assert cached.status_code == 304 and cached.get_data() == b''
+        assert client.get('/api/translations/list', headers={**auth_headers(), 'If-None-Match': etag}).status_code == 200
+
+        client.put(url, json={'domain': 'greetings'}, headers=auth_headers())
+        after = client.get(url, headers={**auth_headers(), 'If-None-Match': etag})
+        assert after.status_code == 200 and after.headers['ETag'] != etag
+
+        # Set-based writes bump the version too
+        etag = after.headers['ETag']
+        client.post('/api/translations/bulk_update', json={'ids': [sample_translation['id']], 'status': 'approved'},
+                    headers=auth_headers())
+        assert client.get(url, headers={**auth_headers(), 'If-None-Match': etag}).status_code == 200
+
+        # Last-Modified doesn't cover language names, so If-Modified-Since alone never answers 304
+        last_modified = client.get(url, headers=auth_headers()).headers['Last-Modified']
+        client.put('/api/languages/1', json={'name': 'British English'}, headers=auth_headers())
+        renamed = client.get(url, headers={**auth_headers(), 'If-Modified-Since': last_modified})
+        assert renamed.status_code == 200
+        assert json.loads(renamed.data)['source_language']['name'] == 'British English'
+
+        languages = client.get('/api/languages/list', headers=auth_headers())
+        assert client.get('/api/languages/list', headers={
+            **auth_headers(), 'If-None-Match': languages.headers['ETag']}).status_code == 304
+
+    @pytest.mark.parametrize('backend_url', ['', 'memory://'])
+    def test_response_cache(self, client, auth_headers, sample_translation, backend_url):
+        """GET lists are served from the response cache until a write invalidates their tag."""
+        from sqlalchemy import update
+        from my_app import db, response_cache
+        client.application.extensions['response_cache'] = response_cache.make_backend(backend_url)
+
+        first = json.loads(client.get('/api/translations/list?status=pending', headers=auth_headers()).data)
+        with client.application.app_context():
+            # Raw table write: neither invalidated nor tracked, so the cached page stays
+            db.session.execute(TranslationPair.__table__.update().values(domain='changed'))
+            db.session.commit()
+        again = json.loads(client.get('/api/translations/list?status=pending', headers=auth_headers()).data)
+        assert again == first
+        # A different query string is a different entry
+        other = json.loads(client.get('/api/translations/list?status=pending&limit=5', headers=auth_headers()).data)
+        assert other['translations'][0]['domain'] == 'changed'
+
+        with client.application.app_context():
+            # ORM writes outside the API (jobs, bulk paths, other workers) bump data_versions on commit
+            db.session.execute(update(TranslationPair).values(domain='batch'))
+            db.session.commit()
+        batch = json.loads(client.get('/api/translations/list?status=pending', headers=auth_headers()).data)
+        assert batch['translations'][0]['domain'] == 'batch'
+
+        client.put(f"/api/translations/{sample_translation['id']}", json={'domain': 'edited'}, headers=auth_headers())
+        fresh = json.loads(client.get('/api/translations/list?status=pending', headers=auth_headers()).data)
+        assert fresh['translations'][0]['domain'] == 'edited'
+
+        # Hits still honour If-None-Match
+        response = client.get('/api/translations/list?status=pending', headers=auth_headers())
+        assert client.get('/api/translations/list?status=pending', headers={
+            **auth_headers(), 'If-None-Match': response.headers['ETag']}).status_code == 304
+
+    def test_sparse_fieldsets(self, client, auth_headers, sample_translation):
+        """fields= returns just the requested keys, validates names and gets its own ETag."""
+        full = client.get('/api/translations/list', headers=auth_headers())
+        sparse = client.get('/api/translations/list?fields=id,source_language', headers=auth_headers())
+        assert sparse.status_code == 200
+        row = json.loads(sparse.data)['translations'][0]
+        assert set(row) == {'id', 'source_language'}
+        assert row['source_language']['name'] == 'English'
+        assert sparse.headers['ETag'] != full.headers['ETag']
+
+        single = json.loads(client.get(f"/api/translations/{sample_translation['id']}?fields=status",
+                                       headers=auth_headers()).data)
+        assert single == {'status': 'pending'}
+
+        response = client.get('/api/translations/list?fields=id,password', headers=auth_headers())
+        assert response.status_code == 400
+        assert 'password' in json.loads(response.data)['error']
+
+        users = json.loads(client.get('/api/users/list?fields=username', headers=auth_headers()).data)
+        assert users['users'] == [{'username': 'admin'}]
+
+    def test_orjson_response_encoder(self, client, auth_headers, sample_translation, monkeypatch):
+        """When orjson is importable, RESTX responses are encoded through it with the handler's headers."""
+        from types import SimpleNamespace
+        from my_app import serializers
+        calls = []
+
+        def dumps(data, default=None, option=0):
+            calls.append(option)
+            return (json.dumps(data, default=default) + ('\n' if option & 2 else '')).encode('utf-8')
+
+        monkeypatch.setattr(serializers, 'orjson', SimpleNamespace(
+            dumps=dumps, OPT_NON_STR_KEYS=1, OPT_APPEND_NEWLINE=2))
+        response = client.get(f"/api/translations/{sample_translation['id']}", headers=auth_headers())
+        assert response.status_code == 200 and calls == [3]
+        assert response.mimetype == 'application/json' and response.headers['ETag'].startswith('W/')
+        assert response.data.endswith(b'\n')
+        assert json.loads(response.data)['source_text'] == 'Hello world'
+
+        response = client.get('/api/translations/999999', headers=auth_headers())
+        assert response.status_code == 404 and 'error' in json.loads(response.data)